@@ -0,0 +1,53 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite file, never the live database.
+"""
+
+from contextlib import contextmanager
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+from garden.db.sqlite_db import db
+from garden.db.migrations import run_migrations
+from garden.hardware.sensors.models import ROLLUP_MODELS, SensorReading, TYPED_READING_MODELS
+
+
+@contextmanager
+def temporary_database(tables: list | None = None) -> Iterator[Path]:
+    """Point the shared `db` at a fresh temporary file for the duration of the block."""
+    tables = tables if tables is not None else [
+        SensorReading, *TYPED_READING_MODELS.values(), *ROLLUP_MODELS.values(),
+    ]
+    with tempfile.TemporaryDirectory(prefix="garden-bench-") as tmp:
+        path = Path(tmp) / "bench.sqlite3"
+        db.init(str(path), pragmas={"journal_mode": "wal", "foreign_keys": 1})
+        db.connect()
+        db.create_tables(tables, safe=True)
+        run_migrations(db)
+        try:
+            yield path
+        finally:
+            db.close()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    index = (len(ordered) - 1) * pct / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples),
+    }
@@ -0,0 +1,137 @@
+"""
+Strict vs fast vs block reading decode.
+
+Compares the two ways StateService can turn stored rows into the readings
+the domain services consume:
+
+- strict: SensorReadingSchema per row, then a payload model and a frozen
+  reading dataclass (ReadingDecode.STRICT)
+- fast: one unvalidated ReadingRecord per row (ReadingDecode.FAST)
+- block: one columnar ReadingBlock for the whole window (ReadingDecode.BLOCK)
+
+For each window size it reports wall time (tracemalloc off), peak traced
+memory during the decode, and the number of memory blocks kept alive by the
+decoded result.
+
+Usage:
+    python -m benchmarks.decode --rows 10000 50000 --storage typed
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta, UTC
+from typing import Callable, Sized
+
+from garden.hardware.sensors.block import ReadingBlock
+from garden.hardware.sensors.dto import ClimateReading
+from garden.hardware.sensors.enums import ReadingDecode, ReadingStorage, SensorType
+from garden.hardware.sensors.repository import SensorReadingRepository
+from garden.hardware.sensors.schemas import ClimatePayload, SensorReadingSchema
+from garden.hardware.sensors.storage import build_reading_repository
+from .common import summarize, temporary_database
+
+SENSOR_ID = "climate_bench"
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def seed(repository: SensorReadingRepository, rows: int) -> tuple[datetime, datetime]:
+    readings = (
+        SensorReadingSchema(
+            sensor_id=SENSOR_ID,
+            sensor_type=SensorType.CLIMATE,
+            payload={"temp": 20.0 + (i % 100) / 10, "humidity": 50.0 + (i % 40)},
+            created=START + timedelta(seconds=i),
+        )
+        for i in range(rows)
+    )
+    repository.save_readings(readings)
+    return START, START + timedelta(seconds=rows)
+
+
+def decode_strict(repository: SensorReadingRepository, start: datetime, end: datetime) -> list:
+    readings = repository.fetch_readings(SensorType.CLIMATE, SENSOR_ID, start, end)
+    return [
+        ClimateReading(
+            created=r.created,
+            sensor_type=SensorType.CLIMATE,
+            sensor_id=r.sensor_id,
+            payload=ClimatePayload(**r.payload),
+        )
+        for r in readings
+    ]
+
+
+def decode_fast(repository: SensorReadingRepository, start: datetime, end: datetime) -> list:
+    return repository.fetch_readings(
+        SensorType.CLIMATE, SENSOR_ID, start, end, decode=ReadingDecode.FAST,
+    )
+
+
+def decode_block(repository: SensorReadingRepository, start: datetime, end: datetime) -> ReadingBlock:
+    return repository.fetch_block(SensorType.CLIMATE, SENSOR_ID, start, end)
+
+
+def measure(fn: Callable[[], Sized], repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    retained = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+
+    return {
+        "rows": len(result),
+        "seconds": summarize(timings),
+        "peak_bytes": peak,
+        "retained_blocks": retained,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--storage", choices=ReadingStorage.values, default=ReadingStorage.JSON.value)
+    args = parser.parse_args()
+
+    print(f"storage={args.storage}")
+    print(f"{'rows':>8} {'mode':>7} {'median ms':>10} {'p95 ms':>8} {'peak KiB':>10} {'blocks':>9}")
+    for rows in args.rows:
+        with temporary_database():
+            repository = build_reading_repository(ReadingStorage(args.storage))
+            start, end = seed(repository, rows)
+
+            results = {
+                "strict": measure(lambda: decode_strict(repository, start, end), args.repeat),
+                "fast": measure(lambda: decode_fast(repository, start, end), args.repeat),
+                "block": measure(lambda: decode_block(repository, start, end), args.repeat),
+            }
+
+        for mode, result in results.items():
+            print(
+                f"{rows:>8} {mode:>7} {result['seconds']['median'] * 1000:>10.1f} "
+                f"{result['seconds']['p95'] * 1000:>8.1f} {result['peak_bytes'] / 1024:>10.0f} "
+                f"{result['retained_blocks']:>9}"
+            )
+
+        strict = results["strict"]
+        for mode in ("fast", "block"):
+            result = results[mode]
+            print(
+                f"{'':>8} {mode}/strict: time {result['seconds']['median'] / strict['seconds']['median']:.2f}x, "
+                f"peak {result['peak_bytes'] / strict['peak_bytes']:.2f}x, "
+                f"blocks {result['retained_blocks'] / strict['retained_blocks']:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Fast path rule resolution against the policies.yaml rules.
+
+Resolves every out-of-range signature (all 729 combinations of climate and
+soil levels and trends, less the in-range ones) with FastPathEngine and
+reports the per-call latency, plus how the signatures split between the
+fast path and the LLM. Signatures are weighted equally, so the split is
+a property of the rules, not of any real garden.
+
+Usage:
+    python -m benchmarks.fast_path --repeat 20
+"""
+
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta, UTC
+from itertools import product
+import time
+
+from garden.config.constants import POLICIES_CONFIG_PATH
+from garden.config.policies import load_policies_config
+from garden.decision.rules import LEVEL_FIELDS, SIGNATURE_FIELDS, FastPathEngine
+from garden.state.schemas import (
+    ClimateStateSchema,
+    DerivedStateSnapshot,
+    LightStateSchema,
+    SoilMoistureStateSchema,
+)
+from .common import summarize
+
+
+def snapshots() -> list[DerivedStateSnapshot]:
+    """One snapshot per signature with at least one level out of range."""
+    now = datetime.now(UTC)
+    window = dict(window_start=now - timedelta(minutes=30), window_end=now, sample_count=10, confidence=0.9)
+    light = LightStateSchema(**window, intensity=0.8, state_started_at=now, is_light_on=True)
+    result = []
+    for values in product(*(list(enum) for enum in SIGNATURE_FIELDS.values())):
+        fields = dict(zip(SIGNATURE_FIELDS, values))
+        if all(fields[field] == ok for field, ok in LEVEL_FIELDS.items()):
+            continue
+        result.append(DerivedStateSnapshot(
+            created=now,
+            climate=ClimateStateSchema(
+                **window, temperature_c=22.0, humidity_rh=55.0, vpd_kpa=1.2,
+                temperature_level=fields["temperature_level"], temperature_trend=fields["temperature_trend"],
+                humidity_level=fields["humidity_level"], humidity_trend=fields["humidity_trend"],
+            ),
+            soil_moisture=SoilMoistureStateSchema(
+                **window, avg_moisture=0.5,
+                level=fields["soil_moisture_level"], trend=fields["soil_moisture_trend"],
+            ),
+            light=light,
+        ))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    engine = FastPathEngine(load_policies_config(POLICIES_CONFIG_PATH))
+    compile_seconds = time.perf_counter() - started
+
+    cases = snapshots()
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for snapshot in cases:
+            engine.resolve(snapshot)
+        timings.append((time.perf_counter() - started) / len(cases))
+    stats = summarize(timings)
+
+    reasons = Counter(engine.resolve(snapshot).reason for snapshot in cases)
+    actions = Counter(engine.resolve(snapshot).action for snapshot in cases)
+    print(f"compile: {compile_seconds * 1000:.1f} ms for {len(engine.table)} signatures")
+    print(f"resolve: p50 {stats['median'] * 1e6:.2f} us, p95 {stats['p95'] * 1e6:.2f} us per call")
+    print(f"{len(cases)} out-of-range signatures:")
+    for reason, count in reasons.most_common():
+        print(f"  {reason.value:<18} {count:>4} {count / len(cases):>7.1%}")
+    for action, count in actions.most_common():
+        if action is not None:
+            print(f"  -> {action.value:<15} {count:>4}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+LLMService vs AsyncLLMService against a faulty local stub.
+
+Runs --calls sequential decision requests, as the control loop does,
+against the stub in benchmarks.llm_stub with a slow tail (--slow-rate of
+requests take --slow-seconds longer) and injected overload errors
+(--error-rate, HTTP 529). Modes:
+
+- sync: LLMService, with the SDK's default retries and timeout
+- async: AsyncLLMService with deadlines and jittered backoff retries
+- hedged: the same, plus a hedged request after the p95 latency
+
+For each mode it reports latency percentiles, failed requests, HTTP
+requests sent, TCP connections opened, and the async services' retry and
+hedge counters.
+
+Usage:
+    python -m benchmarks.llm_async --calls 200 --slow-rate 0.05 --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import asdict
+
+from garden.llm import AsyncLLMService, HedgePolicy, LLMService, RetryPolicy
+from garden.llm.exc import LLMRequestError
+from garden.state.schemas import DerivedStateSnapshot
+from .common import summarize
+from .llm_stub import stub_server
+from .serialization import derived_snapshot
+
+
+def run_sync(snapshot: DerivedStateSnapshot, calls: int) -> tuple[list[float], int, dict]:
+    service = LLMService(api_key="stub")
+    timings, failures = [], 0
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            service.request(snapshot)
+        except LLMRequestError:
+            failures += 1
+        timings.append(time.perf_counter() - started)
+    service.client.close()
+    return timings, failures, {}
+
+
+async def run_async(
+    snapshot: DerivedStateSnapshot,
+    calls: int,
+    retry: RetryPolicy,
+    hedge: HedgePolicy | None,
+) -> tuple[list[float], int, dict]:
+    timings, failures = [], 0
+    async with AsyncLLMService(api_key="stub", retry=retry, hedge=hedge, seed=0) as service:
+        for _ in range(calls):
+            started = time.perf_counter()
+            try:
+                await service.request(snapshot)
+            except LLMRequestError:
+                failures += 1
+            timings.append(time.perf_counter() - started)
+    return timings, failures, asdict(service.stats)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1, help="base stub latency, seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-seconds", type=float, default=2.0)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--deadline", type=float, default=10.0)
+    parser.add_argument("--attempt-timeout", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    snapshot = derived_snapshot()
+    retry = RetryPolicy(
+        deadline_seconds=args.deadline,
+        attempt_timeout_seconds=args.attempt_timeout,
+        base_delay_seconds=0.05,
+    )
+    modes = {
+        "sync": lambda: run_sync(snapshot, args.calls),
+        "async": lambda: asyncio.run(run_async(snapshot, args.calls, retry, None)),
+        "hedged": lambda: asyncio.run(run_async(snapshot, args.calls, retry, HedgePolicy(percentile=95))),
+    }
+
+    print(
+        f"calls={args.calls} latency={args.latency}s slow={args.slow_rate:.0%}+{args.slow_seconds}s "
+        f"errors={args.error_rate:.0%}"
+    )
+    print(
+        f"{'mode':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'failed':>7} "
+        f"{'http':>6} {'conns':>6}  counters"
+    )
+    for mode, run in modes.items():
+        with stub_server(
+            base_latency_seconds=args.latency,
+            slow_rate=args.slow_rate,
+            slow_seconds=args.slow_seconds,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        ) as server:
+            timings, failures, counters = run()
+            requests, connections = server.requests, len(server.connections)
+
+        stats = summarize(timings)
+        counters_text = " ".join(f"{key}={value}" for key, value in counters.items() if key != "requests")
+        print(
+            f"{mode:>7} {stats['median'] * 1000:>8.0f} {stats['p95'] * 1000:>8.0f} {stats['p99'] * 1000:>8.0f} "
+            f"{stats['max'] * 1000:>8.0f} {failures:>7} {requests:>6} {connections:>6}  {counters_text}"
+        )
+
+
+if __name__ == "__main__":
+    main()
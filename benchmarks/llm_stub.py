@@ -0,0 +1,164 @@
+"""
+Local stub of the Anthropic Messages API for the LLM benchmarks.
+
+Implements just enough of POST /v1/messages for LLMService and
+AsyncLLMService: it always answers with a no_action tool call and counts
+tokens as one per four characters of JSON.
+
+Prompt caching is modelled the way the API bills it: the prefix up to the
+last cache_control breakpoint (tools, then system) is a cache write the
+first time it is seen and a cache read after that; everything else is
+plain input. Before answering, the stub waits for the request's prefill
+time (uncached tokens at prefill_ms_per_1k, cache reads at a tenth of
+that) plus base_latency_seconds.
+
+Faults are injected at random, reproducibly per seed: slow_rate of the
+requests take slow_seconds longer, and error_rate of them fail with
+error_status.
+"""
+
+from contextlib import contextmanager
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Iterator
+
+from garden.common.serialization import dumps
+
+CACHE_WRITE_COST = 1.25
+CACHE_READ_COST = 0.1
+
+
+def tokens(value: Any) -> int:
+    return max(1, len(dumps(value)) // 4)
+
+
+class StubMessagesHandler(BaseHTTPRequestHandler):
+    server: "StubMessagesServer"
+    # Keep-alive, so connection reuse by the client is visible.
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        system = body.get("system", [])
+        if isinstance(system, str):
+            system = [{"type": "text", "text": system}]
+        blocks = [*body.get("tools", []), *system, *body["messages"]]
+
+        breakpoints = [i for i, block in enumerate(blocks) if "cache_control" in block]
+        prefix = blocks[:breakpoints[-1] + 1] if breakpoints else []
+        prefix_tokens = sum(tokens(block) for block in prefix)
+        input_tokens = sum(tokens(block) for block in blocks) - prefix_tokens
+
+        cache_read = cache_write = 0
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.connections.add(self.client_address)
+            if prefix:
+                key = hashlib.sha256(dumps(prefix).encode()).hexdigest()
+                if key in self.server.cached:
+                    cache_read = prefix_tokens
+                else:
+                    self.server.cached.add(key)
+                    cache_write = prefix_tokens
+            slow = self.server.rng.random() < self.server.slow_rate
+            failed = self.server.rng.random() < self.server.error_rate
+
+        per_token = self.server.prefill_ms_per_1k / 1000 / 1000
+        delay = self.server.base_latency_seconds + (input_tokens + cache_write + cache_read * CACHE_READ_COST) * per_token
+        time.sleep(delay + (self.server.slow_seconds if slow else 0.0))
+
+        if failed:
+            status = self.server.error_status
+            payload = json.dumps({
+                "type": "error",
+                "error": {"type": "api_error", "message": "Injected stub failure"},
+            }).encode()
+        else:
+            status = 200
+            payload = json.dumps({
+                "id": f"msg_stub_{time.monotonic_ns()}",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": [{"type": "tool_use", "id": "toolu_stub", "name": "no_action", "input": {}}],
+                "stop_reason": "tool_use",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "output_tokens": 5,
+                    "cache_creation_input_tokens": cache_write,
+                    "cache_read_input_tokens": cache_read,
+                },
+            }).encode()
+
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except ConnectionError:
+            # The client gave up on this request (timeout or a winning hedge).
+            pass
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StubMessagesServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        prefill_ms_per_1k: float = 0.0,
+        base_latency_seconds: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 529,
+        seed: int = 0,
+    ):
+        super().__init__(("127.0.0.1", 0), StubMessagesHandler)
+        self.prefill_ms_per_1k = prefill_ms_per_1k
+        self.base_latency_seconds = base_latency_seconds
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.connections: set[tuple] = set()   # distinct client (host, port) pairs
+        self.cached: set[str] = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+@contextmanager
+def stub_server(**options: Any) -> Iterator[StubMessagesServer]:
+    """
+    A fresh stub (empty prompt cache) that Anthropic clients created inside
+    the block are pointed at, via ANTHROPIC_BASE_URL.
+    """
+    server = StubMessagesServer(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    previous = os.environ.get("ANTHROPIC_BASE_URL")
+    os.environ["ANTHROPIC_BASE_URL"] = server.url
+    try:
+        yield server
+    finally:
+        if previous is None:
+            os.environ.pop("ANTHROPIC_BASE_URL", None)
+        else:
+            os.environ["ANTHROPIC_BASE_URL"] = previous
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,86 @@
+"""
+LLMService with and without prompt caching, against a local stub server.
+
+The stub (benchmarks.llm_stub) models prompt caching the way the API
+bills it and waits for the prefill time of each request: uncached tokens
+at --prefill-ms-per-1k, cache reads at a tenth of that. It sends the
+whole response at once, so the measured latency is the time to first
+token. Unlike the API it has no minimum cacheable prefix length.
+
+For each mode it reports latency percentiles, token usage and the input
+cost in base input-token units. A cache write costs 1.25 units per token
+and a cache read 0.1.
+
+Usage:
+    python -m benchmarks.prompt_cache --calls 50 --prefill-ms-per-1k 100
+"""
+
+import argparse
+import time
+
+from garden.llm import LLMService
+from garden.state.schemas import DerivedStateSnapshot
+from .common import summarize
+from .llm_stub import CACHE_READ_COST, CACHE_WRITE_COST, stub_server
+from .serialization import derived_snapshot
+
+
+def run_mode(snapshot: DerivedStateSnapshot, prompt_cache: bool, calls: int, prefill_ms_per_1k: float) -> dict:
+    timings = []
+    usage = {"input_tokens": 0, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+    with stub_server(prefill_ms_per_1k=prefill_ms_per_1k):
+        service = LLMService(api_key="stub", prompt_cache=prompt_cache)
+        for _ in range(calls):
+            started = time.perf_counter()
+            response = service.request(snapshot)
+            timings.append(time.perf_counter() - started)
+            for field in usage:
+                usage[field] += getattr(response.usage, field)
+
+    cost = (
+        usage["input_tokens"]
+        + usage["cache_creation_input_tokens"] * CACHE_WRITE_COST
+        + usage["cache_read_input_tokens"] * CACHE_READ_COST
+    )
+    return {
+        "prompt_cache": prompt_cache,
+        "first_call_seconds": timings[0],
+        "seconds": summarize(timings[1:] or timings),
+        "usage": usage,
+        "input_cost_per_call": cost / calls,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=100.0)
+    args = parser.parse_args()
+
+    print(f"calls={args.calls} prefill={args.prefill_ms_per_1k}ms/1k tokens")
+    print(
+        f"{'mode':>8} {'first ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'input':>8} "
+        f"{'cache w':>8} {'cache r':>8} {'cost/call':>10}"
+    )
+    snapshot = derived_snapshot()
+    results = [
+        run_mode(snapshot, prompt_cache, args.calls, args.prefill_ms_per_1k) for prompt_cache in (False, True)
+    ]
+    for result in results:
+        usage = result["usage"]
+        print(
+            f"{'cached' if result['prompt_cache'] else 'plain':>8} {result['first_call_seconds'] * 1000:>9.1f} "
+            f"{result['seconds']['median'] * 1000:>8.1f} {result['seconds']['p95'] * 1000:>8.1f} "
+            f"{usage['input_tokens']:>8} {usage['cache_creation_input_tokens']:>8} "
+            f"{usage['cache_read_input_tokens']:>8} {result['input_cost_per_call']:>10.1f}"
+        )
+
+    plain, cached = results
+    print(
+        f"prompt cache: input cost {cached['input_cost_per_call'] / plain['input_cost_per_call']:.2f}x, "
+        f"median latency {cached['seconds']['median'] / plain['seconds']['median']:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Input tokens of the verbose and compact snapshot encodings.
+
+The corpus is the snapshots behind the most recent decisions in
+decision_log, read from --database (the live database by default, opened
+read-only). Each snapshot is encoded both ways by PromptBuilder and the
+user messages are counted offline with an estimate of BPE tokenization:
+the text is split the way BPE tokenizers pre-split it (letter runs, up to
+three digits, punctuation runs, whitespace) and letter runs longer than
+LETTERS_PER_TOKEN characters count once per LETTERS_PER_TOKEN. The
+estimate is for comparing encodings; with --api the exact counts come
+from the token counting endpoint instead (needs ANTHROPIC_API_KEY).
+
+The compact encoding also adds a legend to the system prompt. That prefix
+is sent once per call but is cached (see benchmarks.prompt_cache), so it
+is reported separately.
+
+Usage:
+    python -m benchmarks.prompt_tokens --limit 1000
+"""
+
+import argparse
+import math
+from pathlib import Path
+import re
+import statistics
+
+from anthropic import Anthropic
+
+from garden.config.constants import DB_PATH
+from garden.db.sqlite_db import db
+from garden.decision.models import DecisionLog
+from garden.decision.repository import DecisionRepository
+from garden.llm.enums import SnapshotEncoding
+from garden.llm.prompts import PromptBuilder
+from garden.llm.service import DEFAULT_MODEL
+from garden.state.schemas import DerivedStateSnapshot
+from .common import summarize
+
+LETTERS_PER_TOKEN = 6
+PRE_TOKEN = re.compile(r"[^\W\d_]+| ?\d{1,3}| ?[^\w\s]+|\s+|_")
+
+
+def estimate_tokens(text: str) -> int:
+    count = 0
+    for piece in PRE_TOKEN.findall(text):
+        count += math.ceil(len(piece) / LETTERS_PER_TOKEN) if piece.isalpha() else 1
+    return count
+
+
+def api_counter(model: str):
+    client = Anthropic()
+
+    def count(text: str) -> int:
+        return client.messages.count_tokens(model=model, messages=[{"role": "user", "content": text}]).input_tokens
+
+    return count
+
+
+def load_corpus(database: Path, limit: int) -> list[DerivedStateSnapshot]:
+    """The snapshots of the most recent decisions, newest first."""
+    if not database.exists():
+        raise SystemExit(f"Database not found: {database}")
+    db.init(f"file:{database}?mode=ro", uri=True)
+    db.connect()
+    try:
+        ids = [
+            row.id for row in DecisionLog.select(DecisionLog.id).order_by(DecisionLog.id.desc()).limit(limit)
+        ]
+        snapshots = DecisionRepository().fetch_snapshots(ids)
+    finally:
+        db.close()
+    return [snapshots[decision_id] for decision_id in ids if decision_id in snapshots]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", type=Path, default=DB_PATH)
+    parser.add_argument("--limit", type=int, default=1_000, help="most recent decisions to read")
+    parser.add_argument("--api", action="store_true", help="exact counts from the token counting endpoint")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="model for --api counts")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.database, args.limit)
+    if not corpus:
+        raise SystemExit(f"No decisions with snapshots in {args.database}")
+    count = api_counter(args.model) if args.api else estimate_tokens
+
+    builders = {encoding: PromptBuilder(encoding=encoding) for encoding in SnapshotEncoding}
+    tokens = {
+        encoding: [count(builder.build_user_message(snapshot)) for snapshot in corpus]
+        for encoding, builder in builders.items()
+    }
+
+    print(f"{len(corpus)} snapshots from {args.database}, {'API' if args.api else 'estimated'} token counts")
+    print(f"{'encoding':>8} {'mean':>7} {'p50':>6} {'p95':>6} {'max':>6} {'system':>7}")
+    for encoding, counts in tokens.items():
+        stats = summarize(counts)
+        system = count(builders[encoding].system_prompt)
+        print(
+            f"{encoding.value:>8} {statistics.fmean(counts):>7.1f} {stats['median']:>6.0f} "
+            f"{stats['p95']:>6.0f} {stats['max']:>6.0f} {system:>7}"
+        )
+
+    verbose, compact = (sum(tokens[encoding]) for encoding in (SnapshotEncoding.VERBOSE, SnapshotEncoding.COMPACT))
+    print(f"compact: {compact / verbose:.2f}x the verbose user message tokens ({verbose - compact} fewer in total)")
+
+
+if __name__ == "__main__":
+    main()
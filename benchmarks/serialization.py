@@ -0,0 +1,167 @@
+"""
+JSON encode and decode of the values we store and write out.
+
+Shapes are real: payloads come from the simulated drivers, and the
+DerivedStateSnapshot is derived by StateService from a seeded temporary
+database (see benchmarks.state). For each shape and direction it compares:
+
+- stdlib: the json module (models via model_dump(mode="json") /
+  model_validate(json.loads(...)))
+- orjson: the same through orjson
+- pydantic: pydantic-core's model_dump_json / model_validate_json (models only)
+- canonical: the sorted-key snapshot content hashed by state_snapshot
+
+and reports the per-call median and p95 in microseconds plus the speedup
+over stdlib. garden.common.serialization uses the fastest path per kind,
+except for the canonical content: its hash depends on the exact bytes, so
+it stays on the stdlib encoding (see garden.state.snapshots).
+
+Usage:
+    python -m benchmarks.serialization --calls 10000 --repeat 20
+"""
+
+import argparse
+import json
+import platform
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Callable
+
+import orjson
+from pydantic import BaseModel
+
+from garden.common.serialization import dump_model, dumps, loads
+from garden.config.constants import POLICIES_CONFIG_PATH
+from garden.config.policies import load_policies_config
+from garden.config.sensors import SensorRef
+from garden.hardware.sensors.enums import ReadingStorage, SensorType
+from garden.hardware.sensors.schemas import SensorReadingSchema
+from garden.hardware.sensors.simulated import SIMULATED_DRIVERS
+from garden.hardware.sensors.storage import build_reading_repository
+from garden.state.schemas import DerivedStateSnapshot
+from garden.state.services import StateService
+from garden.state.snapshots import snapshot_content
+from .common import summarize, temporary_database
+from .state import END, RESULTS_DIR, bench_config, git_commit, seed
+
+SNAPSHOT_SAMPLES = 300
+
+
+def payloads() -> dict[SensorType, dict[str, Any]]:
+    """One simulated payload per sensor type."""
+    payloads = {}
+    for sensor_type, driver_type in SIMULATED_DRIVERS.items():
+        driver = driver_type(sensor_type, SensorRef(id=f"sim_{sensor_type.value}_0000", model="simulated"), dropout_rate=0.0)
+        payloads[sensor_type] = driver.sample(END)
+    return payloads
+
+
+def derived_snapshot() -> DerivedStateSnapshot:
+    """A snapshot with every domain derived from SNAPSHOT_SAMPLES simulated readings."""
+    with temporary_database():
+        seed(ReadingStorage.JSON, sensors=1, samples=SNAPSHOT_SAMPLES)
+        service = StateService(
+            build_reading_repository(ReadingStorage.JSON),
+            bench_config(SNAPSHOT_SAMPLES),
+            load_policies_config(POLICIES_CONFIG_PATH),
+        )
+        return service.derive_snapshot(as_of=END)
+
+
+def plain_cases(name: str, value: Any) -> dict[str, dict[str, Callable[[], Any]]]:
+    text = json.dumps(value)
+    return {
+        f"{name} encode": {
+            "stdlib": lambda: json.dumps(value),
+            "orjson": lambda: dumps(value),
+        },
+        f"{name} decode": {
+            "stdlib": lambda: json.loads(text),
+            "orjson": lambda: loads(text),
+        },
+    }
+
+
+def model_cases(name: str, model: BaseModel) -> dict[str, dict[str, Callable[[], Any]]]:
+    model_type = type(model)
+    text = model.model_dump_json()
+    return {
+        f"{name} encode": {
+            "stdlib": lambda: json.dumps(model.model_dump(mode="json")),
+            "orjson": lambda: orjson.dumps(model.model_dump(mode="json")),
+            "pydantic": lambda: dump_model(model),
+        },
+        f"{name} decode": {
+            "stdlib": lambda: model_type.model_validate(json.loads(text)),
+            "orjson": lambda: model_type.model_validate(orjson.loads(text)),
+            "pydantic": lambda: model_type.model_validate_json(text),
+        },
+    }
+
+
+def per_call(fn: Callable[[], Any], calls: int, repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append((time.perf_counter() - started) / calls)
+    return summarize(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=10_000, help="calls per timed repetition")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    snapshot = derived_snapshot()
+    cases: dict[str, dict[str, Callable[[], Any]]] = {}
+    for sensor_type, payload in payloads().items():
+        cases.update(plain_cases(f"{sensor_type.value} payload", payload))
+        reading = SensorReadingSchema(
+            sensor_id=f"sim_{sensor_type.value}_0000", sensor_type=sensor_type, payload=payload, created=END,
+        )
+        cases.update(model_cases(f"{sensor_type.value} reading", reading))
+    cases.update(model_cases("snapshot", snapshot))
+    content = loads(snapshot_content(snapshot))
+    cases["snapshot canonical"] = {
+        "stdlib": lambda: json.dumps(content, sort_keys=True, separators=(",", ":")),
+        "orjson": lambda: dumps(content, sort_keys=True),
+    }
+
+    started = datetime.now(UTC)
+    print(f"calls={args.calls} repeat={args.repeat}")
+    print(f"{'case':<30} {'method':>9} {'p50 us':>8} {'p95 us':>8} {'speedup':>8}")
+    results: dict[str, dict[str, Any]] = {}
+    for case, methods in cases.items():
+        results[case] = {}
+        for method, fn in methods.items():
+            results[case][method] = per_call(fn, args.calls, args.repeat)
+        baseline = results[case]["stdlib"]["median"]
+        for method, stats in results[case].items():
+            print(
+                f"{case:<30} {method:>9} {stats['median'] * 1e6:>8.2f} {stats['p95'] * 1e6:>8.2f} "
+                f"{baseline / stats['median']:>7.2f}x"
+            )
+
+    output = args.output or RESULTS_DIR / f"serialization-{started:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "benchmark": "serialization",
+        "started": started.isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "orjson": orjson.__version__,
+        "calls": args.calls,
+        "repeat": args.repeat,
+        "snapshot_samples": SNAPSHOT_SAMPLES,
+        "results": results,
+    }, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+StateService.derive_snapshot and per-domain derive_state.
+
+For every (samples, sensors) case, seeds a temporary database with
+`sensors` simulated sensors of each type, each holding `samples` readings
+one second apart, and points every domain's evidence window at exactly
+those `samples` readings of its first sensor. The other sensors' rows are
+interleaved in time, so sensor counts measure index selectivity.
+
+Two sweeps are run: --samples at --base-sensors sensors, and --sensors at
+--base-samples samples. For each case it reports:
+
+- snapshot latency percentiles for derive_snapshot (tracemalloc off);
+- peak traced memory of one derive_snapshot;
+- the split between fetch (planned repository query and row decode),
+  parse (payload models and reading dataclasses; STRICT only) and derive,
+  the latter per domain.
+
+Results are written as JSON to --output so runs can be compared.
+
+Usage:
+    python -m benchmarks.state --samples 10 1000 100000 --sensors 1 500 --decode fast
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sqlite3
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Any, Callable
+
+from garden.config.constants import POLICIES_CONFIG_PATH, SENSORS_CONFIG_PATH
+from garden.config.policies import PoliciesConfig, load_policies_config
+from garden.config.sensors import EvidenceConfig, SensorRef, SensorsConfig, load_sensors_config
+from garden.hardware.sensors.dto import ClimateReading, LightReading, SoilMoistureReading
+from garden.hardware.sensors.enums import ReadingDecode, ReadingStorage, SensorType
+from garden.hardware.sensors.loadgen import LoadGenerator
+from garden.hardware.sensors.schemas import PAYLOAD_SCHEMAS
+from garden.hardware.sensors.storage import build_reading_repository
+from garden.hardware.sensors.writer import BufferedReadingWriter
+from garden.state.services import (
+    ClimateStateService,
+    LightStateService,
+    SoilMoistureStateService,
+    StateService,
+)
+from .common import summarize, temporary_database
+
+RESULTS_DIR = Path(__file__).parent / "results"
+END = datetime(2026, 1, 1, tzinfo=UTC)
+
+READING_TYPES = {
+    SensorType.CLIMATE: ClimateReading,
+    SensorType.LIGHT: LightReading,
+    SensorType.SOIL_MOISTURE: SoilMoistureReading,
+}
+
+
+def bench_config(samples: int) -> SensorsConfig:
+    """sensors.yaml with every domain reading the last `samples` seconds of sim_<type>_0000."""
+    config = load_sensors_config(SENSORS_CONFIG_PATH).model_copy(deep=True)
+    for sensor_type in SensorType:
+        domain = getattr(config, sensor_type.value)
+        domain.sensors = [SensorRef(id=f"sim_{sensor_type.value}_0000", model="simulated")]
+        domain.sampling.interval_seconds = 1
+        domain.evidence = EvidenceConfig(lookback_seconds=samples)
+    return config
+
+
+def seed(storage: ReadingStorage, sensors: int, samples: int) -> None:
+    repository = build_reading_repository(storage)
+    writer = BufferedReadingWriter(repository, max_batch_size=5_000)
+    generator = LoadGenerator(writer, sensors_per_type=sensors, dropout_rate=0.0)
+    generator.backfill(END - timedelta(seconds=samples - 1), END + timedelta(seconds=1), {
+        sensor_type: 1 for sensor_type in SensorType
+    })
+
+
+def parse(sensor_type: SensorType, readings: list) -> list:
+    reading_type = READING_TYPES[sensor_type]
+    payload_type = PAYLOAD_SCHEMAS[sensor_type]
+    return [
+        reading_type(
+            created=r.created,
+            sensor_type=sensor_type,
+            sensor_id=r.sensor_id,
+            payload=payload_type(**r.payload),
+        )
+        for r in readings
+    ]
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> tuple[list[float], Any]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+
+def run_case(args: argparse.Namespace, samples: int, sensors: int, policies: PoliciesConfig) -> dict:
+    storage = ReadingStorage(args.storage)
+    decode = ReadingDecode(args.decode)
+    config = bench_config(samples)
+
+    with temporary_database():
+        seed(storage, sensors, samples)
+        repository = build_reading_repository(storage)
+        service = StateService(repository, config, policies, decode=decode)
+
+        snapshot_timings, snapshot = timed(lambda: service.derive_snapshot(as_of=END), args.repeat)
+        for sensor_type in SensorType:
+            state = getattr(snapshot, sensor_type.value)
+            if state is None or state.sample_count != samples:
+                raise RuntimeError(f"{sensor_type.value} derived from {state and state.sample_count} samples, expected {samples}")
+
+        gc.collect()
+        tracemalloc.start()
+        service.derive_snapshot(as_of=END)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        plan = service.planner.plan(END)
+        if decode == ReadingDecode.BLOCK:
+            fetch_timings, readings = timed(lambda: service.planner.execute_blocks(plan, repository), args.repeat)
+        else:
+            fetch_timings, readings = timed(
+                lambda: service.planner.execute(plan, repository, decode=decode), args.repeat,
+            )
+
+    phases: dict[str, Any] = {"fetch": summarize(fetch_timings), "parse": {}, "derive": {}}
+    services: dict[SensorType, Any] = {
+        SensorType.CLIMATE: ClimateStateService(policies),
+        SensorType.SOIL_MOISTURE: SoilMoistureStateService(policies),
+        SensorType.LIGHT: LightStateService(policies),
+    }
+    for sensor_type, domain_service in services.items():
+        rows = readings[sensor_type]
+        if decode == ReadingDecode.STRICT:
+            parse_timings, rows = timed(lambda: parse(sensor_type, rows), args.repeat)
+            phases["parse"][sensor_type.value] = summarize(parse_timings)
+
+        kwargs = {"previous_state": None} if sensor_type == SensorType.LIGHT else {}
+        derive = domain_service.derive_state_block if decode == ReadingDecode.BLOCK else domain_service.derive_state
+        derive_timings, _ = timed(lambda: derive(rows, **kwargs), args.repeat)
+        phases["derive"][sensor_type.value] = summarize(derive_timings)
+
+    return {
+        "samples": samples,
+        "sensors": sensors,
+        "snapshot_seconds": summarize(snapshot_timings),
+        "snapshot_peak_bytes": peak,
+        "phases": phases,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--sensors", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--base-samples", type=int, default=1_000)
+    parser.add_argument("--base-sensors", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--storage", choices=ReadingStorage.values, default=ReadingStorage.JSON.value)
+    parser.add_argument("--decode", choices=ReadingDecode.values, default=ReadingDecode.STRICT.value)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    cases = list(dict.fromkeys(
+        [(samples, args.base_sensors) for samples in args.samples]
+        + [(args.base_samples, sensors) for sensors in args.sensors]
+    ))
+    policies = load_policies_config(POLICIES_CONFIG_PATH)
+    started = datetime.now(UTC)
+
+    print(f"storage={args.storage} decode={args.decode} repeat={args.repeat}")
+    print(
+        f"{'samples':>8} {'sensors':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'peak KiB':>9} {'fetch ms':>9} {'parse ms':>9} {'derive ms':>10}"
+    )
+    results = []
+    for samples, sensors in cases:
+        result = run_case(args, samples, sensors, policies)
+        results.append(result)
+
+        phases = result["phases"]
+        snapshot = result["snapshot_seconds"]
+        parse_ms = sum(stats["median"] for stats in phases["parse"].values()) * 1000
+        derive_ms = sum(stats["median"] for stats in phases["derive"].values()) * 1000
+        print(
+            f"{samples:>8} {sensors:>8} {snapshot['median'] * 1000:>8.2f} {snapshot['p95'] * 1000:>8.2f} "
+            f"{snapshot['p99'] * 1000:>8.2f} {result['snapshot_peak_bytes'] / 1024:>9.0f} "
+            f"{phases['fetch']['median'] * 1000:>9.2f} {parse_ms:>9.2f} {derive_ms:>10.2f}"
+        )
+
+    output = args.output or RESULTS_DIR / f"state-{started:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "benchmark": "state",
+        "started": started.isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "storage": args.storage,
+        "decode": args.decode,
+        "repeat": args.repeat,
+        "results": results,
+    }, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@ from peewee import (
     BooleanField,
     ForeignKeyField
 )
-from playhouse.sqlite_ext import JSONField
 from garden.db.base import BaseDBModel
+from garden.db.fields import OrjsonField
 from ..decision.models import DecisionLog
 
 
@@ -17,7 +17,7 @@ class ActionLog(BaseDBModel):
     id = AutoField()
     action_type = TextField(index=True)
     actuator_id = TextField(index=True)
-    action_params = JSONField(null=True)
+    action_params = OrjsonField(null=True)
     requested_by = TextField()
     decision = ForeignKeyField(DecisionLog, backref="decisions", on_delete="CASCADE")
     approved = BooleanField(default=False)
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from peewee import SqliteDatabase
 from .config.sensors import SensorsConfig
 from .config.policies import PoliciesConfig
+from .config.retention import RetentionConfig
 
 @dataclass(frozen=True)
 class AppContext:
@@ -18,4 +19,5 @@ class AppContext:
     """
     sensors_config: SensorsConfig
     policies_config: PoliciesConfig
+    retention_config: RetentionConfig
     db: SqliteDatabase
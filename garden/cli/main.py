@@ -1,17 +1,58 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from functools import reduce
 import logging
 import logging.config
+from math import gcd
+from pathlib import Path
+import threading
 import typer
 from dotenv import load_dotenv
 from peewee import SqliteDatabase
-from ..config.constants import SENSORS_CONFIG_PATH, POLICIES_CONFIG_PATH
+from ..config.constants import (
+    SENSORS_CONFIG_PATH,
+    POLICIES_CONFIG_PATH,
+    RETENTION_CONFIG_PATH,
+    PARTITIONS_DIR,
+    REPLAY_DIR,
+)
 from ..config.logging import LOGGING
 from ..config.sensors import load_sensors_config
 from ..config.policies import load_policies_config
+from ..config.retention import load_retention_config
 from ..db.sqlite_db import db
-from ..hardware.sensors.models import SensorReading
+from ..db.migrations import (
+    run_migrations,
+    copy_readings_to_typed,
+    copy_readings_to_partitions,
+    dedup_decision_snapshots,
+    backfill_reading_rollups,
+)
+from ..db.partitions import PartitionManager
+from ..db.query_plan import explain_queries
+from ..db.retention import RetentionPruner
+from ..hardware.sensors import rpi  # noqa: F401  (registers the Raspberry Pi drivers)
+from ..hardware.sensors.drivers import build_drivers
+from ..hardware.sensors.enums import ReadingStorage, SensorType
+from ..hardware.sensors.loadgen import LoadGenerator
+from ..hardware.sensors.models import (
+    SensorReading,
+    ClimateSensorReading,
+    LightSensorReading,
+    SoilMoistureSensorReading,
+    MinuteReadingRollup,
+    HourReadingRollup,
+)
+from ..hardware.sensors.sampler import SamplingScheduler
+from ..hardware.sensors.simulated import DEFAULT_DROPOUT_RATE
+from ..hardware.sensors.storage import build_reading_repository
+from ..hardware.sensors.writer import BufferedReadingWriter
 from ..action.models import ActionLog
 from ..decision.models import DecisionLog
-from ..state.models import ClimateState, LightState, SoilMoistureState
+from ..llm.cache import DecisionCache
+from ..llm.models import LLMDecisionCacheEntry
+from ..state.models import ClimateState, LightState, SoilMoistureState, StateSnapshot
+from ..state.services import StateReplayEngine
 from ..app_context import AppContext
 
 logger = logging.getLogger(__name__)
@@ -19,12 +60,18 @@ app = typer.Typer(add_completion=False)
 
 tables = [
     ActionLog, DecisionLog, SensorReading,
-    ClimateState, LightState, SoilMoistureState,
+    ClimateSensorReading, LightSensorReading, SoilMoistureSensorReading,
+    MinuteReadingRollup, HourReadingRollup,
+    ClimateState, LightState, SoilMoistureState, StateSnapshot,
+    LLMDecisionCacheEntry,
 ]
 
 
 def init_db(db: SqliteDatabase):
     db.connect(reuse_if_open=True)
+    # Migrations first: create_tables would try to index columns that
+    # existing tables do not have yet.
+    run_migrations(db)
     db.create_tables(tables, safe=True)
     logger.info("Established DB connection")
 
@@ -32,6 +79,7 @@ def build_app_context(db: SqliteDatabase) -> AppContext:
     app_context = AppContext(
         sensors_config=load_sensors_config(SENSORS_CONFIG_PATH),
         policies_config=load_policies_config(POLICIES_CONFIG_PATH),
+        retention_config=load_retention_config(RETENTION_CONFIG_PATH),
         db=db,
     )
     logger.info("Built AppContext object")
@@ -55,6 +103,230 @@ def test(ctx: typer.Context, name: str = "world"):
     typer.echo(f"hello {name}")
 
 
+@app.command("check-query-plans")
+def check_query_plans(ctx: typer.Context):
+    """
+    EXPLAIN every hot repository query and fail if any needs a full table scan.
+    """
+    sensors_config = ctx.obj.sensors_config
+    repository = build_reading_repository(sensors_config.storage, rollups=sensors_config.rollups)
+    reports = explain_queries(repository.hot_queries())
+
+    for report in reports:
+        status = "FULL SCAN" if report.full_scan else "ok"
+        typer.echo(f"[{status}] {report.name}")
+        for detail in report.details:
+            typer.echo(f"    {detail}")
+
+    failures = [report.name for report in reports if report.full_scan]
+    if failures:
+        logger.error(f"Queries falling back to a full table scan: {', '.join(failures)}")
+        raise typer.Exit(code=1)
+
+
+@app.command("migrate-readings")
+def migrate_readings(ctx: typer.Context, batch_size: int = 10_000):
+    """
+    Copy JSON sensor_reading rows into the typed per-sensor-type tables.
+    """
+    copied = copy_readings_to_typed(ctx.obj.db, batch_size=batch_size)
+    for sensor_type, count in copied.items():
+        typer.echo(f"{sensor_type.value}: {count} rows copied")
+
+    if ctx.obj.sensors_config.storage != ReadingStorage.TYPED:
+        typer.echo("Set `storage: typed` in sensors.yaml to read from the typed tables.")
+
+
+@app.command("dedup-snapshots")
+def dedup_snapshots(ctx: typer.Context, batch_size: int = 1_000):
+    """
+    Move inline decision_log snapshots into the deduplicated state_snapshot table.
+    """
+    converted, stored = dedup_decision_snapshots(ctx.obj.db, batch_size=batch_size)
+    typer.echo(f"{converted} decisions now reference {stored} new snapshots")
+
+
+@app.command("backfill-rollups")
+def backfill_rollups(ctx: typer.Context, batch_days: int = 1):
+    """
+    Rebuild the minute and hour reading rollups from the stored readings.
+    """
+    storage = ctx.obj.sensors_config.storage
+    if storage == ReadingStorage.PARTITIONED:
+        typer.echo("Rollups cannot be backfilled from partitioned storage.")
+        raise typer.Exit(code=1)
+
+    written = backfill_reading_rollups(ctx.obj.db, storage=storage, batch_days=batch_days)
+    for resolution, count in written.items():
+        typer.echo(f"{resolution.value}: {count} buckets written")
+
+    if not ctx.obj.sensors_config.rollups:
+        typer.echo("Set `rollups: true` in sensors.yaml to keep them current and read from them.")
+
+
+@app.command("partition-readings")
+def partition_readings(ctx: typer.Context, batch_size: int = 10_000):
+    """
+    Copy JSON sensor_reading rows into monthly partition files.
+    """
+    partitions = PartitionManager(ctx.obj.db, PARTITIONS_DIR)
+    copied = copy_readings_to_partitions(ctx.obj.db, partitions, batch_size=batch_size)
+    for key, count in copied.items():
+        typer.echo(f"{key}: {count} rows copied")
+
+    if ctx.obj.sensors_config.storage != ReadingStorage.PARTITIONED:
+        typer.echo("Set `storage: partitioned` in sensors.yaml to read from the partitions.")
+
+
+@app.command()
+def prune(ctx: typer.Context, dry_run: bool = False, loop: bool = False):
+    """
+    Archive and delete rows older than the retention policy in retention.yaml.
+    """
+    pruner = RetentionPruner(ctx.obj.db, ctx.obj.retention_config)
+
+    if dry_run:
+        for table, count in pruner.pending().items():
+            typer.echo(f"{table}: {count} rows expired")
+        return
+
+    if loop:
+        stop = threading.Event()
+        try:
+            pruner.run_forever(stop)
+        except KeyboardInterrupt:
+            stop.set()
+        return
+
+    for result in pruner.run_once():
+        typer.echo(f"{result.table}: {result.deleted} deleted, {result.archived} archived")
+
+
+@app.command()
+def sample(ctx: typer.Context, max_workers: int = 4, read_timeout: float = 10.0):
+    """
+    Read every configured sensor on its sampling interval until interrupted.
+    """
+    sensors_config = ctx.obj.sensors_config
+    repository = build_reading_repository(sensors_config.storage, rollups=sensors_config.rollups)
+    writer = BufferedReadingWriter(repository)
+    scheduler = SamplingScheduler(
+        sensors_config,
+        build_drivers(sensors_config),
+        writer,
+        max_workers=max_workers,
+        read_timeout_seconds=read_timeout,
+    )
+
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        pass
+
+    for sensor_id, stats in scheduler.stats.sensors.items():
+        typer.echo(
+            f"{sensor_id}: {stats.reads} reads, {stats.failures} failures, "
+            f"{stats.timeouts} timeouts, {stats.skipped} skipped"
+        )
+    typer.echo(f"{writer.stats.readings_written} readings written in {writer.stats.batches_written} batches")
+
+
+@app.command("generate-load")
+def generate_load(
+    ctx: typer.Context,
+    sensors: int = 100,
+    rate: float = 1000.0,
+    duration: float = 60.0,
+    backfill_days: float = 0.0,
+    batch_size: int = 500,
+    dropout_rate: float = DEFAULT_DROPOUT_RATE,
+    seed: int = 0,
+):
+    """
+    Write simulated readings from many sensor ids into the reading repository.
+
+    By default generates --rate readings per second across --sensors sensors
+    of each type for --duration seconds. With --backfill-days, instead writes
+    every sensor's series over the past days at its sampling interval, as
+    fast as possible.
+    """
+    sensors_config = ctx.obj.sensors_config
+    repository = build_reading_repository(sensors_config.storage, rollups=sensors_config.rollups)
+    writer = BufferedReadingWriter(repository, max_batch_size=batch_size)
+    generator = LoadGenerator(writer, sensors_per_type=sensors, seed=seed, dropout_rate=dropout_rate)
+
+    if backfill_days:
+        end = datetime.now(timezone.utc)
+        intervals = {
+            sensor_type: getattr(sensors_config, sensor_type.value).sampling.interval_seconds
+            for sensor_type in SensorType
+        }
+        stats = generator.backfill(end - timedelta(days=backfill_days), end, intervals)
+    else:
+        stop = threading.Event()
+        try:
+            stats = generator.run(rate, duration, stop)
+        except KeyboardInterrupt:
+            stop.set()
+            writer.flush()
+            raise
+
+    typer.echo(
+        f"{stats.generated} readings ({stats.dropouts} dropouts) in {stats.seconds:.1f}s: "
+        f"{stats.rate:.0f}/s, {writer.stats.batches_written} batches, "
+        f"avg flush {writer.stats.avg_flush_seconds * 1000:.1f} ms"
+    )
+
+
+@app.command("replay-states")
+def replay_states(
+    ctx: typer.Context,
+    days: float = 30.0,
+    interval: int = 0,
+    workers: int = 4,
+    output: Path | None = None,
+):
+    """
+    Recompute the state snapshot at every evaluation tick over the past days
+    and write them as gzip JSON Lines (default under replay/).
+
+    --interval defaults to the shortest evaluation cycle that keeps every
+    domain on time (the GCD of the evaluation intervals).
+    """
+    sensors_config = ctx.obj.sensors_config
+    if not interval:
+        interval = reduce(gcd, (
+            getattr(sensors_config, sensor_type.value).evaluation.interval_seconds for sensor_type in SensorType
+        ))
+
+    now = datetime.now(timezone.utc)
+    end = now - timedelta(seconds=now.timestamp() % interval)
+    start = end - timedelta(days=days)
+    output = output or REPLAY_DIR / f"states-{start:%Y%m%dT%H%M}-{end:%Y%m%dT%H%M}.jsonl.gz"
+
+    engine = StateReplayEngine(sensors_config, ctx.obj.policies_config, workers=workers)
+    ticks = engine.ticks(start, end, interval)
+    count = engine.write(engine.replay(ticks), output)
+    typer.echo(f"{count} snapshots from {start} to {end} written to {output}")
+
+
+@app.command("decision-cache")
+def decision_cache(ctx: typer.Context, clear: bool = False):
+    """
+    Show how many LLM calls the decision cache has saved, or clear it.
+    """
+    cache = DecisionCache()
+    if clear:
+        typer.echo(f"Removed {cache.clear()} cached decisions")
+        return
+
+    summary = cache.summary()
+    typer.echo(
+        f"{summary.entries} cached decisions, {summary.hits} hits, "
+        f"{summary.seconds_saved:.1f}s of API latency saved"
+    )
+
+
 def main():
     bootstrap()
     app_context = build_app_context(db)
@@ -0,0 +1,35 @@
+"""
+JSON encoding for storage and files.
+
+Plain values (JSON columns, reading payloads, archive rows) are encoded
+and decoded with orjson, several times faster than the stdlib json module
+on our payload shapes. Pydantic models are serialized by pydantic-core
+directly: dumping a model to a dict and handing that to orjson is slower
+than model_dump_json(). See benchmarks/serialization.py.
+
+orjson's output is equivalent JSON but not the same bytes as the stdlib's
+(1e-05 is written 0.00001, non-ASCII is not escaped), so anything hashed,
+like the canonical snapshot content, keeps its own fixed encoding.
+"""
+
+from typing import Any
+import orjson
+from pydantic import BaseModel
+
+
+def dumps(value: Any, sort_keys: bool = False) -> str:
+    """Compact JSON text. Raises TypeError for values orjson cannot encode."""
+    return orjson.dumps(value, option=orjson.OPT_SORT_KEYS if sort_keys else None).decode()
+
+
+def dumpb(value: Any) -> bytes:
+    """Compact JSON as UTF-8 bytes, for writing to files."""
+    return orjson.dumps(value)
+
+
+def loads(data: str | bytes) -> Any:
+    return orjson.loads(data)
+
+
+def dump_model(model: BaseModel) -> bytes:
+    return model.model_dump_json().encode()
@@ -5,6 +5,9 @@ APP_DIR = ROOT_DIR / "garden"
 
 DB_DIR = APP_DIR / "db"
 DB_PATH = DB_DIR / "db.sqlite3"
+PARTITIONS_DIR = DB_DIR / "partitions"
+REPLAY_DIR = ROOT_DIR / "replay"
 
 SENSORS_CONFIG_PATH = ROOT_DIR / "sensors.yaml"
-POLICIES_CONFIG_PATH = ROOT_DIR / "policies.yaml"
\ No newline at end of file
+POLICIES_CONFIG_PATH = ROOT_DIR / "policies.yaml"
+RETENTION_CONFIG_PATH = ROOT_DIR / "retention.yaml"
@@ -1,4 +1,13 @@
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from ...action.enums import ActionType
+from ...state.enums import (
+    HumidityLevel,
+    HumidityTrend,
+    SoilMoistureLevel,
+    SoilMoistureTrend,
+    TemperatureLevel,
+    TemperatureTrend,
+)
 
 
 class LightAdcCalibration(BaseModel):
@@ -65,8 +74,9 @@ class SoilLevelInterpretation(BaseModel):
 
     @model_validator(mode="after")
     def check_thresholds(self):
-        if self.wet_threshold >= self.dry_threshold:
-            raise ValueError("wet_threshold must be < dry_threshold")
+        # Moisture is normalized so that 0.0 is fully dry and 1.0 fully wet
+        if self.dry_threshold >= self.wet_threshold:
+            raise ValueError("dry_threshold must be < wet_threshold")
         return self
 
 
@@ -156,8 +166,57 @@ class ClimatePolicy(BaseModel):
     interpretation: ClimateInterpretation
 
 
+class FastPathCondition(BaseModel):
+    """
+    The discrete state a rule applies to. Each field takes one value or a
+    list of values; fields left out match anything.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    temperature_level: list[TemperatureLevel] | None = None
+    temperature_trend: list[TemperatureTrend] | None = None
+    humidity_level: list[HumidityLevel] | None = None
+    humidity_trend: list[HumidityTrend] | None = None
+    soil_moisture_level: list[SoilMoistureLevel] | None = None
+    soil_moisture_trend: list[SoilMoistureTrend] | None = None
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def wrap_single_value(cls, value):
+        if value is None or isinstance(value, list):
+            return value
+        return [value]
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if all(value is None for value in self.__dict__.values()):
+            raise ValueError("a fast path rule must constrain at least one field")
+        if any(value == [] for value in self.__dict__.values()):
+            raise ValueError("fast path condition values must not be empty")
+        return self
+
+
+class FastPathRule(BaseModel):
+    name: str
+    when: FastPathCondition
+    action: ActionType
+
+
+class FastPathPolicy(BaseModel):
+    enabled: bool = True
+    rules: list[FastPathRule] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def check_unique_names(self):
+        names = [rule.name for rule in self.rules]
+        if len(names) != len(set(names)):
+            raise ValueError("fast path rule names must be unique")
+        return self
+
+
 class PoliciesConfig(BaseModel):
     light: LightPolicy
     climate: ClimatePolicy
     soil_moisture: SoilMoisturePolicy
+    fast_path: FastPathPolicy = Field(default_factory=FastPathPolicy)
     policy_version: str
\ No newline at end of file
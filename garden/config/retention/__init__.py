@@ -0,0 +1,8 @@
+from .schemas import RetentionConfig, TableRetention
+from .loader import load_retention_config
+
+__all__ = [
+    "RetentionConfig",
+    "TableRetention",
+    "load_retention_config",
+]
@@ -0,0 +1,24 @@
+import logging
+from pathlib import Path
+import yaml
+from .schemas import RetentionConfig
+
+logger = logging.getLogger(__name__)
+
+
+def load_retention_config(path: Path) -> RetentionConfig:
+    """
+    Load and validate the retention configuration from a YAML file.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Retention config file not found: {path}")
+
+    with path.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+
+    if raw is None:
+        raise ValueError(f"Retention config file is empty: {path}")
+
+    logger.debug(f"Successfully built RetentionConfig object from {path.name}")
+
+    return RetentionConfig(**raw)
@@ -0,0 +1,26 @@
+from pathlib import Path
+from pydantic import BaseModel, Field
+from ...db.enums import ArchiveChunk, ArchiveCompression
+
+
+class TableRetention(BaseModel):
+    keep_days: int = Field(..., ge=1)
+    archive: bool = True
+
+
+class ArchiveConfig(BaseModel):
+    directory: Path = Path("archive")     # relative paths resolve against the project root
+    compression: ArchiveCompression = ArchiveCompression.GZIP
+    chunk: ArchiveChunk = ArchiveChunk.DAY
+
+
+class PrunerConfig(BaseModel):
+    batch_size: int = Field(500, ge=1, le=900)      # rows per delete; bound by SQLite's 999 parameters
+    pause_seconds: float = Field(0.05, ge=0.0)      # yield the write lock between batches
+    interval_seconds: int = Field(3600, ge=1)       # background run period
+
+
+class RetentionConfig(BaseModel):
+    archive: ArchiveConfig = ArchiveConfig()
+    pruner: PrunerConfig = PrunerConfig()
+    tables: dict[str, TableRetention]
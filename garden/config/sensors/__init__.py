@@ -1,8 +1,9 @@
-from .schemas import SensorsConfig, EvidenceConfig, EvaluationConfig
+from .schemas import SensorsConfig, SensorRef, EvidenceConfig, EvaluationConfig
 from .loader import load_sensors_config
 
 __all__ = [
     "SensorsConfig",
+    "SensorRef",
     "load_sensors_config",
     "EvidenceConfig",
     "EvaluationConfig",
@@ -1,10 +1,13 @@
 # config/models.py
 from pydantic import BaseModel
+from ...hardware.sensors.enums import ReadingStorage
 
 
 class SensorRef(BaseModel):
     id: str
     model: str | None = None    # Hardware model identifier (driver/ingestion concern only)
+    pin: str | None = None      # Board pin name, e.g. D4 (DHT22 data, MCP3008 chip select)
+    channel: int | None = None  # ADC input channel for analog sensors
 
 
 class SamplingConfig(BaseModel):
@@ -15,9 +18,15 @@ class EvaluationConfig(BaseModel):
     interval_seconds: int
 
 
+# Sample-based evidence ignores readings older than this, so a dead sensor
+# stops producing state instead of repeating its last readings forever.
+DEFAULT_SAMPLE_MAX_AGE_SECONDS = 3600
+
+
 class EvidenceConfig(BaseModel):
     lookback_seconds: int | None = None
     lookback_samples: int | None = None
+    max_age_seconds: int = DEFAULT_SAMPLE_MAX_AGE_SECONDS    # sample-based evidence only
 
     def validate_mode(self) -> None:
         if self.lookback_seconds is None and self.lookback_samples is None:
@@ -35,6 +44,8 @@ class SensorDomainConfig(BaseModel):
 
 
 class SensorsConfig(BaseModel):
+    storage: ReadingStorage = ReadingStorage.JSON
+    rollups: bool = False
     climate: SensorDomainConfig
     soil_moisture: SensorDomainConfig
     light: SensorDomainConfig
\ No newline at end of file
@@ -1,5 +1,7 @@
 from .base import BaseDBModel
+from .fields import OrjsonField
 
 __all__ = [
     "BaseDBModel",
+    "OrjsonField",
 ]
\ No newline at end of file
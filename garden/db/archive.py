@@ -0,0 +1,160 @@
+"""
+Compressed, append-only archive files for rows removed from the live database.
+
+Rows are stored as JSON Lines, one file per table per time chunk (day or
+month of the row's created value):
+
+    <directory>/<table>/<table>-<period>.jsonl.gz   (or .jsonl.xz)
+
+Column values are written exactly as SQLite stores them (timestamps and JSON
+fields stay text), so restore_rows() puts back byte-identical rows. Each
+write appends a new gzip member / xz stream and is fsynced before the caller
+deletes anything; both formats read concatenated members as one stream.
+A crash between archiving and deleting can archive a row twice, so readers
+should treat the primary key as the identity of a row.
+"""
+
+import gzip
+from datetime import datetime
+import logging
+import lzma
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+from peewee import SqliteDatabase, chunked
+from .enums import ArchiveChunk, ArchiveCompression
+from ..common.exc import RepositoryError
+from ..common.serialization import dumpb, loads
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES: dict[ArchiveCompression, str] = {
+    ArchiveCompression.GZIP: ".jsonl.gz",
+    ArchiveCompression.LZMA: ".jsonl.xz",
+}
+
+# Length of the "YYYY-MM-DD" / "YYYY-MM" prefix of a stored created value.
+_PERIOD_LENGTH: dict[ArchiveChunk, int] = {
+    ArchiveChunk.DAY: 10,
+    ArchiveChunk.MONTH: 7,
+}
+
+
+def _open_compressed(path: Path, mode: str) -> BinaryIO:
+    if path.name.endswith(SUFFIXES[ArchiveCompression.LZMA]):
+        return lzma.open(path, mode)  # type: ignore[return-value]
+    return gzip.open(path, mode)  # type: ignore[return-value]
+
+
+class ArchiveWriter:
+
+    def __init__(
+        self,
+        directory: Path,
+        compression: ArchiveCompression = ArchiveCompression.GZIP,
+        chunk: ArchiveChunk = ArchiveChunk.DAY,
+    ):
+        self.directory = directory
+        self.compression = compression
+        self.chunk = chunk
+
+    def path_for(self, table: str, period: str) -> Path:
+        return self.directory / table / f"{table}-{period}{SUFFIXES[self.compression]}"
+
+    def write(self, table: str, rows: list[dict[str, Any]]) -> list[Path]:
+        """
+        Append rows to their time-chunk files and fsync them.
+
+        Returns the files written. Raises RepositoryError if any write fails,
+        in which case the caller must not delete the rows.
+        """
+        by_period: dict[str, list[dict[str, Any]]] = {}
+        length = _PERIOD_LENGTH[self.chunk]
+        for row in rows:
+            by_period.setdefault(str(row["created"])[:length], []).append(row)
+
+        written = []
+        try:
+            for period, period_rows in sorted(by_period.items()):
+                path = self.path_for(table, period)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                payload = b"".join(dumpb(row) + b"\n" for row in period_rows)
+
+                with _open_compressed(path, "ab") as f:
+                    f.write(payload)
+                with path.open("rb") as f:
+                    os.fsync(f.fileno())
+                written.append(path)
+        except Exception as e:
+            msg = f"Failed to archive {len(rows)} {table} rows due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+        return written
+
+
+def archive_files(directory: Path, table: str) -> list[Path]:
+    """A table's archive files in chronological order, whatever their compression."""
+    table_dir = directory / table
+    if not table_dir.is_dir():
+        return []
+    suffixes = tuple(SUFFIXES.values())
+    return sorted(path for path in table_dir.iterdir() if path.name.endswith(suffixes))
+
+
+def iter_archive(
+    directory: Path,
+    table: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream archived rows of a table, oldest chunk first.
+
+    Files are decompressed incrementally, one line at a time, so memory use
+    does not depend on archive size. since/until filter on each row's
+    created value (inclusive).
+    """
+    for path in archive_files(directory, table):
+        with _open_compressed(path, "rb") as f:
+            for line in f:
+                row = loads(line)
+                if since is not None or until is not None:
+                    created = datetime.fromisoformat(row["created"])
+                    if since is not None and created < since:
+                        continue
+                    if until is not None and created > until:
+                        continue
+                yield row
+
+
+def restore_rows(
+    db: SqliteDatabase,
+    table: str,
+    rows: Iterator[dict[str, Any]],
+    batch_size: int = 500,
+) -> int:
+    """
+    Insert archived rows back into a table, keeping their primary keys.
+
+    Values are bound exactly as archived, bypassing model field conversion.
+    Rows whose primary key already exists are skipped. Returns the number
+    of rows inserted.
+    """
+    inserted = 0
+    try:
+        for batch in chunked(rows, batch_size):
+            with db.atomic():
+                for row in batch:
+                    columns = ", ".join(f'"{column}"' for column in row)
+                    placeholders = ", ".join("?" for _ in row)
+                    cursor = db.execute_sql(
+                        f'INSERT OR IGNORE INTO "{table}" ({columns}) VALUES ({placeholders})',
+                        tuple(row.values()),
+                    )
+                    inserted += cursor.rowcount
+    except Exception as e:
+        msg = f"Failed to restore archived {table} rows due to the following error: {e}"
+        raise RepositoryError(msg) from e
+
+    logger.info(f"Restored {inserted} archived rows into {table}")
+    return inserted
@@ -0,0 +1,11 @@
+from ..common.enums import GardenEnum
+
+
+class ArchiveCompression(GardenEnum):
+    GZIP = "gzip"
+    LZMA = "lzma"
+
+
+class ArchiveChunk(GardenEnum):
+    DAY = "day"         # one archive file per table per UTC day
+    MONTH = "month"     # one archive file per table per month
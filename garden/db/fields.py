@@ -0,0 +1,23 @@
+from typing import Any
+from peewee import Node
+from playhouse.sqlite_ext import JSONField
+from ..common.serialization import dumps, loads
+
+
+class OrjsonField(JSONField):
+    """
+    JSONField encoded and decoded with orjson.
+
+    Values are written as orjson's compact text directly instead of through
+    SQLite's json() function: the text is already minified, valid JSON, so
+    re-parsing it on every insert is skipped. Stored rows are unchanged, so
+    the column type and the json_extract() queries over it stay the same.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(json_dumps=dumps, json_loads=loads, **kwargs)
+
+    def db_value(self, value: Any) -> Any:
+        if value is None or isinstance(value, Node):
+            return value
+        return dumps(value)
@@ -0,0 +1,447 @@
+"""
+Idempotent schema migrations applied at startup, plus on-demand data migrations.
+
+Each startup migration inspects the live schema and only does work when the
+database is behind, so running them on every boot is cheap. Index builds
+use plain CREATE INDEX: in WAL mode readers keep working while the index
+is built and writers wait only for that one statement.
+
+Data migrations (e.g. copy_readings_to_typed, backfill_reading_rollups) are
+not run at startup; they are invoked explicitly from the CLI.
+"""
+
+from datetime import datetime, timedelta, UTC
+import logging
+from peewee import JOIN, SQL, SqliteDatabase, fn
+from playhouse.migrate import SqliteMigrator, make_index_name, migrate
+from .partitions import PartitionManager, month_keys
+from ..common.serialization import loads
+from ..decision.models import DecisionLog
+from ..hardware.sensors.enums import ReadingStorage, RollupResolution, SensorType
+from ..hardware.sensors.models import ROLLUP_MODELS, SensorReading, TYPED_READING_MODELS
+from ..hardware.sensors.schemas import PAYLOAD_SCHEMAS
+from ..state.models import STATE_MODELS, StateSnapshot
+from ..state.schemas import DerivedStateSnapshot
+from ..state.snapshots import content_hash, rebuild_snapshot, split_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _index_names(db: SqliteDatabase, table: str) -> set[str]:
+    return {index.name for index in db.get_indexes(table)}
+
+
+def add_sensor_reading_composite_index(db: SqliteDatabase) -> None:
+    """
+    Add the (sensor_type, sensor_id, created) index to sensor_reading.
+
+    The composite index makes the single-column sensor_type index redundant
+    (it is a prefix), so that index is dropped to save a write per insert.
+    Statistics are refreshed once after a build so the query planner picks
+    the new index immediately.
+    """
+    table = SensorReading._meta.table_name
+    if not db.table_exists(table):
+        return
+    before = _index_names(db, table)
+
+    with db.atomic():
+        SensorReading._schema.create_indexes(safe=True)
+        db.execute_sql('DROP INDEX IF EXISTS "sensorreading_sensor_type"')
+
+    created = _index_names(db, table) - before
+    if created:
+        db.execute_sql(f'ANALYZE "{table}"')
+        logger.info(f"Created indexes on {table}: {', '.join(sorted(created))}")
+
+
+def add_state_latest_indexes(db: SqliteDatabase) -> None:
+    """Add the (sensor_id, created) index used to load the latest state per sensor."""
+    for model in STATE_MODELS:
+        table = model._meta.table_name
+        if not db.table_exists(table):
+            continue
+        before = _index_names(db, table)
+        model._schema.create_indexes(safe=True)
+        if _index_names(db, table) - before:
+            db.execute_sql(f'ANALYZE "{table}"')
+            logger.info(f"Created latest-state index on {table}")
+
+
+def add_decision_snapshot_reference(db: SqliteDatabase) -> None:
+    """
+    Let decision_log reference a state_snapshot row instead of inlining it.
+
+    Adds the snapshot_hash and snapshot_created columns and makes the
+    legacy derived_state column nullable. SQLite can only drop NOT NULL by
+    rebuilding the table, and dropping the old table would cascade-delete
+    every action_log row, so foreign keys are switched off for the rebuild
+    (the pragma is a no-op inside a transaction) and checked before commit.
+    Existing rows keep their inline snapshot until dedup_decision_snapshots
+    is run.
+    """
+    table = DecisionLog._meta.table_name
+    if not db.table_exists(table):
+        return
+    migrator = SqliteMigrator(db)
+    columns = {column.name for column in db.get_columns(table)}
+    if DecisionLog.snapshot.column_name in columns:
+        # Databases migrated by an earlier version of this function also got
+        # add_column's own index on snapshot_hash, duplicating the model's.
+        index = make_index_name(table, (DecisionLog.snapshot.column_name,))
+        if index in {existing.name for existing in db.get_indexes(table)}:
+            migrate(migrator.drop_index(table, index))
+            logger.info(f"Dropped duplicate index {index}")
+        return
+
+    foreign_keys = db.pragma("foreign_keys")
+    db.pragma("foreign_keys", 0)
+    try:
+        with db.atomic():
+            migrate(
+                migrator.drop_not_null(table, DecisionLog.derived_state.column_name),
+                # alter_add_column rather than add_column, which would also
+                # index the column under a different name than create_tables.
+                migrator.alter_add_column(table, DecisionLog.snapshot.column_name, DecisionLog.snapshot),
+                migrator.add_column(table, DecisionLog.snapshot_created.column_name, DecisionLog.snapshot_created),
+            )
+            violations = db.execute_sql("PRAGMA foreign_key_check").fetchall()
+            if violations:
+                raise RuntimeError(f"Rebuilding {table} left {len(violations)} foreign key violations")
+    finally:
+        db.pragma("foreign_keys", foreign_keys)
+    logger.info(f"Added snapshot reference columns to {table}")
+
+
+def add_decision_action(db: SqliteDatabase) -> None:
+    """Add the nullable action column, set on decisions resolved by the fast path rules."""
+    table = DecisionLog._meta.table_name
+    if not db.table_exists(table):
+        return
+    columns = {column.name for column in db.get_columns(table)}
+    if DecisionLog.action.column_name in columns:
+        return
+
+    # A nullable column without a default is a plain ALTER TABLE ADD COLUMN.
+    migrate(SqliteMigrator(db).add_column(table, DecisionLog.action.column_name, DecisionLog.action))
+    logger.info(f"Added action column to {table}")
+
+
+def add_decision_snapshot_times(db: SqliteDatabase) -> None:
+    """
+    Add the nullable snapshot_times column, holding the per-domain times
+    that are left out of the shared snapshot content. Rows stored before
+    it keep their times in the content until dedup_decision_snapshots
+    splits them out.
+    """
+    table = DecisionLog._meta.table_name
+    if not db.table_exists(table):
+        return
+    columns = {column.name for column in db.get_columns(table)}
+    if DecisionLog.snapshot_times.column_name in columns:
+        return
+
+    migrate(SqliteMigrator(db).add_column(table, DecisionLog.snapshot_times.column_name, DecisionLog.snapshot_times))
+    logger.info(f"Added snapshot_times column to {table}")
+
+
+MIGRATIONS = [
+    add_sensor_reading_composite_index,
+    add_state_latest_indexes,
+    add_decision_snapshot_reference,
+    add_decision_action,
+    add_decision_snapshot_times,
+]
+
+
+def run_migrations(db: SqliteDatabase) -> None:
+    for migration in MIGRATIONS:
+        logger.debug(f"Applying migration {migration.__name__}")
+        migration(db)
+
+
+def copy_readings_to_typed(db: SqliteDatabase, batch_size: int = 10_000) -> dict[SensorType, int]:
+    """
+    Copy rows from the JSON sensor_reading table into the typed per-type tables.
+
+    Payload fields are extracted with SQLite's json_extract, so rows never
+    round-trip through Python. The copy walks sensor_reading by id range and
+    commits every batch_size source rows, keeping each write lock short.
+    Rows already present in the target (same sensor_id and created) are
+    skipped, so an interrupted copy can simply be re-run.
+
+    The JSON table is left untouched. Returns the number of rows copied per
+    sensor type.
+    """
+    source = SensorReading._meta.table_name
+    bounds = db.execute_sql(f'SELECT MIN(id), MAX(id) FROM "{source}"').fetchone()
+    copied = {sensor_type: 0 for sensor_type in TYPED_READING_MODELS}
+    if bounds[0] is None:
+        return copied
+
+    low, high = bounds
+    for sensor_type, model in TYPED_READING_MODELS.items():
+        target = model._meta.table_name
+        fields = list(PAYLOAD_SCHEMAS[sensor_type].model_fields)
+        columns = ", ".join(f'"{field}"' for field in fields)
+        extracts = ", ".join(f"json_extract(s.payload, '$.{field}')" for field in fields)
+        sql = (
+            f'INSERT INTO "{target}" (created, sensor_id, {columns}) '
+            f'SELECT s.created, s.sensor_id, {extracts} FROM "{source}" AS s '
+            f'WHERE s.sensor_type = ? AND s.id BETWEEN ? AND ? '
+            f'AND NOT EXISTS ('
+            f'SELECT 1 FROM "{target}" AS t WHERE t.sensor_id = s.sensor_id AND t.created = s.created'
+            f')'
+        )
+
+        for start in range(low, high + 1, batch_size):
+            with db.atomic():
+                cursor = db.execute_sql(sql, (sensor_type.value, start, start + batch_size - 1))
+                copied[sensor_type] += cursor.rowcount
+
+        logger.info(f"Copied {copied[sensor_type]} {sensor_type.value} readings into {target}")
+
+    return copied
+
+
+# Bucket start as stored by ReadingRollupRepository: created truncated to the
+# minute or hour, keeping created's UTC offset suffix if it has one.
+_CREATED_OFFSET = "(CASE WHEN substr(created, -6, 1) IN ('+', '-') THEN substr(created, -6) ELSE '' END)"
+_ROLLUP_BUCKETS = {
+    RollupResolution.MINUTE: f"substr(created, 1, 16) || ':00' || {_CREATED_OFFSET}",
+    RollupResolution.HOUR: f"substr(created, 1, 13) || ':00:00' || {_CREATED_OFFSET}",
+}
+
+
+def backfill_reading_rollups(
+    db: SqliteDatabase,
+    storage: ReadingStorage = ReadingStorage.JSON,
+    batch_days: int = 1,
+) -> dict[RollupResolution, int]:
+    """
+    Rebuild the minute and hour rollups from the stored readings.
+
+    Rollups are maintained as readings are saved, so readings stored before
+    rollups were enabled are missing from them. This recomputes every
+    bucket from the raw rows of the given storage (the JSON sensor_reading
+    table or the typed tables) with INSERT ... SELECT ... GROUP BY, so rows
+    never round-trip through Python; window functions pick each bucket's
+    first and last value. The work is split into batch_days of readings,
+    aligned to UTC midnight so no bucket straddles two batches, and each
+    batch replaces its buckets in one transaction. Re-running is safe.
+
+    Returns the number of buckets written per resolution.
+    """
+    if storage == ReadingStorage.PARTITIONED:
+        raise ValueError("Rollups can only be backfilled from the json or typed reading tables")
+
+    # (table, SELECT of one field as value, its extra parameters, field)
+    sources = []
+    for sensor_type in SensorType:
+        for field in PAYLOAD_SCHEMAS[sensor_type].model_fields:
+            if storage == ReadingStorage.TYPED:
+                table = TYPED_READING_MODELS[sensor_type]._meta.table_name
+                select = (
+                    f"SELECT '{sensor_type.value}' AS sensor_type, sensor_id, id, created, "
+                    f'CAST("{field}" AS REAL) AS value FROM "{table}" '
+                    f"WHERE created >= ? AND created < ?"
+                )
+                sources.append((table, select, (), field))
+            else:
+                table = SensorReading._meta.table_name
+                select = (
+                    f"SELECT sensor_type, sensor_id, id, created, "
+                    f"CAST(json_extract(payload, '$.{field}') AS REAL) AS value FROM \"{table}\" "
+                    f"WHERE created >= ? AND created < ? AND sensor_type = ?"
+                )
+                sources.append((table, select, (sensor_type.value,), field))
+
+    created = []
+    for table in {source[0] for source in sources}:
+        bounds = db.execute_sql(f'SELECT MIN(created), MAX(created) FROM "{table}"').fetchone()
+        created.extend(datetime.fromisoformat(value) for value in bounds if value is not None)
+    written = {resolution: 0 for resolution in RollupResolution}
+    if not created:
+        return written
+
+    columns = (
+        "created, sensor_type, sensor_id, field, bucket, sample_count, min_value, max_value, "
+        "sum_value, first_value, first_created, last_value, last_created"
+    )
+    step = timedelta(days=batch_days)
+    start = min(created).replace(hour=0, minute=0, second=0, microsecond=0)
+    last = max(created)
+    while start <= last:
+        stop = start + step
+        now = str(datetime.now(UTC))
+        with db.atomic():
+            for resolution, bucket in _ROLLUP_BUCKETS.items():
+                model = ROLLUP_MODELS[resolution]
+                target = model._meta.table_name
+                db.execute_sql(
+                    f'DELETE FROM "{target}" WHERE bucket >= ? AND bucket < ?', (str(start), str(stop)),
+                )
+                for _, source, params, field in sources:
+                    cursor = db.execute_sql(
+                        f'INSERT INTO "{target}" ({columns}) '
+                        f"SELECT ?, sensor_type, sensor_id, ?, bucket, COUNT(*), MIN(value), MAX(value), "
+                        f"SUM(value), MIN(first_value), MIN(created), MIN(last_value), MAX(created) "
+                        f"FROM ("
+                        f"SELECT sensor_type, sensor_id, created, value, {bucket} AS bucket, "
+                        f"FIRST_VALUE(value) OVER w AS first_value, "
+                        f"LAST_VALUE(value) OVER (w ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) "
+                        f"AS last_value "
+                        f"FROM ({source}) "
+                        f"WINDOW w AS (PARTITION BY sensor_id, {bucket} ORDER BY created, id)"
+                        f") GROUP BY sensor_type, sensor_id, bucket",
+                        (now, field, str(start), str(stop), *params),
+                    )
+                    written[resolution] += cursor.rowcount
+        start = stop
+
+    logger.info(", ".join(f"Backfilled {count} {resolution.value} rollups" for resolution, count in written.items()))
+    return written
+
+
+def copy_readings_to_partitions(
+    db: SqliteDatabase,
+    partitions: PartitionManager,
+    batch_size: int = 10_000,
+) -> dict[str, int]:
+    """
+    Copy rows from the main sensor_reading table into monthly partitions.
+
+    Works month by month, attaching each partition read-write and copying
+    in id-range batches of batch_size rows with INSERT ... SELECT, so rows
+    never round-trip through Python. Rows already present in the partition
+    are skipped, so an interrupted copy can be re-run. Cold partitions are
+    sealed at the end. The main table is left untouched.
+
+    Returns the number of rows copied per month.
+    """
+    source = SensorReading._meta.table_name
+    bounds = db.execute_sql(f'SELECT MIN(created), MAX(created) FROM "{source}"').fetchone()
+    copied: dict[str, int] = {}
+    if bounds[0] is None:
+        return copied
+
+    first, last = (datetime.fromisoformat(value) for value in bounds)
+    for key in month_keys(first, last):
+        year, month = map(int, key.split("-"))
+        month_start = datetime(year, month, 1, tzinfo=UTC)
+        month_end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=UTC)
+        id_range = db.execute_sql(
+            f'SELECT MIN(id), MAX(id) FROM "{source}" WHERE created >= ? AND created < ?',
+            (str(month_start), str(month_end)),
+        ).fetchone()
+        if id_range[0] is None:
+            continue
+
+        target = partitions.model(key, writable=True)
+        schema = target._meta.schema
+        sql = (
+            f'INSERT INTO "{schema}"."{source}" (created, sensor_type, sensor_id, payload) '
+            f'SELECT s.created, s.sensor_type, s.sensor_id, s.payload FROM main."{source}" AS s '
+            f'WHERE s.created >= ? AND s.created < ? AND s.id BETWEEN ? AND ? '
+            f'AND NOT EXISTS ('
+            f'SELECT 1 FROM "{schema}"."{source}" AS t WHERE t.sensor_type = s.sensor_type '
+            f'AND t.sensor_id = s.sensor_id AND t.created = s.created'
+            f')'
+        )
+
+        copied[key] = 0
+        low, high = id_range
+        for start in range(low, high + 1, batch_size):
+            with db.atomic():
+                cursor = db.execute_sql(sql, (str(month_start), str(month_end), start, start + batch_size - 1))
+                copied[key] += cursor.rowcount
+
+        logger.info(f"Copied {copied[key]} readings into partition {key}")
+
+    partitions.seal_cold()
+    return copied
+
+
+def dedup_decision_snapshots(db: SqliteDatabase, batch_size: int = 1_000) -> tuple[int, int]:
+    """
+    Move decision_log snapshots into the content-addressed state_snapshot
+    table.
+
+    Converts two kinds of rows: legacy rows with an inline derived_state,
+    and rows whose referenced content still carries the per-domain times
+    (stored before they were split out). Each snapshot is reduced to its
+    canonical content (see garden.state.snapshots); identical content is
+    stored once. The decision row then references it by hash, keeps the
+    snapshot's own times in snapshot_created and snapshot_times and has
+    derived_state cleared. Content rows no decision references any more
+    are deleted. Works through decision_log in id order, one transaction
+    per batch_size rows, so an interrupted run can simply be re-run.
+
+    Returns the number of decisions converted and of snapshots stored.
+    """
+    StateSnapshot.create_table(safe=True)
+    converted = stored = 0
+    last_id = 0
+    while True:
+        rows = list(
+            DecisionLog.select(
+                DecisionLog.id,
+                DecisionLog.derived_state,
+                DecisionLog.snapshot,
+                DecisionLog.snapshot_created,
+                StateSnapshot.content,
+            )
+            .join(StateSnapshot, on=(DecisionLog.snapshot == StateSnapshot.hash), join_type=JOIN.LEFT_OUTER)
+            .where(
+                (DecisionLog.id > last_id)
+                & (
+                    DecisionLog.derived_state.is_null(False)
+                    | (DecisionLog.snapshot.is_null(False) & DecisionLog.snapshot_times.is_null())
+                )
+            )
+            .order_by(DecisionLog.id)
+            .limit(batch_size)
+            .tuples()
+        )
+        if not rows:
+            break
+
+        contents: dict[str, str] = {}
+        replaced: set[str] = set()
+        updates = []
+        for decision_id, derived_state, old_digest, created, old_content in rows:
+            if derived_state is not None:
+                state = loads(derived_state) if isinstance(derived_state, str) else derived_state
+                snapshot = DerivedStateSnapshot.model_validate(state)
+            else:
+                snapshot = rebuild_snapshot(old_content, created)
+            content, times = split_snapshot(snapshot)
+            digest = content_hash(content)
+            contents[digest] = content
+            if old_digest is not None and old_digest != digest:
+                replaced.add(old_digest)
+            updates.append((decision_id, digest, snapshot.created, times))
+
+        with db.atomic():
+            query = StateSnapshot.insert_many(
+                [{"hash": digest, "content": content} for digest, content in contents.items()]
+            ).on_conflict_ignore()
+            stored += db.execute(query).rowcount
+            for decision_id, digest, created, times in updates:
+                DecisionLog.update(
+                    snapshot=digest,
+                    snapshot_created=created,
+                    snapshot_times=times,
+                    derived_state=None,
+                ).where(DecisionLog.id == decision_id).execute()
+            if replaced:
+                referenced = DecisionLog.select(SQL("1")).where(DecisionLog.snapshot == StateSnapshot.hash)
+                StateSnapshot.delete().where(
+                    StateSnapshot.hash.in_(list(replaced)) & ~fn.EXISTS(referenced)
+                ).execute()
+
+        converted += len(rows)
+        last_id = rows[-1][0]
+
+    logger.info(f"Moved {converted} decision snapshots into {stored} state_snapshot rows")
+    return converted, stored
@@ -0,0 +1,187 @@
+"""
+Monthly SQLite partitions for sensor readings, attached on demand.
+
+Each calendar month (UTC) of readings lives in its own file,
+<directory>/readings-YYYY-MM.sqlite3, holding a sensor_reading table with
+the same schema and indexes as the main one. Partitions are ATTACHed to the
+shared connection only while needed:
+
+- hot partitions (the newest `hot_months` months) are attached read-write
+  in WAL mode, like the main database;
+- older, cold partitions are sealed once (checkpointed and switched to a
+  rollback journal) and from then on attached read-only, and only when a
+  query's window reaches back into them.
+
+At most `max_attached` partitions are attached at once; the least recently
+used one is detached to make room (SQLite allows 10 by default). ATTACH runs
+on the calling thread's connection and cannot run inside a transaction, so
+callers attach what they need before opening one.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+import logging
+from pathlib import Path
+from peewee import SqliteDatabase
+from ..hardware.sensors.models import SensorReading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOT_MONTHS = 2
+DEFAULT_MAX_ATTACHED = 6
+
+# Bytes 18-19 of the SQLite header are the file format versions: 2 means WAL.
+_WAL_FORMAT = 2
+
+
+def month_key(value: datetime) -> str:
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def month_keys(start: datetime, end: datetime) -> list[str]:
+    """Every month key from start's month to end's month, inclusive."""
+    keys = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        keys.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return keys
+
+
+def _month_index(key: str) -> int:
+    year, month = key.split("-")
+    return int(year) * 12 + int(month) - 1
+
+
+class PartitionManager:
+
+    def __init__(
+        self,
+        db: SqliteDatabase,
+        directory: Path,
+        hot_months: int = DEFAULT_HOT_MONTHS,
+        max_attached: int = DEFAULT_MAX_ATTACHED,
+    ):
+        if hot_months < 1 or max_attached < hot_months:
+            raise ValueError("Need hot_months >= 1 and max_attached >= hot_months")
+        self.db = db
+        self.directory = directory
+        self.hot_months = hot_months
+        self.max_attached = max_attached
+        # schema name -> writable, most recently used last
+        self._attached: OrderedDict[str, bool] = OrderedDict()
+        self._models: dict[str, type[SensorReading]] = {}
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"readings-{key}.sqlite3"
+
+    def months(self) -> list[str]:
+        """Keys of the partitions that exist on disk, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        return sorted(path.stem.removeprefix("readings-") for path in self.directory.glob("readings-*.sqlite3"))
+
+    def is_cold(self, key: str, now: datetime | None = None) -> bool:
+        current = month_key(now or datetime.now(timezone.utc))
+        return _month_index(key) <= _month_index(current) - self.hot_months
+
+    def model(self, key: str, writable: bool = False) -> type[SensorReading]:
+        """
+        The sensor_reading model bound to a partition, attaching it first.
+
+        writable=True creates the partition if it does not exist and
+        attaches it read-write, even if it is cold (e.g. for a backfill).
+        Otherwise cold partitions are attached read-only.
+        """
+        schema = self._schema(key)
+        writable = writable or not self.is_cold(key)
+
+        if schema in self._attached and (self._attached[schema] or not writable):
+            self._attached.move_to_end(schema)
+            return self._model(key)
+
+        if schema in self._attached:
+            self.detach(key)
+
+        self._make_room()
+        path = self.path(key)
+        if writable:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.db.attach(str(path), schema)
+            model = self._model(key)
+            model.create_table(safe=True)
+            self.db.execute_sql(f'PRAGMA "{schema}".journal_mode = wal')
+        else:
+            if self._is_wal(path):
+                self.seal(key)
+            self.db.attach(f"file:{path}?mode=ro", schema)
+            model = self._model(key)
+
+        self._attached[schema] = writable
+        logger.debug(f"Attached partition {key} ({'read-write' if writable else 'read-only'})")
+        return model
+
+    def seal(self, key: str) -> None:
+        """
+        Checkpoint a partition and switch it to a rollback journal, so it
+        can be opened read-only without a WAL index. Leaves it detached.
+        """
+        schema = self._schema(key)
+        if schema in self._attached:
+            self.detach(key)
+        self.db.attach(str(self.path(key)), schema)
+        try:
+            self.db.execute_sql(f'PRAGMA "{schema}".wal_checkpoint(TRUNCATE)')
+            self.db.execute_sql(f'PRAGMA "{schema}".journal_mode = delete')
+        finally:
+            self.db.detach(schema)
+        logger.info(f"Sealed partition {key}")
+
+    def detach(self, key: str) -> bool:
+        schema = self._schema(key)
+        self._attached.pop(schema, None)
+        return self.db.detach(schema)
+
+    def detach_cold(self, now: datetime | None = None) -> list[str]:
+        """Detach every attached cold partition; returns their keys."""
+        keys = [self._key(schema) for schema in self._attached]
+        cold = [key for key in keys if self.is_cold(key, now)]
+        for key in cold:
+            self.detach(key)
+        return cold
+
+    def seal_cold(self, now: datetime | None = None) -> list[str]:
+        """Seal every cold partition still in WAL mode; returns their keys."""
+        sealed = []
+        for key in self.months():
+            if self.is_cold(key, now) and self._is_wal(self.path(key)):
+                self.seal(key)
+                sealed.append(key)
+        return sealed
+
+    def _make_room(self) -> None:
+        while len(self._attached) >= self.max_attached:
+            schema = next(iter(self._attached))
+            self.detach(self._key(schema))
+
+    def _model(self, key: str) -> type[SensorReading]:
+        if key not in self._models:
+            schema = self._schema(key)
+            meta = type("Meta", (), {"schema": schema, "table_name": SensorReading._meta.table_name})
+            self._models[key] = type(
+                f"SensorReading_{schema}", (SensorReading,), {"Meta": meta, "__module__": __name__},
+            )
+        return self._models[key]
+
+    def _schema(self, key: str) -> str:
+        return f"readings_{key.replace('-', '_')}"
+
+    def _key(self, schema: str) -> str:
+        return schema.removeprefix("readings_").replace("_", "-")
+
+    def _is_wal(self, path: Path) -> bool:
+        if not path.exists():
+            return False
+        with path.open("rb") as f:
+            header = f.read(20)
+        return len(header) == 20 and header[18] == _WAL_FORMAT
@@ -0,0 +1,34 @@
+"""
+EXPLAIN QUERY PLAN helpers.
+
+Used to verify that repository queries are served by an index rather than
+by a full table scan.
+"""
+
+from dataclasses import dataclass
+from peewee import SelectBase
+
+
+@dataclass(frozen=True)
+class QueryPlanReport:
+    name: str
+    sql: str
+    details: list[str]
+
+    @property
+    def full_scan(self) -> bool:
+        # SQLite reports index lookups as "SEARCH ..." and full passes over a
+        # table (or over a whole index) as "SCAN ...".
+        return any(detail.startswith("SCAN") for detail in self.details)
+
+
+def explain(name: str, query: SelectBase) -> QueryPlanReport:
+    sql, params = query.sql()
+    cursor = query.model._meta.database.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params)
+    # Rows are (id, parent, notused, detail)
+    details = [row[3] for row in cursor.fetchall()]
+    return QueryPlanReport(name=name, sql=sql, details=details)
+
+
+def explain_queries(queries: dict[str, SelectBase]) -> list[QueryPlanReport]:
+    return [explain(name, query) for name, query in queries.items()]
@@ -0,0 +1,183 @@
+"""
+Retention pruner: archives and deletes rows older than each table's policy.
+
+Deletes run in transactions of at most pruner.batch_size rows with a short
+pause in between, so the write lock is only ever held for one small batch
+and concurrent writers (the sampler, the decision loop) are not starved.
+
+Foreign keys are respected: tables referenced by others are pruned after
+them, and a parent row is only deleted once no child row references it.
+For ActionLog -> DecisionLog (ON DELETE CASCADE) this means a decision is
+kept as long as any of its actions is, so the cascade never removes
+actions that were not archived first. Likewise a state_snapshot row is
+kept while any decision references it.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+import time
+from peewee import SQL, Model, SqliteDatabase, fn
+from .archive import ArchiveWriter
+from ..action.models import ActionLog
+from ..common.exc import RepositoryError
+from ..config.constants import ROOT_DIR
+from ..config.retention import RetentionConfig, TableRetention
+from ..decision.models import DecisionLog
+from ..hardware.sensors.models import ROLLUP_MODELS, SensorReading, TYPED_READING_MODELS
+from ..state.models import ClimateState, LightState, SoilMoistureState, StateSnapshot
+
+logger = logging.getLogger(__name__)
+
+PRUNABLE_MODELS: dict[str, type[Model]] = {
+    model._meta.table_name: model
+    for model in [
+        SensorReading,
+        *TYPED_READING_MODELS.values(),
+        *ROLLUP_MODELS.values(),
+        ClimateState,
+        LightState,
+        SoilMoistureState,
+        ActionLog,
+        DecisionLog,
+        StateSnapshot,
+    ]
+}
+
+
+@dataclass
+class PruneResult:
+    table: str
+    archived: int = 0
+    deleted: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+def prune_order(tables: list[str]) -> list[str]:
+    """Order tables so every table comes before the tables it references."""
+    ordered: list[str] = []
+
+    def visit(table: str, path: tuple[str, ...]) -> None:
+        if table in ordered or table in path:
+            return
+        model = PRUNABLE_MODELS[table]
+        for backref in model._meta.backrefs:
+            child = backref.model._meta.table_name
+            if child in tables:
+                visit(child, path + (table,))
+        ordered.append(table)
+
+    for table in tables:
+        visit(table, ())
+    return ordered
+
+
+class RetentionPruner:
+
+    def __init__(self, db: SqliteDatabase, config: RetentionConfig):
+        unknown = set(config.tables) - set(PRUNABLE_MODELS)
+        if unknown:
+            raise ValueError(f"Retention configured for unknown tables: {', '.join(sorted(unknown))}")
+
+        self.db = db
+        self.config = config
+        directory = config.archive.directory
+        self.archive = ArchiveWriter(
+            directory=directory if directory.is_absolute() else ROOT_DIR / directory,
+            compression=config.archive.compression,
+            chunk=config.archive.chunk,
+        )
+
+    def run_once(self, now: datetime | None = None) -> list[PruneResult]:
+        """Prune every configured table once, children before parents."""
+        now = now or datetime.now(timezone.utc)
+        results = []
+        for table in prune_order(list(self.config.tables)):
+            result = self.prune_table(table, self.config.tables[table], now)
+            if result.deleted:
+                logger.info(
+                    f"Pruned {result.deleted} rows from {table} "
+                    f"({result.archived} archived, {result.batches} batches, {result.seconds:.1f}s)"
+                )
+            results.append(result)
+        return results
+
+    def pending(self, now: datetime | None = None) -> dict[str, int]:
+        """Rows each configured table would lose on the next run."""
+        now = now or datetime.now(timezone.utc)
+        return {
+            table: self._expired(PRUNABLE_MODELS[table], policy, now).count()
+            for table, policy in self.config.tables.items()
+        }
+
+    def prune_table(self, table: str, policy: TableRetention, now: datetime) -> PruneResult:
+        model = PRUNABLE_MODELS[table]
+        pk = model._meta.primary_key
+        batch_size = self.config.pruner.batch_size
+        result = PruneResult(table=table)
+        started = time.perf_counter()
+
+        while True:
+            query = self._expired(model, policy, now).order_by(model.created).limit(batch_size)
+            cursor = self.db.execute(query)
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor]
+            if not rows:
+                break
+
+            # Archive first: if this fails nothing is deleted.
+            if policy.archive:
+                self.archive.write(table, rows)
+                result.archived += len(rows)
+
+            ids = [row[pk.column_name] for row in rows]
+            try:
+                with self.db.atomic():
+                    # Re-check expiry so a child inserted since the select
+                    # keeps its parent alive.
+                    result.deleted += (
+                        model.delete()
+                        .where(pk.in_(ids) & self._condition(model, policy, now))
+                        .execute()
+                    )
+            except Exception as e:
+                msg = f"Failed to delete {len(ids)} expired {table} rows due to the following error: {e}"
+                raise RepositoryError(msg) from e
+
+            result.batches += 1
+            if len(rows) < batch_size:
+                break
+            time.sleep(self.config.pruner.pause_seconds)
+
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def run_forever(self, stop: threading.Event) -> None:
+        """Run every pruner.interval_seconds until stop is set."""
+        while not stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Retention pruner run failed")
+            stop.wait(self.config.pruner.interval_seconds)
+
+    def start(self, stop: threading.Event) -> threading.Thread:
+        """Run the pruner in a daemon thread; set stop to end it."""
+        thread = threading.Thread(target=self.run_forever, args=(stop,), name="retention-pruner", daemon=True)
+        thread.start()
+        return thread
+
+    def _expired(self, model: type[Model], policy: TableRetention, now: datetime):
+        return model.select().where(self._condition(model, policy, now))
+
+    def _condition(self, model: type[Model], policy: TableRetention, now: datetime):
+        cutoff = now - timedelta(days=policy.keep_days)
+        condition = model.created < cutoff
+        for backref in model._meta.backrefs:
+            child = backref.model
+            condition &= ~fn.EXISTS(
+                child.select(SQL("1")).where(backref == model._meta.primary_key)
+            )
+        return condition
@@ -1,11 +1,16 @@
-from .service import DecisionService
+from .service import DecisionService, DecisionStats
 from .repository import DecisionRepository
-from .schemas import DecisionResult
+from .schemas import DecisionSchema
 from .enums import DecisionOutcome
+from .rules import FastPathEngine, FastPathReason, FastPathResult
 
 __all__ = [
     "DecisionService",
+    "DecisionStats",
     "DecisionRepository",
-    "DecisionResult",
+    "DecisionSchema",
     "DecisionOutcome",
+    "FastPathEngine",
+    "FastPathReason",
+    "FastPathResult",
 ]
@@ -3,5 +3,6 @@ from ..common import GardenEnum
 
 class DecisionOutcome(GardenEnum):
     NO_ACTION = "no_action"
+    ACT = "act"                 # resolved to an action by the fast path rules
     ESCALATE = "escalate"
     ALERT = "alert"
@@ -1,11 +1,15 @@
-from playhouse.sqlite_ext import JSONField
 from peewee import (
     AutoField,
+    DateTimeField,
     FloatField,
+    ForeignKeyField,
     TextField,
 )
 from ..db.base import BaseDBModel
+from ..db.fields import OrjsonField
+from ..state.models import StateSnapshot
 from .enums import DecisionOutcome
+from ..action.enums import ActionType
 
 
 class DecisionLog(BaseDBModel):
@@ -13,7 +17,14 @@ class DecisionLog(BaseDBModel):
     id = AutoField()
     decision_outcome = TextField(choices=DecisionOutcome.choices, index=True)
     confidence = FloatField()
-    derived_state = JSONField()
+    action = TextField(choices=ActionType.choices, null=True)
+    # Legacy inline snapshot; new rows reference a StateSnapshot instead.
+    derived_state = OrjsonField(null=True)
+    snapshot = ForeignKeyField(StateSnapshot, null=True, column_name="snapshot_hash", backref="decisions")
+    snapshot_created = DateTimeField(null=True)
+    # The snapshot's per-domain window and state times, which are not part
+    # of the shared content (see garden.state.snapshots).
+    snapshot_times = OrjsonField(null=True)
     policy_version = TextField(index=True)
 
     class Meta:  # type: ignore[misc]
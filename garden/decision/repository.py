@@ -1,13 +1,31 @@
+from datetime import datetime
 import logging
+from typing import Any, Iterable
+from peewee import JOIN, fn
 from .models import DecisionLog
 from .schemas import DecisionSchema
+from ..action.enums import ActionType
+from ..db.sqlite_db import db
+from ..state.models import StateSnapshot
 from ..state.schemas import DerivedStateSnapshot
+from ..state.snapshots import SnapshotTimes, content_hash, rebuild_snapshot, split_snapshot
 from ..common.exc import RepositoryError
 
 logger = logging.getLogger(__name__)
 
 
 class DecisionRepository:
+    """
+    Persists decisions and the state snapshots that produced them.
+
+    Snapshots are stored content-addressed: a decision references a
+    state_snapshot row by the hash of the snapshot's canonical content and
+    keeps the snapshot's own times in snapshot_created and snapshot_times,
+    so decisions taken on the same derived state share one row even though
+    its windows have moved. Rows written before the
+    state_snapshot table existed keep their inline derived_state until
+    dedup_decision_snapshots() moves them; the readers handle both.
+    """
 
     def save(
         self,
@@ -17,14 +35,96 @@ class DecisionRepository:
         """
         Persist a decision result along with the state snapshot that produced it.
         """
+        content, times = split_snapshot(snapshot)
         try:
-            return DecisionLog.create(
-                decision_outcome=result.outcome.value,
-                confidence=result.confidence,
-                derived_state=snapshot.model_dump(mode="json"),
-                policy_version=result.policy_version,
-            )
+            with db.atomic():
+                digest = content_hash(content)
+                StateSnapshot.insert(hash=digest, content=content).on_conflict_ignore().execute()
+                return DecisionLog.create(
+                    decision_outcome=result.outcome.value,
+                    confidence=result.confidence,
+                    action=result.action.value if result.action else None,
+                    snapshot=digest,
+                    snapshot_created=snapshot.created,
+                    snapshot_times=times,
+                    policy_version=result.policy_version,
+                )
         except Exception as e:
             msg = f"Failed to save DecisionLog: {e}"
             logger.error(msg, exc_info=True)
             raise RepositoryError(msg) from e
+
+    def fetch_snapshot(self, decision_id: int) -> DerivedStateSnapshot | None:
+        """The snapshot a decision was taken on, or None if the decision does not exist."""
+        return self.fetch_snapshots([decision_id]).get(decision_id)
+
+    def fetch_snapshots(self, decision_ids: Iterable[int]) -> dict[int, DerivedStateSnapshot]:
+        """
+        The snapshots of many decisions, keyed by decision id, from one query
+        joining each decision to its snapshot by primary key. Unknown ids are
+        left out.
+        """
+        decision_ids = list(decision_ids)
+        try:
+            rows = (
+                DecisionLog.select(
+                    DecisionLog.id,
+                    DecisionLog.derived_state,
+                    DecisionLog.snapshot_created,
+                    DecisionLog.snapshot_times,
+                    StateSnapshot.content,
+                )
+                .join(StateSnapshot, on=(DecisionLog.snapshot == StateSnapshot.hash), join_type=JOIN.LEFT_OUTER)
+                .where(DecisionLog.id.in_(decision_ids))
+                .tuples()
+            )
+            return {decision_id: self._to_snapshot(*row) for decision_id, *row in rows}
+        except Exception as e:
+            msg = f"Failed to fetch snapshots of {len(decision_ids)} decisions due to the following error: {e}"
+            logger.error(msg, exc_info=True)
+            raise RepositoryError(msg) from e
+
+    def fetch_snapshot_by_hash(
+        self,
+        digest: str,
+        created: datetime,
+        times: SnapshotTimes | None = None,
+    ) -> DerivedStateSnapshot | None:
+        """A stored snapshot's content with the given times, or None if unknown."""
+        try:
+            content = StateSnapshot.select(StateSnapshot.content).where(StateSnapshot.hash == digest).scalar()
+        except Exception as e:
+            msg = f"Failed to fetch state snapshot {digest} due to the following error: {e}"
+            logger.error(msg, exc_info=True)
+            raise RepositoryError(msg) from e
+        return rebuild_snapshot(content, created, times) if content is not None else None
+
+    def fetch_last_executed(self, action_types: Iterable[ActionType]) -> datetime | None:
+        """When the most recent executed action of the given types was logged, or None."""
+        # Imported here: action.models imports decision.models, which loads this package.
+        from ..action.models import ActionLog
+
+        values = [action_type.value for action_type in action_types]
+        try:
+            last = (
+                ActionLog.select(fn.MAX(ActionLog.created))
+                .where(ActionLog.action_type.in_(values), ActionLog.executed)
+                .scalar()
+            )
+        except Exception as e:
+            msg = f"Failed to fetch the last executed {', '.join(values)} action due to the following error: {e}"
+            logger.error(msg, exc_info=True)
+            raise RepositoryError(msg) from e
+        # MAX() bypasses the field's conversion, so the ISO text comes back as is.
+        return datetime.fromisoformat(last) if isinstance(last, str) else last
+
+    def _to_snapshot(
+        self,
+        derived_state: Any,
+        created: Any,
+        times: SnapshotTimes | None,
+        content: str | None,
+    ) -> DerivedStateSnapshot:
+        if content is not None:
+            return rebuild_snapshot(content, created, times)
+        return DerivedStateSnapshot.model_validate(derived_state)
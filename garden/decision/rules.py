@@ -0,0 +1,164 @@
+"""
+Fast path: policy rules that resolve routine escalations without the LLM.
+
+The rules in policies.yaml (fast_path) are compiled once into a table
+keyed by the discrete climate and soil signature: temperature, humidity
+and soil moisture levels and trends, 729 combinations in all. Resolving a
+snapshot is then one dict lookup.
+
+A signature resolves to an action only if the rules matching it cover
+every out-of-range level and all name the same action. Signatures with an
+uncovered level (unmatched) or with rules that disagree (conflict) go to
+the LLM. Watering actions are also held back, and escalated, while the
+last watering is within watering.min_interval_seconds.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from itertools import product
+import logging
+
+from ..action.enums import ActionType
+from ..config.policies import PoliciesConfig
+from ..config.policies.schemas import FastPathCondition, FastPathRule
+from ..common import GardenEnum
+from ..state.enums import (
+    HumidityLevel,
+    HumidityTrend,
+    SoilMoistureLevel,
+    SoilMoistureTrend,
+    TemperatureLevel,
+    TemperatureTrend,
+)
+from ..state.schemas import DerivedStateSnapshot
+
+logger = logging.getLogger(__name__)
+
+WATERING_ACTIONS = frozenset({ActionType.WATER_SMALL, ActionType.WATER_MEDIUM, ActionType.WATER_LARGE})
+
+# Signature fields in order, with their enums.
+SIGNATURE_FIELDS: dict[str, type[GardenEnum]] = {
+    "temperature_level": TemperatureLevel,
+    "temperature_trend": TemperatureTrend,
+    "humidity_level": HumidityLevel,
+    "humidity_trend": HumidityTrend,
+    "soil_moisture_level": SoilMoistureLevel,
+    "soil_moisture_trend": SoilMoistureTrend,
+}
+
+# Level fields, and the value that is within the acceptable range.
+LEVEL_FIELDS: dict[str, GardenEnum] = {
+    "temperature_level": TemperatureLevel.OK,
+    "humidity_level": HumidityLevel.OK,
+    "soil_moisture_level": SoilMoistureLevel.OK,
+}
+
+Signature = tuple[GardenEnum, ...]
+
+
+class FastPathReason(GardenEnum):
+    RESOLVED = "resolved"
+    UNMATCHED = "unmatched"                     # an out-of-range level no rule covers
+    CONFLICT = "conflict"                       # matching rules name different actions
+    WATERING_INTERVAL = "watering_interval"     # watered less than min_interval_seconds ago
+
+
+@dataclass(frozen=True)
+class FastPathResult:
+    reason: FastPathReason
+    action: ActionType | None = None    # set only when resolved
+    rules: tuple[str, ...] = ()         # the matching rules
+
+
+def signature(snapshot: DerivedStateSnapshot) -> Signature:
+    """The snapshot's discrete climate and soil state, in SIGNATURE_FIELDS order."""
+    climate, soil_moisture = snapshot.climate, snapshot.soil_moisture
+    if climate is None or soil_moisture is None:
+        raise ValueError("fast path signatures need both climate and soil moisture state")
+    return (
+        climate.temperature_level,
+        climate.temperature_trend,
+        climate.humidity_level,
+        climate.humidity_trend,
+        soil_moisture.level,
+        soil_moisture.trend,
+    )
+
+
+def _matches(condition: FastPathCondition, values: dict[str, GardenEnum]) -> bool:
+    for field, value in values.items():
+        allowed = getattr(condition, field)
+        if allowed is not None and value not in allowed:
+            return False
+    return True
+
+
+def _compile_signature(rules: list[FastPathRule], values: dict[str, GardenEnum]) -> FastPathResult:
+    matched = [rule for rule in rules if _matches(rule.when, values)]
+    names = tuple(rule.name for rule in matched)
+    covered = {field for rule in matched for field in LEVEL_FIELDS if getattr(rule.when, field) is not None}
+    violations = {field for field, ok in LEVEL_FIELDS.items() if values[field] != ok}
+
+    if not violations <= covered:
+        return FastPathResult(FastPathReason.UNMATCHED, rules=names)
+    actions = {rule.action for rule in matched}
+    if len(actions) != 1:
+        return FastPathResult(FastPathReason.CONFLICT, rules=names)
+    return FastPathResult(FastPathReason.RESOLVED, action=actions.pop(), rules=names)
+
+
+class FastPathEngine:
+    """
+    Resolves out-of-range snapshots to an action from the policy rules, or
+    says why the snapshot has to go to the LLM.
+    """
+
+    def __init__(self, policies: PoliciesConfig):
+        self.enabled = policies.fast_path.enabled
+        self.watering_interval = timedelta(
+            seconds=policies.soil_moisture.intervention.watering.min_interval_seconds,
+        )
+        self.table = self._compile(policies.fast_path.rules) if self.enabled else {}
+        resolved = sum(result.reason == FastPathReason.RESOLVED for result in self.table.values())
+        logger.debug(
+            f"Compiled {len(policies.fast_path.rules)} fast path rules: "
+            f"{resolved} of {len(self.table)} signatures resolve without the LLM"
+        )
+
+    @staticmethod
+    def _compile(rules: list[FastPathRule]) -> dict[Signature, FastPathResult]:
+        table = {}
+        for values in product(*(list(enum) for enum in SIGNATURE_FIELDS.values())):
+            table[values] = _compile_signature(rules, dict(zip(SIGNATURE_FIELDS, values)))
+        return table
+
+    def resolve(
+        self,
+        snapshot: DerivedStateSnapshot,
+        last_watered: datetime | None = None,
+    ) -> FastPathResult:
+        """
+        Resolve a snapshot that has out-of-range levels.
+
+        last_watered is the time of the last watering, if any; it is only
+        consulted when the result is a watering action, and is compared
+        with the snapshot's created time.
+        """
+        if not self.enabled:
+            return FastPathResult(FastPathReason.UNMATCHED)
+        result = self.table[signature(snapshot)]
+        if result.action in WATERING_ACTIONS and not self.can_water(snapshot.created, last_watered):
+            return FastPathResult(FastPathReason.WATERING_INTERVAL, rules=result.rules)
+        return result
+
+    def needs_last_watered(self, snapshot: DerivedStateSnapshot) -> bool:
+        """Whether resolve() would consult last_watered for this snapshot."""
+        return self.enabled and self.table[signature(snapshot)].action in WATERING_ACTIONS
+
+    def can_water(self, now: datetime, last_watered: datetime | None) -> bool:
+        if last_watered is None:
+            return True
+        # Timestamps read back from SQLite may be naive; they are stored in UTC.
+        now = now if now.tzinfo else now.replace(tzinfo=UTC)
+        last_watered = last_watered if last_watered.tzinfo else last_watered.replace(tzinfo=UTC)
+        return now - last_watered >= self.watering_interval
@@ -1,11 +1,13 @@
 from datetime import datetime, UTC
 from pydantic import BaseModel, Field
 from .enums import DecisionOutcome
+from ..action.enums import ActionType
 
 
 class DecisionSchema(BaseModel):
 
     outcome: DecisionOutcome
     confidence: float
+    action: ActionType | None = None    # set when outcome is ACT
     policy_version: str
     created: datetime = Field(default_factory=lambda: datetime.now(UTC))
@@ -1,7 +1,10 @@
+from collections import Counter
+from dataclasses import dataclass, field
 import logging
 
 from .enums import DecisionOutcome
 from .repository import DecisionRepository
+from .rules import WATERING_ACTIONS, FastPathEngine, FastPathReason, FastPathResult
 from .schemas import DecisionSchema
 from ..config.policies import PoliciesConfig
 from ..state.schemas import DerivedStateSnapshot
@@ -12,6 +15,39 @@ logger = logging.getLogger(__name__)
 # Hard floor for confidence. Below this, data is unusable.
 CONFIDENCE_FLOOR = 0.5
 
+# Resolution rates are logged every this many decisions.
+STATS_LOG_INTERVAL = 100
+
+
+@dataclass
+class DecisionStats:
+    outcomes: Counter = field(default_factory=Counter)              # per DecisionOutcome
+    escalation_reasons: Counter = field(default_factory=Counter)    # per FastPathReason
+    rule_hits: Counter = field(default_factory=Counter)             # per fast path rule name
+
+    @property
+    def decisions(self) -> int:
+        return sum(self.outcomes.values())
+
+    def rate(self, outcome: DecisionOutcome) -> float:
+        return self.outcomes[outcome] / self.decisions if self.decisions else 0.0
+
+    @property
+    def fast_path_rate(self) -> float:
+        """Share of out-of-range snapshots resolved without the LLM."""
+        resolved, escalated = self.outcomes[DecisionOutcome.ACT], self.outcomes[DecisionOutcome.ESCALATE]
+        return resolved / (resolved + escalated) if resolved + escalated else 0.0
+
+    def summary(self) -> str:
+        reasons = ", ".join(f"{reason.value} {count}" for reason, count in self.escalation_reasons.items())
+        return (
+            f"{self.decisions} decisions: alert {self.rate(DecisionOutcome.ALERT):.1%}, "
+            f"no action {self.rate(DecisionOutcome.NO_ACTION):.1%}, "
+            f"fast path {self.rate(DecisionOutcome.ACT):.1%}, "
+            f"LLM {self.rate(DecisionOutcome.ESCALATE):.1%} ({reasons or 'none'}); "
+            f"fast path resolved {self.fast_path_rate:.1%} of violations"
+        )
+
 
 class DecisionService:
     """
@@ -20,12 +56,13 @@ class DecisionService:
     Responsibilities:
     - Validate snapshot integrity (missing states, low confidence, bad windows)
     - Check for policy violations (levels outside acceptable range)
+    - Resolve routine violations with the fast path rules
     - Produce a DecisionSchema
     - Persist to DecisionLog
 
     Does NOT:
-    - Read from the database
-    - Call the LLM
+    - Read from the database, other than the last watering via the repository
+    - Call the LLM (ESCALATE decisions are for the LLM)
     - Execute actions
     """
 
@@ -36,42 +73,66 @@ class DecisionService:
     ):
         self.policies = policies
         self.repo = repo or DecisionRepository()
+        self.fast_path = FastPathEngine(policies)
+        self.stats = DecisionStats()
 
     def decide(self, snapshot: DerivedStateSnapshot) -> DecisionSchema:
         """
         Evaluate the snapshot and produce a decision.
         """
+        result = self._evaluate(snapshot)
+        self.repo.save(result, snapshot)
 
+        self.stats.outcomes[result.outcome] += 1
+        if self.stats.decisions % STATS_LOG_INTERVAL == 0:
+            logger.info(f"Decision paths over {self.stats.summary()}")
+        return result
+
+    def _evaluate(self, snapshot: DerivedStateSnapshot) -> DecisionSchema:
         # Step 1: Validate snapshot integrity
         if not self._is_snapshot_valid(snapshot):
-            result = DecisionSchema(
+            return DecisionSchema(
                 outcome=DecisionOutcome.ALERT,
                 confidence=0.0,
                 policy_version=self.policies.policy_version,
             )
-            self.repo.save(result, snapshot)
-            return result
+
+        confidence = self._aggregate_confidence(snapshot)
 
         # Step 2: Check for policy violations
         if self._has_policy_violations(snapshot):
-            confidence = self._aggregate_confidence(snapshot)
-            result = DecisionSchema(
+            # Step 3: Resolve routine violations without the LLM
+            fast_path = self._resolve_fast_path(snapshot)
+            if fast_path.reason == FastPathReason.RESOLVED:
+                self.stats.rule_hits.update(fast_path.rules)
+                logger.debug(f"Fast path resolved to {fast_path.action.value} by {', '.join(fast_path.rules)}")
+                return DecisionSchema(
+                    outcome=DecisionOutcome.ACT,
+                    confidence=confidence,
+                    action=fast_path.action,
+                    policy_version=self.policies.policy_version,
+                )
+
+            self.stats.escalation_reasons[fast_path.reason] += 1
+            logger.debug(f"Escalating to the LLM: fast path {fast_path.reason.value}")
+            return DecisionSchema(
                 outcome=DecisionOutcome.ESCALATE,
                 confidence=confidence,
                 policy_version=self.policies.policy_version,
             )
-            self.repo.save(result, snapshot)
-            return result
 
-        # Step 3: All good
-        confidence = self._aggregate_confidence(snapshot)
-        result = DecisionSchema(
+        # Step 4: All good
+        return DecisionSchema(
             outcome=DecisionOutcome.NO_ACTION,
             confidence=confidence,
             policy_version=self.policies.policy_version,
         )
-        self.repo.save(result, snapshot)
-        return result
+
+    def _resolve_fast_path(self, snapshot: DerivedStateSnapshot) -> FastPathResult:
+        last_watered = None
+        if self.fast_path.needs_last_watered(snapshot):
+            last_watered = self.repo.fetch_last_executed(WATERING_ACTIONS)
+        return self.fast_path.resolve(snapshot, last_watered)
 
     def _is_snapshot_valid(self, snapshot: DerivedStateSnapshot) -> bool:
         """
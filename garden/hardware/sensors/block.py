@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from typing import Iterable
+import numpy as np
+from .enums import SensorType
+from .schemas import PAYLOAD_SCHEMAS
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# Every payload field across sensor types, in a fixed order. Block queries
+# return one column per entry (NULL where the sensor type lacks the field).
+BLOCK_FIELDS: tuple[str, ...] = tuple(dict.fromkeys(
+    field for schema in PAYLOAD_SCHEMAS.values() for field in schema.model_fields
+))
+
+
+def to_epoch_micros(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+@dataclass(frozen=True)
+class ReadingBlock:
+    """
+    Columnar readings for one sensor: contiguous NumPy arrays instead of objects.
+
+    timestamps holds epoch microseconds (int64, ascending), which convert
+    back to the exact stored datetimes. values holds one float64 array per
+    payload field, aligned with timestamps.
+    """
+    sensor_type: SensorType
+    sensor_id: str
+    timestamps: np.ndarray
+    values: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.values[field]
+
+    @property
+    def first_created(self) -> datetime:
+        return from_epoch_micros(self.timestamps[0])
+
+    @property
+    def last_created(self) -> datetime:
+        return from_epoch_micros(self.timestamps[-1])
+
+    def slice(self, start: int, stop: int | None = None) -> "ReadingBlock":
+        """Rows [start:stop] as a view; no data is copied."""
+        return ReadingBlock(
+            sensor_type=self.sensor_type,
+            sensor_id=self.sensor_id,
+            timestamps=self.timestamps[start:stop],
+            values={field: column[start:stop] for field, column in self.values.items()},
+        )
+
+    def since(self, window_start: datetime) -> "ReadingBlock":
+        """Rows created at or after window_start."""
+        start = int(np.searchsorted(self.timestamps, to_epoch_micros(window_start), side="left"))
+        return self.slice(start)
+
+    def tail(self, n: int) -> "ReadingBlock":
+        return self.slice(max(0, len(self) - n))
+
+    @classmethod
+    def concat(cls, first: "ReadingBlock", *rest: "ReadingBlock") -> "ReadingBlock":
+        """Join blocks of the same sensor, given in time order, into one."""
+        blocks = [first, *rest]
+        return cls(
+            sensor_type=first.sensor_type,
+            sensor_id=first.sensor_id,
+            timestamps=np.concatenate([block.timestamps for block in blocks]),
+            values={field: np.concatenate([block.values[field] for block in blocks]) for field in first.values},
+        )
+
+    @classmethod
+    def empty(cls, sensor_type: SensorType, sensor_id: str) -> "ReadingBlock":
+        return cls(
+            sensor_type=sensor_type,
+            sensor_id=sensor_id,
+            timestamps=np.empty(0, dtype=np.int64),
+            values={field: np.empty(0, dtype=np.float64) for field in PAYLOAD_SCHEMAS[sensor_type].model_fields},
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: list[tuple],
+        sensors: Iterable[tuple[SensorType, str]],
+    ) -> dict[tuple[SensorType, str], "ReadingBlock"]:
+        """
+        Build one block per sensor from block-query rows.
+
+        Rows are shaped (sensor_type, sensor_id, epoch_micros, *BLOCK_FIELDS)
+        and ordered by time. The numeric columns are converted to a single
+        2-D array in one pass, then split per sensor with index arrays.
+        """
+        keys = list(dict.fromkeys(sensors))
+        if not rows:
+            return {key: cls.empty(*key) for key in keys}
+
+        # Epoch microseconds stay below 2**53, so float64 holds them exactly.
+        data = np.array([row[2:] for row in rows], dtype=np.float64)
+
+        positions: dict[tuple[str, str], list[int]] = {}
+        for i, row in enumerate(rows):
+            positions.setdefault((row[0], row[1]), []).append(i)
+
+        blocks = {}
+        for sensor_type, sensor_id in keys:
+            index = np.asarray(positions.get((sensor_type.value, sensor_id), []), dtype=np.intp)
+            columns = data[index]
+            blocks[(sensor_type, sensor_id)] = cls(
+                sensor_type=sensor_type,
+                sensor_id=sensor_id,
+                timestamps=columns[:, 0].astype(np.int64),
+                values={
+                    field: np.ascontiguousarray(columns[:, 1 + BLOCK_FIELDS.index(field)])
+                    for field in PAYLOAD_SCHEMAS[sensor_type].model_fields
+                },
+            )
+        return blocks
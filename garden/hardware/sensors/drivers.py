@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+import logging
+from typing import Any, Callable
+from .enums import SensorType
+from .exc import SensorError
+from ...config.sensors import SensorRef, SensorsConfig
+
+logger = logging.getLogger(__name__)
+
+
+class SensorDriver(ABC):
+    """
+    Blocking interface to one physical sensor.
+
+    read() may take seconds (e.g. a DHT22 retrying a failed checksum) and
+    is always called from a worker thread, never from the event loop. It
+    returns the raw payload for the sensor's type, e.g. {"raw_adc": 512};
+    validation happens in the caller.
+    """
+
+    def __init__(self, sensor_type: SensorType, ref: SensorRef):
+        self.sensor_type = sensor_type
+        self.ref = ref
+
+    @abstractmethod
+    def read(self) -> dict[str, Any]:
+        ...
+
+
+DriverFactory = Callable[[SensorType, SensorRef], SensorDriver]
+
+# SensorRef.model -> factory. Driver modules register themselves here.
+DRIVER_FACTORIES: dict[str, DriverFactory] = {}
+
+
+def register_driver(model: str) -> Callable[[DriverFactory], DriverFactory]:
+    """Decorator registering a driver factory for a SensorRef.model value."""
+    def decorator(factory: DriverFactory) -> DriverFactory:
+        DRIVER_FACTORIES[model] = factory
+        return factory
+    return decorator
+
+
+def build_drivers(
+    sensors_config: SensorsConfig,
+    factories: dict[str, DriverFactory] | None = None,
+) -> dict[tuple[SensorType, str], SensorDriver]:
+    """
+    Instantiate a driver for every configured SensorRef, keyed by
+    (sensor_type, sensor_id). Raises SensorError if a sensor's model has
+    no registered driver.
+    """
+    factories = factories if factories is not None else DRIVER_FACTORIES
+    drivers = {}
+    for sensor_type in SensorType:
+        for ref in getattr(sensors_config, sensor_type.value).sensors:
+            factory = factories.get(ref.model or "")
+            if factory is None:
+                msg = (
+                    f"No driver registered for {sensor_type.value} sensor {ref.id} (model {ref.model!r}). "
+                    f"Set `model: simulated` in sensors.yaml to run without the hardware."
+                )
+                logger.error(msg)
+                raise SensorError(msg)
+            drivers[(sensor_type, ref.id)] = factory(sensor_type, ref)
+    return drivers
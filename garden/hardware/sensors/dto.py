@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import NamedTuple
 from .schemas import LightPayload, ClimatePayload, SoilMoisturePayload, SensorPayload
 from .enums import SensorType
 
@@ -24,4 +25,110 @@ class LightReading(ParsedSensorReading):
 
 @dataclass(frozen=True)
 class SoilMoistureReading(ParsedSensorReading):
-    payload: SoilMoisturePayload
\ No newline at end of file
+    payload: SoilMoisturePayload
+
+
+class LatestReadingId(NamedTuple):
+    """Identity of a sensor's newest reading, for change detection."""
+    id: int
+    created: datetime
+
+
+class ClimateValues(NamedTuple):
+    temp: float
+    humidity: float
+
+
+class AdcValues(NamedTuple):
+    raw_adc: int
+
+
+PayloadValues = ClimateValues | AdcValues
+
+PAYLOAD_VALUES: dict[SensorType, type[PayloadValues]] = {
+    SensorType.CLIMATE: ClimateValues,
+    SensorType.LIGHT: AdcValues,
+    SensorType.SOIL_MOISTURE: AdcValues,
+}
+
+
+class ReadingRecord:
+    """
+    Compact, unvalidated reading produced by ReadingDecode.FAST.
+
+    Exposes the same attributes as ClimateReading, LightReading and
+    SoilMoistureReading (payload fields are read as attributes), so domain
+    services accept it unchanged. Only use it for rows written by our own
+    repository; nothing here is checked.
+    """
+    __slots__ = ("created", "sensor_type", "sensor_id", "payload")
+
+    def __init__(
+        self,
+        created: datetime,
+        sensor_type: SensorType,
+        sensor_id: str,
+        payload: PayloadValues,
+    ):
+        self.created = created
+        self.sensor_type = sensor_type
+        self.sensor_id = sensor_id
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return (
+            f"ReadingRecord(created={self.created!r}, sensor_type={self.sensor_type!r}, "
+            f"sensor_id={self.sensor_id!r}, payload={self.payload!r})"
+        )
+
+
+@dataclass(frozen=True)
+class ReadingAggregate:
+    """
+    Summary of one payload field over a set of readings.
+
+    Aggregates of disjoint, time-ordered spans combine with merge(), which
+    is how rollup buckets and raw edge rows are folded into one window.
+    """
+    sample_count: int = 0
+    min_value: float | None = None
+    max_value: float | None = None
+    sum_value: float = 0.0
+    first_value: float | None = None
+    first_created: datetime | None = None
+    last_value: float | None = None
+    last_created: datetime | None = None
+
+    @property
+    def mean(self) -> float | None:
+        return self.sum_value / self.sample_count if self.sample_count else None
+
+    def merge(self, later: "ReadingAggregate") -> "ReadingAggregate":
+        """Combine with an aggregate of readings that all come after this one's."""
+        if not later.sample_count:
+            return self
+        if not self.sample_count:
+            return later
+        return ReadingAggregate(
+            sample_count=self.sample_count + later.sample_count,
+            min_value=min(self.min_value, later.min_value),  # type: ignore[type-var]
+            max_value=max(self.max_value, later.max_value),  # type: ignore[type-var]
+            sum_value=self.sum_value + later.sum_value,
+            first_value=self.first_value,
+            first_created=self.first_created,
+            last_value=later.last_value,
+            last_created=later.last_created,
+        )
+
+    @classmethod
+    def of(cls, created: datetime, value: float) -> "ReadingAggregate":
+        return cls(
+            sample_count=1,
+            min_value=value,
+            max_value=value,
+            sum_value=value,
+            first_value=value,
+            first_created=created,
+            last_value=value,
+            last_created=created,
+        )
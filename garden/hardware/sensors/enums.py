@@ -5,3 +5,20 @@ class SensorType(GardenEnum):
     CLIMATE = "climate"
     SOIL_MOISTURE = "soil_moisture"
     LIGHT = "light"
+
+
+class ReadingStorage(GardenEnum):
+    JSON = "json"       # single sensor_reading table, payload stored as JSON text
+    TYPED = "typed"     # one table per sensor type with typed numeric columns
+    PARTITIONED = "partitioned"     # JSON rows in one SQLite file per month, attached on demand
+
+
+class ReadingDecode(GardenEnum):
+    STRICT = "strict"   # pydantic-validated SensorReadingSchema per row
+    FAST = "fast"       # unvalidated ReadingRecord per row, for rows we wrote ourselves
+    BLOCK = "block"     # columnar ReadingBlock per sensor (fetch_block* methods only)
+
+
+class RollupResolution(GardenEnum):
+    MINUTE = "minute"
+    HOUR = "hour"
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import logging
+from math import gcd
+import threading
+import time
+from .enums import SensorType
+from .schemas import SensorReadingSchema
+from .simulated import DEFAULT_DROPOUT_RATE, SIMULATED_DRIVERS, SimulatedDriver
+from .writer import BufferedReadingWriter
+from ...config.sensors import SensorRef
+
+logger = logging.getLogger(__name__)
+
+# How often the real-time generator wakes up to catch up with its target rate.
+TICK_SECONDS = 0.05
+
+
+@dataclass
+class LoadStats:
+    generated: int = 0
+    dropouts: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.generated / self.seconds if self.seconds else 0.0
+
+
+class LoadGenerator:
+    """
+    Pushes simulated readings from many sensor ids through a
+    BufferedReadingWriter, for profiling ingestion and state derivation.
+
+    Sensor ids are sim_<sensor_type>_<n>, sensors_per_type of each type.
+    run() generates readings in real time at a fixed total rate, cycling
+    through the sensors; backfill() generates every sensor's series over a
+    past period as fast as the writer accepts it. Dropouts are counted and
+    not written.
+    """
+
+    def __init__(
+        self,
+        writer: BufferedReadingWriter,
+        sensors_per_type: int,
+        seed: int = 0,
+        dropout_rate: float = DEFAULT_DROPOUT_RATE,
+    ):
+        if sensors_per_type < 1:
+            raise ValueError("sensors_per_type must be >= 1")
+
+        self.writer = writer
+        self.drivers: list[SimulatedDriver] = [
+            driver_type(
+                sensor_type,
+                SensorRef(id=f"sim_{sensor_type.value}_{n:04d}", model="simulated"),
+                seed=seed,
+                dropout_rate=dropout_rate,
+            )
+            for n in range(sensors_per_type)
+            for sensor_type, driver_type in SIMULATED_DRIVERS.items()
+        ]
+
+    def run(
+        self,
+        rate: float,
+        duration_seconds: float,
+        stop: threading.Event | None = None,
+    ) -> LoadStats:
+        """
+        Generate `rate` readings per second (across all sensors) stamped
+        with the current time, for duration_seconds or until stop is set.
+        If the writer cannot keep up, the achieved rate falls below `rate`.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+
+        stats = LoadStats()
+        started = time.perf_counter()
+        next_driver = 0
+        while not (stop and stop.is_set()):
+            elapsed = time.perf_counter() - started
+            if elapsed >= duration_seconds:
+                break
+
+            now = datetime.now(timezone.utc)
+            for _ in range(int(rate * elapsed) - stats.generated - stats.dropouts):
+                self._emit(self.drivers[next_driver], now, stats)
+                next_driver = (next_driver + 1) % len(self.drivers)
+            time.sleep(TICK_SECONDS)
+
+        self.writer.flush()
+        stats.seconds = time.perf_counter() - started
+        logger.info(f"Generated {stats.generated} readings in {stats.seconds:.1f}s ({stats.rate:.0f}/s)")
+        return stats
+
+    def backfill(
+        self,
+        start: datetime,
+        end: datetime,
+        interval_seconds: dict[SensorType, int],
+    ) -> LoadStats:
+        """
+        Generate every sensor's readings from start to end, one per its
+        type's interval, in time order.
+        """
+        stats = LoadStats()
+        started = time.perf_counter()
+
+        step = gcd(*interval_seconds.values())
+        at = start
+        while at < end:
+            offset = int((at - start).total_seconds())
+            for driver in self.drivers:
+                if offset % interval_seconds[driver.sensor_type] == 0:
+                    self._emit(driver, at, stats)
+            at += timedelta(seconds=step)
+
+        self.writer.flush()
+        stats.seconds = time.perf_counter() - started
+        logger.info(
+            f"Backfilled {stats.generated} readings from {start} to {end} "
+            f"in {stats.seconds:.1f}s ({stats.rate:.0f}/s)"
+        )
+        return stats
+
+    def _emit(self, driver: SimulatedDriver, at: datetime, stats: LoadStats) -> None:
+        payload = driver.sample(at)
+        if payload is None:
+            stats.dropouts += 1
+            return
+
+        self.writer.add(SensorReadingSchema(
+            sensor_id=driver.ref.id,
+            sensor_type=driver.sensor_type,
+            payload=payload,
+            created=at,
+        ))
+        stats.generated += 1
@@ -1,16 +1,128 @@
 from peewee import (
     AutoField,
+    DateTimeField,
+    FloatField,
+    IntegerField,
     TextField,
 )
-from playhouse.sqlite_ext import JSONField
 from ...db.base import BaseDBModel
+from ...db.fields import OrjsonField
+from .enums import RollupResolution, SensorType
 
 
 class SensorReading(BaseDBModel):
     id = AutoField()
-    sensor_type = TextField(index=True)
+    sensor_type = TextField()
     sensor_id = TextField(index=True)
-    payload = JSONField()
+    payload = OrjsonField()
 
     class Meta:  # type: ignore[misc]
         table_name = "sensor_reading"
+        indexes = (
+            # Serves every repository lookup: equality on type and id, then
+            # a range or ordering on created. Also covers sensor_type alone.
+            (("sensor_type", "sensor_id", "created"), False),
+        )
+
+
+class TypedSensorReading(BaseDBModel):
+    """
+    Base for the per-sensor-type reading tables used by ReadingStorage.TYPED.
+
+    The sensor type is implied by the table, and payload fields are stored
+    as typed numeric columns named after the payload schema's fields.
+    """
+    id = AutoField()
+    sensor_id = TextField()
+
+    class Meta:  # type: ignore[misc]
+        abstract = True
+
+
+class ClimateSensorReading(TypedSensorReading):
+    temp = FloatField()         # Celsius
+    humidity = FloatField()     # Relative Humidity
+
+    class Meta:  # type: ignore[misc]
+        table_name = "climate_reading"
+        indexes = (
+            (("sensor_id", "created"), False),
+        )
+
+
+class LightSensorReading(TypedSensorReading):
+    raw_adc = IntegerField()
+
+    class Meta:  # type: ignore[misc]
+        table_name = "light_reading"
+        indexes = (
+            (("sensor_id", "created"), False),
+        )
+
+
+class SoilMoistureSensorReading(TypedSensorReading):
+    raw_adc = IntegerField()
+
+    class Meta:  # type: ignore[misc]
+        table_name = "soil_moisture_reading"
+        indexes = (
+            (("sensor_id", "created"), False),
+        )
+
+
+TYPED_READING_MODELS: dict[SensorType, type[TypedSensorReading]] = {
+    SensorType.CLIMATE: ClimateSensorReading,
+    SensorType.LIGHT: LightSensorReading,
+    SensorType.SOIL_MOISTURE: SoilMoistureSensorReading,
+}
+
+
+class ReadingRollup(BaseDBModel):
+    """
+    Aggregate of one payload field for one sensor over one time bucket.
+
+    Rows are upserted as readings are saved (see ReadingRollupRepository),
+    so a bucket always reflects every reading stored in it. bucket is the
+    bucket's start; the mean is sum_value / sample_count.
+    """
+    id = AutoField()
+    sensor_type = TextField()
+    sensor_id = TextField()
+    field = TextField()
+    bucket = DateTimeField()
+    sample_count = IntegerField()
+    min_value = FloatField()
+    max_value = FloatField()
+    sum_value = FloatField()
+    first_value = FloatField()
+    first_created = DateTimeField()
+    last_value = FloatField()
+    last_created = DateTimeField()
+
+    class Meta:  # type: ignore[misc]
+        abstract = True
+
+
+class MinuteReadingRollup(ReadingRollup):
+
+    class Meta:  # type: ignore[misc]
+        table_name = "reading_rollup_minute"
+        indexes = (
+            # Upsert target and range lookups by bucket.
+            (("sensor_type", "sensor_id", "field", "bucket"), True),
+        )
+
+
+class HourReadingRollup(ReadingRollup):
+
+    class Meta:  # type: ignore[misc]
+        table_name = "reading_rollup_hour"
+        indexes = (
+            (("sensor_type", "sensor_id", "field", "bucket"), True),
+        )
+
+
+ROLLUP_MODELS: dict[RollupResolution, type[ReadingRollup]] = {
+    RollupResolution.MINUTE: MinuteReadingRollup,
+    RollupResolution.HOUR: HourReadingRollup,
+}
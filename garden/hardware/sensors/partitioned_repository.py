@@ -0,0 +1,244 @@
+from datetime import datetime, UTC
+from functools import reduce
+from operator import add
+from typing import Iterable, Iterator, Mapping
+from peewee import SQL, SelectBase, chunked
+from .block import ReadingBlock
+from .dto import LatestReadingId
+from .enums import SensorType, ReadingDecode
+from .models import SensorReading
+from .repository import INSERT_BATCH_SIZE, DecodedReading, SensorReadingRepository
+from .rollup import ReadingRollupRepository
+from .schemas import SensorReadingSchema
+from ...common.exc import RepositoryError
+from ...db.partitions import PartitionManager, month_key, month_keys
+from ...db.sqlite_db import db
+
+
+class PartitionedSensorReadingRepository(SensorReadingRepository):
+    """
+    SensorReadingRepository over monthly partition files (ReadingStorage.PARTITIONED).
+
+    Readings are written to the partition of their created month. Window
+    queries attach and read only the partitions overlapping the window,
+    combined with UNION ALL and merged on created, so the main database and
+    old partitions are never touched for recent windows. Latest-N queries
+    walk partitions newest first and stop once they have enough rows.
+
+    Rows have the JSON sensor_reading schema; see garden.db.partitions for
+    how partitions are attached, sealed and made read-only.
+    """
+
+    def __init__(self, partitions: PartitionManager, rollups: ReadingRollupRepository | None = None):
+        super().__init__(rollups=rollups)
+        self.partitions = partitions
+
+    def save_reading(self, schema: SensorReadingSchema) -> SensorReading:
+        try:
+            # ATTACH is not allowed inside a transaction, so attach first.
+            model = self.partitions.model(month_key(schema.created), writable=True)
+            with db.atomic():
+                reading = model.create(
+                    created=schema.created,
+                    sensor_type=schema.sensor_type.value,
+                    sensor_id=schema.sensor_id,
+                    payload=schema.payload,
+                )
+                self._update_rollups([schema])
+            return reading
+        except Exception as e:
+            msg = f"Failed to create partitioned SensorReading record due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def save_readings(self, schemas: Iterable[SensorReadingSchema]) -> int:
+        """
+        Persist many readings in a single transaction across their partitions.
+
+        A batch may span at most PartitionManager.max_attached months, since
+        every target partition must be attached before the transaction opens.
+        """
+        schemas = list(schemas)
+        rows_by_month: dict[str, list[dict]] = {}
+        for schema in schemas:
+            rows_by_month.setdefault(month_key(schema.created), []).append({
+                "created": schema.created,
+                "sensor_type": schema.sensor_type.value,
+                "sensor_id": schema.sensor_id,
+                "payload": schema.payload,
+            })
+        if not schemas:
+            return 0
+
+        try:
+            if len(rows_by_month) > self.partitions.max_attached:
+                raise ValueError(
+                    f"batch spans {len(rows_by_month)} months; at most "
+                    f"{self.partitions.max_attached} partitions can be attached"
+                )
+            models = {key: self.partitions.model(key, writable=True) for key in rows_by_month}
+
+            with db.atomic():
+                for key, rows in rows_by_month.items():
+                    for batch in chunked(rows, INSERT_BATCH_SIZE):
+                        models[key].insert_many(batch).execute()
+                self._update_rollups(schemas)
+            return len(schemas)
+        except Exception as e:
+            msg = f"Failed to bulk create {len(schemas)} partitioned SensorReading records due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def fetch_latest_reading(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            decode: ReadingDecode = ReadingDecode.STRICT,
+    ) -> DecodedReading | None:
+        readings = self.fetch_latest_readings(sensor_type, sensor_id, limit=1, decode=decode)
+        return readings[0] if readings else None
+
+    def fetch_latest_readings(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            limit: int,
+            as_of: datetime | None = None,
+            not_before: datetime | None = None,
+            decode: ReadingDecode = ReadingDecode.STRICT,
+    ) -> list[DecodedReading]:
+        try:
+            readings: list[DecodedReading] = []
+            for model in self._models_up_to(as_of, not_before):
+                query = super()._latest_query(sensor_type, sensor_id, as_of, not_before, model=model)
+                readings.extend(self._decode(query.limit(limit - len(readings)), decode))
+                if len(readings) >= limit:
+                    break
+
+            readings.reverse()
+            return readings
+        except Exception as e:
+            msg = f"Failed to fetch latest {limit} partitioned SensorReading records due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def fetch_latest_block(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            limit: int,
+            as_of: datetime | None = None,
+            not_before: datetime | None = None,
+    ) -> ReadingBlock:
+        try:
+            rows: list[tuple] = []
+            for model in self._models_up_to(as_of, not_before):
+                query = super()._latest_query(sensor_type, sensor_id, as_of, not_before, block=True, model=model)
+                rows.extend(db.execute(query.limit(limit - len(rows))).fetchall())
+                if len(rows) >= limit:
+                    break
+
+            rows.reverse()
+            return ReadingBlock.from_rows(rows, [(sensor_type, sensor_id)])[(sensor_type, sensor_id)]
+        except Exception as e:
+            msg = f"Failed to fetch latest partitioned SensorReading block due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def fetch_latest_ids(
+            self,
+            sensors: Iterable[tuple[SensorType, str]],
+            not_before: Mapping[tuple[SensorType, str], datetime] | None = None,
+    ) -> dict[tuple[SensorType, str], LatestReadingId | None]:
+        """Walks partitions newest first until every sensor's newest reading is found."""
+        keys = list(dict.fromkeys(sensors))
+        not_before = not_before or {}
+        latest: dict[tuple[SensorType, str], LatestReadingId | None] = {key: None for key in keys}
+        try:
+            remaining = keys
+            for model in self._models_up_to(None):
+                if not remaining:
+                    break
+                latest.update(
+                    (key, found)
+                    for key, found in self._latest_ids(remaining, not_before, model=model).items()
+                    if found
+                )
+                remaining = [key for key in remaining if latest[key] is None]
+            return latest
+        except Exception as e:
+            msg = f"Failed to fetch latest partitioned SensorReading ids due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def _window_query(  # type: ignore[override]
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            window_start: datetime,
+            window_end: datetime,
+            block: bool = False,
+            model: type[SensorReading] | None = None,
+    ) -> SelectBase:
+        return self._union([
+            super(PartitionedSensorReadingRepository, self)._window_query(
+                sensor_type, sensor_id, window_start, window_end, block, partition,
+            )
+            for partition in self._models_between(window_start, window_end)
+        ])
+
+    def _multi_window_query(  # type: ignore[override]
+            self,
+            keys: list[tuple[SensorType, str]],
+            window_start: datetime,
+            window_end: datetime,
+            block: bool = False,
+            model: type[SensorReading] | None = None,
+    ) -> SelectBase:
+        return self._union([
+            super(PartitionedSensorReadingRepository, self)._multi_window_query(
+                keys, window_start, window_end, block, partition,
+            )
+            for partition in self._models_between(window_start, window_end)
+        ])
+
+    def _latest_query(  # type: ignore[override]
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            as_of: datetime | None = None,
+            not_before: datetime | None = None,
+            block: bool = False,
+            model: type[SensorReading] | None = None,
+    ) -> SelectBase:
+        # Only used for query plan checks; fetches walk partitions instead.
+        model = model or self.partitions.model(month_key(as_of or datetime.now(UTC)))
+        return super()._latest_query(sensor_type, sensor_id, as_of, not_before, block, model)
+
+    def _union(self, queries: list[SelectBase]) -> SelectBase:
+        if not queries:
+            # No partition overlaps the window: a query that reads nothing.
+            return self._select().where(SQL("0"))
+        if len(queries) == 1:
+            return queries[0]
+        # Each arm is read in created order from its own index, so SQLite
+        # merges the arms instead of sorting the union.
+        return reduce(add, [query.order_by() for query in queries]).order_by(SQL("created"))
+
+    def _models_between(self, window_start: datetime, window_end: datetime) -> list[type[SensorReading]]:
+        keys = [key for key in month_keys(window_start, window_end) if self.partitions.path(key).exists()]
+        if len(keys) > self.partitions.max_attached:
+            raise ValueError(
+                f"window spans {len(keys)} partitions; at most "
+                f"{self.partitions.max_attached} can be attached at once"
+            )
+        return [self.partitions.model(key) for key in keys]
+
+    def _models_up_to(
+            self,
+            as_of: datetime | None,
+            not_before: datetime | None = None,
+    ) -> Iterator[type[SensorReading]]:
+        """Existing partitions at or before as_of's month (and not before not_before's), newest first."""
+        last = month_key(as_of) if as_of is not None else None
+        first = month_key(not_before) if not_before is not None else None
+        for key in reversed(self.partitions.months()):
+            if first is not None and key < first:
+                break
+            if last is None or key <= last:
+                yield self.partitions.model(key)
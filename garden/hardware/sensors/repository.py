@@ -1,95 +1,232 @@
-from datetime import datetime
-from peewee import ModelSelect
-from typing import Iterator
+from datetime import datetime, UTC
+from functools import reduce
+from operator import add, or_
+from peewee import SQL, Case, Field, Node, SelectBase, Value, chunked, fn
+from typing import Any, Iterable, Iterator, Mapping
+from .block import BLOCK_FIELDS, ReadingBlock
 from .models import SensorReading
 from .schemas import SensorReadingSchema
-from .enums import SensorType
+from .enums import RollupResolution, SensorType, ReadingDecode
+from .dto import PAYLOAD_VALUES, LatestReadingId, ReadingAggregate, ReadingRecord
+from .rollup import ReadingRollupRepository, bucket_ceil, bucket_start
 from ...common.exc import RepositoryError
+from ...common.serialization import loads
+from ...db.sqlite_db import db
+
+# Rows per INSERT statement. Each row binds 4 parameters, so this stays well
+# under SQLite's host parameter limit on older builds (999).
+INSERT_BATCH_SIZE = 200
+
+DecodedReading = SensorReadingSchema | ReadingRecord
+
+SENSOR_TYPES = {sensor_type.value: sensor_type for sensor_type in SensorType}
+
+
+def parse_created(value: Any) -> datetime:
+    """
+    Convert a stored created value to a datetime without pydantic.
+
+    peewee hands back timezone-aware timestamps as their ISO text, which
+    datetime.fromisoformat parses directly.
+    """
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def epoch_micros(column: Field) -> Node:
+    """
+    SQL expression converting a stored created value to epoch microseconds.
+
+    SQLite's date functions only keep millisecond precision, so whole
+    seconds come from strftime('%s') and the microseconds are read from the
+    six-digit fraction that str(datetime) writes. The result is exact.
+    """
+    seconds = fn.strftime("%s", column).cast("INTEGER")
+    fraction = Case(None, [(fn.substr(column, 20, 1) == ".", fn.substr(column, 21, 6).cast("INTEGER"))], 0)
+    return seconds * 1_000_000 + fraction
 
 
 class SensorReadingRepository:
+    """
+    Reads and writes sensor readings in the JSON sensor_reading table.
+
+    Every fetch method takes a `decode` mode. ReadingDecode.STRICT (the
+    default) validates each row into a SensorReadingSchema.
+    ReadingDecode.FAST skips validation and model instantiation and builds
+    a ReadingRecord straight from the row tuple. FAST is meant for rows
+    this repository wrote itself.
+
+    With a ReadingRollupRepository attached, every save also updates the
+    minute and hour rollups in the same transaction, and
+    fetch_window_aggregate() reads whole buckets instead of raw rows.
+    """
+
+    def __init__(self, rollups: ReadingRollupRepository | None = None):
+        self.rollups = rollups
 
     def save_reading(self, schema: SensorReadingSchema) -> SensorReading:
         try:
-            return SensorReading.create(
-                created=schema.created,
-                sensor_type=schema.sensor_type.value,
-                sensor_id=schema.sensor_id,
-                payload=schema.payload,
-            )
+            with db.atomic():
+                reading = SensorReading.create(
+                    created=schema.created,
+                    sensor_type=schema.sensor_type.value,
+                    sensor_id=schema.sensor_id,
+                    payload=schema.payload,
+                )
+                self._update_rollups([schema])
+            return reading
         except Exception as e:
             msg = f"Failed to create SensorReading record due to the following error: {e}"
             raise RepositoryError(msg) from e    
 
+    def save_readings(self, schemas: Iterable[SensorReadingSchema]) -> int:
+        """
+        Persist many readings in a single transaction.
+
+        Rows are written with multi-row INSERT statements of up to
+        INSERT_BATCH_SIZE rows each, so a batch costs one commit (and one
+        fsync) instead of one per reading. Either every reading is stored
+        or none are. Returns the number of readings written.
+        """
+        schemas = list(schemas)
+        rows = [
+            {
+                "created": schema.created,
+                "sensor_type": schema.sensor_type.value,
+                "sensor_id": schema.sensor_id,
+                "payload": schema.payload,
+            }
+            for schema in schemas
+        ]
+        if not rows:
+            return 0
+
+        try:
+            with db.atomic():
+                for batch in chunked(rows, INSERT_BATCH_SIZE):
+                    SensorReading.insert_many(batch).execute()
+                self._update_rollups(schemas)
+            return len(rows)
+        except Exception as e:
+            msg = f"Failed to bulk create {len(rows)} SensorReading records due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
     def fetch_readings(
             self,
             sensor_type: SensorType,
             sensor_id: str,
             window_start: datetime,
             window_end: datetime,
-    ) -> list[SensorReadingSchema]:
+            decode: ReadingDecode = ReadingDecode.STRICT,
+    ) -> list[DecodedReading]:
         try:
-            rows = (
-                SensorReading
-                .select()
-                .where(
-                    (SensorReading.sensor_type == sensor_type.value) &
-                    (SensorReading.sensor_id == sensor_id) &
-                    SensorReading.created.between(window_start, window_end)
-                )
-                .order_by(SensorReading.created)
-            )
+            query = self._window_query(sensor_type, sensor_id, window_start, window_end)
 
-            return [
-                SensorReadingSchema(
-                    created=row.created,
-                    sensor_type=row.sensor_type,
-                    sensor_id=row.sensor_id,
-                    payload=row.payload,
-                )
-                for row in rows
-            ]
+            return list(self._decode(query, decode))
         except Exception as e:
             msg = f"Failed to fetch SensorReading records due to the following error: {e}"
             raise RepositoryError(msg) from e
 
+    def fetch_readings_multi(
+            self,
+            sensors: Iterable[tuple[SensorType, str]],
+            window_start: datetime,
+            window_end: datetime,
+            decode: ReadingDecode = ReadingDecode.STRICT,
+    ) -> dict[tuple[SensorType, str], list[DecodedReading]]:
+        """
+        Fetch readings for several (sensor_type, sensor_id) pairs in one query.
+
+        All pairs share a single time window and are read in one scan ordered
+        by created. Results are grouped per pair, each list in chronological
+        order. Every requested pair is present in the result, with an empty
+        list if it had no readings in the window.
+        """
+        keys = list(dict.fromkeys(sensors))
+        grouped: dict[tuple[SensorType, str], list[DecodedReading]] = {key: [] for key in keys}
+        if not keys:
+            return grouped
+
+        try:
+            query = self._multi_window_query(keys, window_start, window_end)
+
+            for reading in self._decode(query, decode):
+                grouped[(reading.sensor_type, reading.sensor_id)].append(reading)
+
+            return grouped
+        except Exception as e:
+            msg = f"Failed to fetch SensorReading records for {len(keys)} sensors due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
     def fetch_latest_reading(
             self,
             sensor_type: SensorType,
             sensor_id: str,
-    ) -> SensorReadingSchema | None:
+            decode: ReadingDecode = ReadingDecode.STRICT,
+    ) -> DecodedReading | None:
         try:
-            row = (
-                SensorReading
-                .select()
-                .where(
-                    (SensorReading.sensor_type == sensor_type.value) &
-                    (SensorReading.sensor_id == sensor_id)
-                )
-                .order_by(SensorReading.created.desc())
-                .first()
-            )
+            query = self._latest_query(sensor_type, sensor_id).limit(1)
 
-            if not row:
-                return None
-
-            return SensorReadingSchema(
-                created=row.created,
-                sensor_type=row.sensor_type,
-                sensor_id=row.sensor_id,
-                payload=row.payload,
-            )
+            return next(self._decode(query, decode), None)
         except Exception as e:
             msg = f"Failed to fetch latest SensorReading record due to the following error: {e}"
             raise RepositoryError(msg) from e
 
+    def fetch_latest_readings(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            limit: int,
+            as_of: datetime | None = None,
+            not_before: datetime | None = None,
+            decode: ReadingDecode = ReadingDecode.STRICT,
+    ) -> list[DecodedReading]:
+        """
+        Fetch the newest `limit` readings for a sensor, in chronological order,
+        none created before `not_before`.
+
+        Reads the composite index backwards from `as_of` (or from the newest
+        row) and stops after `limit` rows, so the cost is independent of how
+        many readings exist or how fast the sensor is sampled.
+        """
+        try:
+            query = self._latest_query(sensor_type, sensor_id, as_of, not_before).limit(limit)
+
+            readings = list(self._decode(query, decode))
+            readings.reverse()
+            return readings
+        except Exception as e:
+            msg = f"Failed to fetch latest {limit} SensorReading records due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def fetch_latest_ids(
+            self,
+            sensors: Iterable[tuple[SensorType, str]],
+            not_before: Mapping[tuple[SensorType, str], datetime] | None = None,
+    ) -> dict[tuple[SensorType, str], LatestReadingId | None]:
+        """
+        The id and created of each sensor's newest reading (None for sensors
+        without readings), in one statement of LIMIT 1 index lookups.
+        Readings created before a sensor's not_before bound are ignored.
+        """
+        keys = list(dict.fromkeys(sensors))
+        if not keys:
+            return {}
+        try:
+            return self._latest_ids(keys, not_before or {})
+        except Exception as e:
+            msg = f"Failed to fetch latest SensorReading ids due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
     def iter_readings(
             self,
             sensor_type: SensorType,
             sensor_id: str,
             window_start: datetime,
             window_end: datetime,
-    ) -> Iterator[SensorReadingSchema]:
+            decode: ReadingDecode = ReadingDecode.STRICT,
+    ) -> Iterator[DecodedReading]:
         """
         Iterate over raw sensor sensor readings within a given time window.
 
@@ -99,24 +236,293 @@ class SensorReadingRepository:
         memory-sensitive processing.
         """
         try:
-            query: ModelSelect = (
-                SensorReading
-                .select()
-                .where(
-                    (SensorReading.sensor_type == sensor_type.value) &
-                    (SensorReading.sensor_id == sensor_id) &
-                    SensorReading.created.between(window_start, window_end)
-                )
-                .order_by(SensorReading.created)
-            )
+            query = self._window_query(sensor_type, sensor_id, window_start, window_end)
 
-            for row in query.iterator():
-                yield SensorReadingSchema(
-                    created=row.created,
-                    sensor_type=row.sensor_type,
-                    sensor_id=row.sensor_id,
-                    payload=row.payload,
-                )
+            yield from self._decode(query, decode)
         except Exception as e:
             msg = f"Failed to iterate SensorReading records due to the following error: {e}"
             raise RepositoryError(msg) from e
+
+    def fetch_block(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            window_start: datetime,
+            window_end: datetime,
+    ) -> ReadingBlock:
+        """
+        Fetch a time window as a columnar ReadingBlock.
+
+        Timestamps and payload fields are computed in SQL and copied from the
+        cursor straight into NumPy arrays; no per-row objects are created.
+        """
+        try:
+            query = self._window_query(sensor_type, sensor_id, window_start, window_end, block=True)
+            return self._to_blocks(query, [(sensor_type, sensor_id)])[(sensor_type, sensor_id)]
+        except Exception as e:
+            msg = f"Failed to fetch SensorReading block due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def fetch_blocks_multi(
+            self,
+            sensors: Iterable[tuple[SensorType, str]],
+            window_start: datetime,
+            window_end: datetime,
+    ) -> dict[tuple[SensorType, str], ReadingBlock]:
+        """Columnar counterpart to fetch_readings_multi(): one query, one block per sensor."""
+        keys = list(dict.fromkeys(sensors))
+        if not keys:
+            return {}
+
+        try:
+            query = self._multi_window_query(keys, window_start, window_end, block=True)
+            return self._to_blocks(query, keys)
+        except Exception as e:
+            msg = f"Failed to fetch SensorReading blocks for {len(keys)} sensors due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def fetch_latest_block(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            limit: int,
+            as_of: datetime | None = None,
+            not_before: datetime | None = None,
+    ) -> ReadingBlock:
+        """Columnar counterpart to fetch_latest_readings()."""
+        try:
+            query = self._latest_query(sensor_type, sensor_id, as_of, not_before, block=True).limit(limit)
+            block = self._to_blocks(query, [(sensor_type, sensor_id)])[(sensor_type, sensor_id)]
+            return ReadingBlock(
+                sensor_type=block.sensor_type,
+                sensor_id=block.sensor_id,
+                timestamps=block.timestamps[::-1].copy(),
+                values={field: column[::-1].copy() for field, column in block.values.items()},
+            )
+        except Exception as e:
+            msg = f"Failed to fetch latest SensorReading block due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def fetch_window_aggregate(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            field: str,
+            window_start: datetime,
+            window_end: datetime,
+    ) -> ReadingAggregate:
+        """
+        Aggregate one payload field over [window_start, window_end].
+
+        With rollups attached, the window is split into whole hour buckets
+        in the middle, whole minute buckets around them, and raw rows only
+        in the partial minutes at either edge, so the cost grows with the
+        number of buckets rather than the number of readings. Without
+        rollups every raw row in the window is read.
+        """
+        if self.rollups is None:
+            return self._aggregate_raw(sensor_type, sensor_id, field, window_start, window_end)
+
+        minute_start = bucket_ceil(window_start, RollupResolution.MINUTE)
+        minute_stop = bucket_start(window_end, RollupResolution.MINUTE)
+        if minute_start >= minute_stop:
+            return self._aggregate_raw(sensor_type, sensor_id, field, window_start, window_end)
+
+        hour_start = bucket_ceil(minute_start, RollupResolution.HOUR)
+        hour_stop = bucket_start(minute_stop, RollupResolution.HOUR)
+        if hour_start >= hour_stop:
+            hour_start = hour_stop = minute_stop
+
+        key = (sensor_type, sensor_id, field)
+        # Disjoint spans in time order; raw edges are [start, minute_start)
+        # and [minute_stop, end], the latter inclusive like every window.
+        parts = [
+            self._aggregate_raw(*key, window_start, minute_start, include_end=False),
+            self.rollups.aggregate(RollupResolution.MINUTE, *key, minute_start, hour_start),
+            self.rollups.aggregate(RollupResolution.HOUR, *key, hour_start, hour_stop),
+            self.rollups.aggregate(RollupResolution.MINUTE, *key, hour_stop, minute_stop),
+            self._aggregate_raw(*key, minute_stop, window_end),
+        ]
+        result = ReadingAggregate()
+        for part in parts:
+            result = result.merge(part)
+        return result
+
+    def hot_queries(self) -> dict[str, SelectBase]:
+        """
+        The queries this repository issues on the hot path, keyed by method name.
+
+        Parameters are placeholders; only the shape of each query matters.
+        Used to verify query plans (see garden.db.query_plan).
+        """
+        now = datetime.now(UTC)
+        queries = {
+            "fetch_readings": self._window_query(SensorType.CLIMATE, "sensor", now, now),
+            "fetch_readings_multi": self._multi_window_query(
+                [(SensorType.CLIMATE, "sensor"), (SensorType.LIGHT, "sensor")], now, now,
+            ),
+            "fetch_latest_reading": self._latest_query(SensorType.CLIMATE, "sensor").limit(1),
+            "fetch_latest_readings": self._latest_query(SensorType.CLIMATE, "sensor", now).limit(3),
+            "iter_readings": self._window_query(SensorType.CLIMATE, "sensor", now, now),
+        }
+        if self.rollups is not None:
+            queries.update(self.rollups.hot_queries())
+        return queries
+
+    def _update_rollups(self, schemas: list[SensorReadingSchema]) -> None:
+        if self.rollups is not None:
+            self.rollups.apply(schemas)
+
+    def _aggregate_raw(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            field: str,
+            window_start: datetime,
+            window_end: datetime,
+            include_end: bool = True,
+    ) -> ReadingAggregate:
+        result = ReadingAggregate()
+        if window_start > window_end:
+            return result
+        readings = self.fetch_readings(sensor_type, sensor_id, window_start, window_end, decode=ReadingDecode.FAST)
+        for reading in readings:
+            if not include_end and reading.created >= window_end:
+                break
+            result = result.merge(ReadingAggregate.of(reading.created, float(getattr(reading.payload, field))))
+        return result
+
+    def _select(self, block: bool = False, model: type[SensorReading] = SensorReading) -> SelectBase:
+        if block:
+            return model.select(
+                model.sensor_type,
+                model.sensor_id,
+                epoch_micros(model.created).alias("created"),
+                *[fn.json_extract(model.payload, f"$.{field}") for field in BLOCK_FIELDS],
+            )
+        return model.select(
+            model.created,
+            model.sensor_type,
+            model.sensor_id,
+            model.payload,
+        )
+
+    def _window_query(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            window_start: datetime,
+            window_end: datetime,
+            block: bool = False,
+            model: type[SensorReading] = SensorReading,
+    ) -> SelectBase:
+        return (
+            self._select(block, model)
+            .where(
+                (model.sensor_type == sensor_type.value) &
+                (model.sensor_id == sensor_id) &
+                model.created.between(window_start, window_end)
+            )
+            .order_by(model.created)
+        )
+
+    def _multi_window_query(
+            self,
+            keys: list[tuple[SensorType, str]],
+            window_start: datetime,
+            window_end: datetime,
+            block: bool = False,
+            model: type[SensorReading] = SensorReading,
+    ) -> SelectBase:
+        # The time range is repeated inside every OR term so SQLite can serve
+        # each term with a bounded range search on the composite index.
+        sensor_filter = reduce(or_, [
+            (model.sensor_type == sensor_type.value) &
+            (model.sensor_id == sensor_id) &
+            model.created.between(window_start, window_end)
+            for sensor_type, sensor_id in keys
+        ])
+        return (
+            self._select(block, model)
+            .where(sensor_filter)
+            .order_by(model.created)
+        )
+
+    def _latest_ids(
+            self,
+            keys: list[tuple[SensorType, str]],
+            not_before: Mapping[tuple[SensorType, str], datetime],
+            **latest_query_kwargs: Any,
+    ) -> dict[tuple[SensorType, str], LatestReadingId | None]:
+        arms = []
+        for index, (sensor_type, sensor_id) in enumerate(keys):
+            query = self._latest_query(
+                sensor_type, sensor_id, not_before=not_before.get((sensor_type, sensor_id)), **latest_query_kwargs,
+            ).limit(1)
+            query = query.select(query.model.id, query.model.created)
+            # SQLite only allows LIMIT on a compound arm inside a subquery.
+            arms.append(query.select_from(Value(index).alias("key"), SQL("*")))
+
+        found = {
+            keys[index]: LatestReadingId(id=reading_id, created=parse_created(created))
+            for index, reading_id, created in db.execute(reduce(add, arms))
+        }
+        return {key: found.get(key) for key in keys}
+
+    def _decode(self, query: SelectBase, decode: ReadingDecode) -> Iterator[DecodedReading]:
+        if decode == ReadingDecode.BLOCK:
+            raise ValueError("ReadingDecode.BLOCK is served by the fetch_block* methods")
+        if decode == ReadingDecode.FAST:
+            # Raw cursor rows: skips peewee's per-column converters, whose
+            # strptime fallbacks dominate the cost for timezone-aware timestamps.
+            return map(self._to_record, db.execute(query))
+        return map(self._to_schema, query.iterator())
+
+    def _to_blocks(
+            self,
+            query: SelectBase,
+            keys: list[tuple[SensorType, str]],
+    ) -> dict[tuple[SensorType, str], ReadingBlock]:
+        return ReadingBlock.from_rows(db.execute(query).fetchall(), keys)
+
+    def _to_record(self, row: tuple) -> ReadingRecord:
+        created, sensor_type, sensor_id, payload = row
+        sensor_type = SENSOR_TYPES[sensor_type]
+        return ReadingRecord(
+            created=parse_created(created),
+            sensor_type=sensor_type,
+            sensor_id=sensor_id,
+            payload=PAYLOAD_VALUES[sensor_type](**loads(payload)),
+        )
+
+    def _to_schema(self, row: SensorReading) -> SensorReadingSchema:
+        return SensorReadingSchema(
+            created=row.created,
+            sensor_type=row.sensor_type,
+            sensor_id=row.sensor_id,
+            payload=row.payload,
+        )
+
+    def _latest_query(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            as_of: datetime | None = None,
+            not_before: datetime | None = None,
+            block: bool = False,
+            model: type[SensorReading] = SensorReading,
+    ) -> SelectBase:
+        condition = (
+            (model.sensor_type == sensor_type.value) &
+            (model.sensor_id == sensor_id)
+        )
+        if as_of is not None:
+            condition &= model.created <= as_of
+        if not_before is not None:
+            condition &= model.created >= not_before
+
+        return (
+            self._select(block, model)
+            .where(condition)
+            .order_by(model.created.desc())
+        )
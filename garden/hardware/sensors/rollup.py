@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta, UTC
+import logging
+from typing import Any, Iterable
+from peewee import EXCLUDED, Case, SelectBase, chunked, fn
+from .dto import ReadingAggregate
+from .enums import RollupResolution, SensorType
+from .models import ROLLUP_MODELS, ReadingRollup
+from .schemas import PAYLOAD_SCHEMAS, SensorReadingSchema
+from ...common.exc import RepositoryError
+
+logger = logging.getLogger(__name__)
+
+# Each rollup row binds 13 parameters (including the inherited created
+# column), so this keeps every upsert under SQLite's 999 host parameters.
+ROLLUP_BATCH_SIZE = 50
+
+RESOLUTION_STEPS: dict[RollupResolution, timedelta] = {
+    RollupResolution.MINUTE: timedelta(minutes=1),
+    RollupResolution.HOUR: timedelta(hours=1),
+}
+
+
+def bucket_start(value: datetime, resolution: RollupResolution) -> datetime:
+    """Start of the bucket containing value."""
+    if resolution == RollupResolution.HOUR:
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(second=0, microsecond=0)
+
+
+def bucket_ceil(value: datetime, resolution: RollupResolution) -> datetime:
+    """Start of the first bucket that begins at or after value."""
+    start = bucket_start(value, resolution)
+    return start if start == value else start + RESOLUTION_STEPS[resolution]
+
+
+def _as_datetime(value: Any) -> datetime:
+    # Timezone-aware timestamps come back from peewee as ISO text.
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+class ReadingRollupRepository:
+    """
+    Maintains and reads the per-minute and per-hour rollup tables.
+
+    apply() is called by the reading repositories in the same transaction
+    as the insert, so rollups are kept current incrementally: each batch of
+    readings is aggregated in memory and merged into existing buckets with
+    one INSERT ... ON CONFLICT DO UPDATE per chunk. Nothing is ever
+    recomputed from the raw tables.
+
+    Rollups only cover readings saved while they are enabled; readings
+    stored before that are folded in by backfill_reading_rollups (the
+    backfill-rollups command).
+    """
+
+    def apply(self, schemas: Iterable[SensorReadingSchema]) -> int:
+        """Fold readings into their minute and hour buckets; returns rows upserted."""
+        buckets: dict[tuple[RollupResolution, str, str, str, datetime], list[Any]] = {}
+        for schema in sorted(schemas, key=lambda s: s.created):
+            for field in PAYLOAD_SCHEMAS[schema.sensor_type].model_fields:
+                value = float(schema.payload[field])
+                for resolution in RollupResolution:
+                    key = (
+                        resolution,
+                        schema.sensor_type.value,
+                        schema.sensor_id,
+                        field,
+                        bucket_start(schema.created, resolution),
+                    )
+                    agg = buckets.get(key)
+                    if agg is None:
+                        buckets[key] = [1, value, value, value, value, schema.created, value, schema.created]
+                    else:
+                        agg[0] += 1
+                        agg[1] = min(agg[1], value)
+                        agg[2] = max(agg[2], value)
+                        agg[3] += value
+                        agg[6] = value
+                        agg[7] = schema.created
+
+        rows_by_resolution: dict[RollupResolution, list[dict[str, Any]]] = {}
+        for (resolution, sensor_type, sensor_id, field, bucket), agg in buckets.items():
+            rows_by_resolution.setdefault(resolution, []).append({
+                "sensor_type": sensor_type,
+                "sensor_id": sensor_id,
+                "field": field,
+                "bucket": bucket,
+                "sample_count": agg[0],
+                "min_value": agg[1],
+                "max_value": agg[2],
+                "sum_value": agg[3],
+                "first_value": agg[4],
+                "first_created": agg[5],
+                "last_value": agg[6],
+                "last_created": agg[7],
+            })
+
+        try:
+            for resolution, rows in rows_by_resolution.items():
+                model = ROLLUP_MODELS[resolution]
+                for batch in chunked(rows, ROLLUP_BATCH_SIZE):
+                    self._upsert(model, batch)
+            return len(buckets)
+        except Exception as e:
+            msg = f"Failed to update {len(buckets)} reading rollups due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def fetch_buckets(
+            self,
+            resolution: RollupResolution,
+            sensor_type: SensorType,
+            sensor_id: str,
+            field: str,
+            start: datetime,
+            stop: datetime,
+    ) -> list[tuple[datetime, ReadingAggregate]]:
+        """Buckets starting in [start, stop), in time order."""
+        try:
+            query = self._bucket_query(resolution, sensor_type, sensor_id, field, start, stop)
+            return [
+                (
+                    _as_datetime(bucket),
+                    ReadingAggregate(
+                        sample_count=count,
+                        min_value=min_value,
+                        max_value=max_value,
+                        sum_value=sum_value,
+                        first_value=first_value,
+                        first_created=_as_datetime(first_created),
+                        last_value=last_value,
+                        last_created=_as_datetime(last_created),
+                    ),
+                )
+                for (
+                    bucket, count, min_value, max_value, sum_value,
+                    first_value, first_created, last_value, last_created,
+                ) in query
+            ]
+        except Exception as e:
+            msg = f"Failed to fetch {resolution.value} reading rollups due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def aggregate(
+            self,
+            resolution: RollupResolution,
+            sensor_type: SensorType,
+            sensor_id: str,
+            field: str,
+            start: datetime,
+            stop: datetime,
+    ) -> ReadingAggregate:
+        """Merge of the buckets starting in [start, stop)."""
+        result = ReadingAggregate()
+        if start >= stop:
+            return result
+        for _, bucket in self.fetch_buckets(resolution, sensor_type, sensor_id, field, start, stop):
+            result = result.merge(bucket)
+        return result
+
+    def hot_queries(self) -> dict[str, SelectBase]:
+        """Bucket lookups behind fetch_window_aggregate(), for query plan checks."""
+        now = datetime.now(UTC)
+        return {
+            f"fetch_buckets[{resolution.value}]": self._bucket_query(
+                resolution, SensorType.CLIMATE, "sensor", "temp", now, now,
+            )
+            for resolution in RollupResolution
+        }
+
+    def _bucket_query(
+            self,
+            resolution: RollupResolution,
+            sensor_type: SensorType,
+            sensor_id: str,
+            field: str,
+            start: datetime,
+            stop: datetime,
+    ) -> SelectBase:
+        model = ROLLUP_MODELS[resolution]
+        return (
+            model.select(
+                model.bucket,
+                model.sample_count,
+                model.min_value,
+                model.max_value,
+                model.sum_value,
+                model.first_value,
+                model.first_created,
+                model.last_value,
+                model.last_created,
+            )
+            .where(
+                (model.sensor_type == sensor_type.value) &
+                (model.sensor_id == sensor_id) &
+                (model.field == field) &
+                (model.bucket >= start) &
+                (model.bucket < stop)
+            )
+            .order_by(model.bucket)
+            .tuples()
+        )
+
+    def _upsert(self, model: type[ReadingRollup], rows: list[dict[str, Any]]) -> None:
+        # In DO UPDATE, unqualified columns are the stored row and EXCLUDED
+        # is the incoming one; every SET expression sees the stored values.
+        model.insert_many(rows).on_conflict(
+            conflict_target=[model.sensor_type, model.sensor_id, model.field, model.bucket],
+            update={
+                model.sample_count: model.sample_count + EXCLUDED.sample_count,
+                model.min_value: fn.MIN(model.min_value, EXCLUDED.min_value),
+                model.max_value: fn.MAX(model.max_value, EXCLUDED.max_value),
+                model.sum_value: model.sum_value + EXCLUDED.sum_value,
+                model.first_value: Case(
+                    None,
+                    [(EXCLUDED.first_created < model.first_created, EXCLUDED.first_value)],
+                    model.first_value,
+                ),
+                model.first_created: fn.MIN(model.first_created, EXCLUDED.first_created),
+                model.last_value: Case(
+                    None,
+                    [(EXCLUDED.last_created >= model.last_created, EXCLUDED.last_value)],
+                    model.last_value,
+                ),
+                model.last_created: fn.MAX(model.last_created, EXCLUDED.last_created),
+            },
+        ).execute()
@@ -0,0 +1,135 @@
+"""
+Drivers for the sensors wired to the Raspberry Pi.
+
+- dht22: DHT22 temperature and humidity sensor on a GPIO pin, read with
+  adafruit-circuitpython-dht.
+- ek1940 (capacitive soil moisture probe) and photo_resistor (LDR in a
+  voltage divider): analog sensors read through an MCP3008 10-bit ADC on
+  the SPI bus, so raw_adc is 0-1023 like the calibration in policies.yaml.
+
+Wiring is set on the SensorRef: pin is the board pin name (the DHT22 data
+pin, or the MCP3008 chip select) and channel the MCP3008 input (0-7).
+
+The Blinka and Adafruit libraries are only imported when a driver is
+built, so machines without them can still run with `model: simulated`.
+"""
+
+from functools import cache
+import importlib
+import logging
+import time
+from types import ModuleType
+from typing import Any
+from .drivers import SensorDriver, register_driver
+from .enums import SensorType
+from .exc import SensorError
+from ...config.sensors import SensorRef
+
+logger = logging.getLogger(__name__)
+
+DHT22_MODEL = "dht22"
+EK1940_MODEL = "ek1940"
+PHOTO_RESISTOR_MODEL = "photo_resistor"
+
+DEFAULT_DHT22_PIN = "D4"
+DHT22_READ_ATTEMPTS = 3
+# The DHT22 answers at most once every 2 s; adafruit_dht returns the cached
+# values for reads within that window.
+DHT22_RETRY_SECONDS = 2.0
+
+DEFAULT_MCP3008_CS_PIN = "D5"
+MCP3008_CHANNELS = 8
+MCP3008_BAUDRATE = 1_000_000
+
+
+def _import(ref: SensorRef, name: str) -> ModuleType:
+    # Blinka raises NotImplementedError (not ImportError) on boards it does not support.
+    try:
+        return importlib.import_module(name)
+    except (ImportError, NotImplementedError, RuntimeError) as e:
+        msg = (
+            f"Cannot drive {ref.model} sensor {ref.id}: {name} is unavailable ({e}). "
+            f"Set `model: simulated` in sensors.yaml to run without the hardware."
+        )
+        logger.error(msg)
+        raise SensorError(msg) from e
+
+
+def _board_pin(ref: SensorRef, default: str) -> Any:
+    board = _import(ref, "board")
+    name = ref.pin or default
+    pin = getattr(board, name, None)
+    if pin is None:
+        raise SensorError(f"Unknown board pin {name!r} for sensor {ref.id}")
+    return pin
+
+
+@cache
+def _spi_bus(busio: ModuleType, board: ModuleType) -> Any:
+    """The SPI bus, shared by every MCP3008 (SPIDevice locks it per transfer)."""
+    return busio.SPI(board.SCK, MOSI=board.MOSI, MISO=board.MISO)
+
+
+class DHT22Driver(SensorDriver):
+
+    def __init__(self, sensor_type: SensorType, ref: SensorRef):
+        if sensor_type != SensorType.CLIMATE:
+            raise SensorError(f"{ref.model} sensor {ref.id} can only be a climate sensor")
+        super().__init__(sensor_type, ref)
+        adafruit_dht = _import(ref, "adafruit_dht")
+        # Bit-banged rather than pulseio, which needs a helper process per sensor.
+        self._device = adafruit_dht.DHT22(_board_pin(ref, DEFAULT_DHT22_PIN), use_pulseio=False)
+
+    def read(self) -> dict[str, Any]:
+        # Checksum and timing failures are common; retry before giving up.
+        error: Exception | None = None
+        for attempt in range(DHT22_READ_ATTEMPTS):
+            if attempt:
+                time.sleep(DHT22_RETRY_SECONDS)
+            try:
+                temp, humidity = self._device.temperature, self._device.humidity
+            except RuntimeError as e:
+                error = e
+                continue
+            if temp is not None and humidity is not None:
+                return {"temp": float(temp), "humidity": float(humidity)}
+        raise SensorError(f"Failed to read {self.ref.id} after {DHT22_READ_ATTEMPTS} attempts: {error}")
+
+
+class MCP3008Driver(SensorDriver):
+    """One analog sensor on one input channel of an MCP3008."""
+
+    def __init__(self, sensor_type: SensorType, ref: SensorRef):
+        if sensor_type not in (SensorType.LIGHT, SensorType.SOIL_MOISTURE):
+            raise SensorError(f"{ref.model} sensor {ref.id} can only be a light or soil moisture sensor")
+        if ref.channel is None or not 0 <= ref.channel < MCP3008_CHANNELS:
+            raise SensorError(
+                f"{ref.model} sensor {ref.id} needs an MCP3008 channel from 0 to {MCP3008_CHANNELS - 1}"
+            )
+        super().__init__(sensor_type, ref)
+        busio = _import(ref, "busio")
+        digitalio = _import(ref, "digitalio")
+        spi_device = _import(ref, "adafruit_bus_device.spi_device")
+        chip_select = digitalio.DigitalInOut(_board_pin(ref, DEFAULT_MCP3008_CS_PIN))
+        spi = _spi_bus(busio, _import(ref, "board"))
+        self._device = spi_device.SPIDevice(spi, chip_select, baudrate=MCP3008_BAUDRATE)
+        # Start bit, then single-ended mode and the channel number.
+        self._request = bytes([0x01, (0x08 | ref.channel) << 4, 0x00])
+
+    def read(self) -> dict[str, Any]:
+        response = bytearray(3)
+        with self._device as spi:
+            spi.write_readinto(self._request, response)
+        # The 10-bit result is the low 2 bits of the second byte and the third byte.
+        return {"raw_adc": ((response[1] & 0x03) << 8) | response[2]}
+
+
+@register_driver(DHT22_MODEL)
+def dht22_driver(sensor_type: SensorType, ref: SensorRef) -> DHT22Driver:
+    return DHT22Driver(sensor_type, ref)
+
+
+@register_driver(EK1940_MODEL)
+@register_driver(PHOTO_RESISTOR_MODEL)
+def mcp3008_driver(sensor_type: SensorType, ref: SensorRef) -> MCP3008Driver:
+    return MCP3008Driver(sensor_type, ref)
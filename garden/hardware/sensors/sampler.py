@@ -0,0 +1,177 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+import logging
+from .drivers import SensorDriver
+from .enums import SensorType
+from .schemas import PAYLOAD_SCHEMAS, SensorReadingSchema
+from .writer import BufferedReadingWriter
+from ...config.sensors import SensorsConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_READ_TIMEOUT_SECONDS = 10.0
+
+
+@dataclass
+class SensorSamplingStats:
+    reads: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped: int = 0        # ticks skipped because the previous read was still running
+    missed_ticks: int = 0   # ticks dropped because the loop fell behind schedule
+    last_read_seconds: float = 0.0
+
+
+@dataclass
+class SamplerStats:
+    sensors: dict[str, SensorSamplingStats] = field(default_factory=dict)
+
+    @property
+    def reads(self) -> int:
+        return sum(stats.reads for stats in self.sensors.values())
+
+
+class SamplingScheduler:
+    """
+    Asyncio daemon that reads every configured sensor on its domain's
+    sampling.interval_seconds.
+
+    Each sensor runs its own loop on a fixed schedule (ticks are not pushed
+    back by slow reads; ticks that are already past are dropped rather than
+    burst). Blocking driver reads run on a bounded thread pool and are
+    abandoned after read_timeout_seconds, so a slow or hung sensor never
+    delays the others. A sensor whose previous read is still occupying a
+    worker skips its tick instead of queuing another, so one hung sensor
+    holds at most one worker.
+
+    Readings are validated against the sensor type's payload schema and
+    handed to a BufferedReadingWriter, which commits them in batches. The
+    writer runs on its own single thread, so database work never blocks
+    the event loop and always uses the same connection.
+    """
+
+    def __init__(
+        self,
+        sensors_config: SensorsConfig,
+        drivers: dict[tuple[SensorType, str], SensorDriver],
+        writer: BufferedReadingWriter,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        read_timeout_seconds: float = DEFAULT_READ_TIMEOUT_SECONDS,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if read_timeout_seconds <= 0:
+            raise ValueError("read_timeout_seconds must be > 0")
+
+        self.sensors = sensors_config
+        self.drivers = drivers
+        self.writer = writer
+        self.max_workers = max_workers
+        self.read_timeout_seconds = read_timeout_seconds
+        self.stats = SamplerStats()
+
+        self._read_pool: ThreadPoolExecutor | None = None
+        self._write_pool: ThreadPoolExecutor | None = None
+        self._inflight: dict[str, Future] = {}
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Sample until stop is set (or the task is cancelled), then flush the writer."""
+        stop = stop or asyncio.Event()
+        self._read_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sensor-read")
+        self._write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sensor-write")
+
+        tasks = []
+        for sensor_type in SensorType:
+            domain = getattr(self.sensors, sensor_type.value)
+            for ref in domain.sensors:
+                driver = self.drivers[(sensor_type, ref.id)]
+                self.stats.sensors[ref.id] = SensorSamplingStats()
+                tasks.append(asyncio.create_task(
+                    self._sample_loop(driver, domain.sampling.interval_seconds),
+                    name=f"sample-{ref.id}",
+                ))
+        tasks.append(asyncio.create_task(self._flush_loop(), name="sample-flush"))
+        logger.info(f"Sampling {len(tasks) - 1} sensors with {self.max_workers} read workers")
+
+        try:
+            await stop.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self._write_pool, self.writer.close)
+            finally:
+                self._write_pool.shutdown(wait=True)
+                # Hung reads cannot be interrupted; don't wait for them.
+                self._read_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _sample_loop(self, driver: SensorDriver, interval_seconds: int) -> None:
+        loop = asyncio.get_running_loop()
+        stats = self.stats.sensors[driver.ref.id]
+        next_at = loop.time()
+
+        while True:
+            await self._sample_once(driver, stats)
+
+            next_at += interval_seconds
+            now = loop.time()
+            if next_at < now:
+                missed = int((now - next_at) // interval_seconds) + 1
+                stats.missed_ticks += missed
+                next_at += missed * interval_seconds
+            await asyncio.sleep(next_at - now)
+
+    async def _sample_once(self, driver: SensorDriver, stats: SensorSamplingStats) -> None:
+        sensor_id = driver.ref.id
+        previous = self._inflight.get(sensor_id)
+        if previous is not None and not previous.done():
+            stats.skipped += 1
+            logger.warning(f"Skipping read of {sensor_id}: previous read still running")
+            return
+
+        loop = asyncio.get_running_loop()
+        future = self._read_pool.submit(driver.read)  # type: ignore[union-attr]
+        self._inflight[sensor_id] = future
+
+        started = loop.time()
+        try:
+            payload = await asyncio.wait_for(asyncio.wrap_future(future), self.read_timeout_seconds)
+            reading = SensorReadingSchema(
+                sensor_id=sensor_id,
+                sensor_type=driver.sensor_type,
+                payload=PAYLOAD_SCHEMAS[driver.sensor_type](**payload).model_dump(),
+                created=datetime.now(UTC),
+            )
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"Read of {sensor_id} timed out after {self.read_timeout_seconds}s")
+            return
+        except Exception:
+            stats.failures += 1
+            logger.error(f"Read of {sensor_id} failed", exc_info=True)
+            return
+        finally:
+            stats.last_read_seconds = loop.time() - started
+
+        stats.reads += 1
+        try:
+            await loop.run_in_executor(self._write_pool, self.writer.add, reading)
+        except Exception:
+            # The writer keeps the batch buffered and retries on the next flush.
+            logger.error(f"Failed to write reading from {sensor_id}", exc_info=True)
+
+    async def _flush_loop(self) -> None:
+        """Flush batches that reached their age limit while no reads arrived."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.writer.max_batch_age_seconds)
+            try:
+                await loop.run_in_executor(self._write_pool, self.writer.flush_if_due)
+            except Exception:
+                logger.error("Periodic reading flush failed", exc_info=True)
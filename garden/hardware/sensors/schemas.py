@@ -28,4 +28,10 @@ class LightPayload(SensorPayload):
 
 class SoilMoisturePayload(SensorPayload):
     # read actual sensor output
-    raw_adc: int
\ No newline at end of file
+    raw_adc: int
+
+PAYLOAD_SCHEMAS: dict[SensorType, type[SensorPayload]] = {
+    SensorType.CLIMATE: ClimatePayload,
+    SensorType.LIGHT: LightPayload,
+    SensorType.SOIL_MOISTURE: SoilMoisturePayload,
+}
@@ -0,0 +1,131 @@
+"""
+Simulated sensor drivers for running without hardware.
+
+Each driver produces a deterministic, time-driven series for one sensor:
+sample(at) depends only on the sensor id, the seed and `at`, so the same
+sensor always reports the same value for the same instant. Series follow
+the shape of a small indoor grow setup:
+
+- climate: temperature peaking mid-afternoon and humidity moving opposite;
+- light: a 12 h grow-light photoperiod with daylight spill and flicker;
+- soil moisture: a slow drying sawtooth, faster by day, reset by watering.
+
+All series add Gaussian noise, and a configurable fraction of reads drop
+out: read() raises SensorError (like a DHT22 checksum failure) and
+sample() returns None.
+
+Configure a sensor with `model: simulated` in sensors.yaml to sample it
+with these drivers.
+"""
+
+from abc import abstractmethod
+from datetime import datetime, timezone
+import math
+import random
+from typing import Any
+import zlib
+from .drivers import SensorDriver, register_driver
+from .enums import SensorType
+from .exc import SensorError
+from ...config.sensors import SensorRef
+
+SIMULATED_MODEL = "simulated"
+DEFAULT_DROPOUT_RATE = 0.01
+
+_DAY_SECONDS = 86_400
+_ADC_MAX = 1023
+
+
+class SimulatedDriver(SensorDriver):
+
+    def __init__(
+        self,
+        sensor_type: SensorType,
+        ref: SensorRef,
+        seed: int = 0,
+        dropout_rate: float = DEFAULT_DROPOUT_RATE,
+    ):
+        if not 0 <= dropout_rate < 1:
+            raise ValueError("dropout_rate must be in [0, 1)")
+        super().__init__(sensor_type, ref)
+        self.seed = seed
+        self.dropout_rate = dropout_rate
+        # Per-sensor offsets so hundreds of simulated sensors do not move in lockstep.
+        self._key = zlib.crc32(f"{seed}:{ref.id}".encode())
+        self._phase = random.Random(self._key).random()
+
+    def read(self) -> dict[str, Any]:
+        payload = self.sample(datetime.now(timezone.utc))
+        if payload is None:
+            raise SensorError(f"Simulated dropout reading {self.ref.id}")
+        return payload
+
+    def sample(self, at: datetime) -> dict[str, Any] | None:
+        """The payload this sensor reports at `at`, or None for a dropout."""
+        rng = random.Random(self._key ^ int(at.timestamp() * 1000))
+        if rng.random() < self.dropout_rate:
+            return None
+        return self._payload(at.timestamp(), rng)
+
+    @abstractmethod
+    def _payload(self, t: float, rng: random.Random) -> dict[str, Any]:
+        ...
+
+    def _day_fraction(self, t: float) -> float:
+        """Time of day in [0, 1), with midnight UTC at 0."""
+        return (t % _DAY_SECONDS) / _DAY_SECONDS
+
+
+class SimulatedClimateDriver(SimulatedDriver):
+
+    def _payload(self, t: float, rng: random.Random) -> dict[str, Any]:
+        # Peak at 15:00, trough at 03:00.
+        cycle = math.cos(2 * math.pi * (self._day_fraction(t) - 15 / 24))
+        temp = 21.5 + 3.5 * cycle + 1.5 * (self._phase - 0.5) + rng.gauss(0, 0.2)
+        humidity = 58 - 12 * cycle + 6 * (self._phase - 0.5) + rng.gauss(0, 1.0)
+        return {
+            "temp": round(temp, 2),
+            "humidity": round(min(max(humidity, 0.0), 100.0), 1),
+        }
+
+
+class SimulatedLightDriver(SimulatedDriver):
+
+    def _payload(self, t: float, rng: random.Random) -> dict[str, Any]:
+        day = self._day_fraction(t)
+        # Grow light on 06:00-18:00 UTC.
+        lamp = 640 if 0.25 <= day < 0.75 else 0
+        # Daylight spill through a window, 07:00-19:00.
+        daylight = max(0.0, math.sin(math.pi * (day - 7 / 24) * 2))
+        adc = 130 + lamp + 90 * daylight + rng.gauss(0, 12)
+        return {"raw_adc": int(min(max(adc, 0), _ADC_MAX))}
+
+
+class SimulatedSoilMoistureDriver(SimulatedDriver):
+
+    # Watered every 2.5 days; each sensor's pot is watered at its own time.
+    watering_interval_seconds = 2.5 * _DAY_SECONDS
+    wet_adc = 330
+    dry_adc = 770
+
+    def _payload(self, t: float, rng: random.Random) -> dict[str, Any]:
+        interval = self.watering_interval_seconds
+        elapsed = (t + self._phase * interval) % interval
+        # Soil dries faster by day: weight elapsed time by a diurnal rate.
+        day = self._day_fraction(t)
+        drift = 0.04 * math.sin(2 * math.pi * (day - 0.25))
+        dryness = min(max(elapsed / interval + drift, 0.0), 1.0) ** 0.7
+        adc = self.wet_adc + (self.dry_adc - self.wet_adc) * dryness + rng.gauss(0, 6)
+        return {"raw_adc": int(min(max(adc, 0), _ADC_MAX))}
+
+
+SIMULATED_DRIVERS: dict[SensorType, type[SimulatedDriver]] = {
+    SensorType.CLIMATE: SimulatedClimateDriver,
+    SensorType.LIGHT: SimulatedLightDriver,
+    SensorType.SOIL_MOISTURE: SimulatedSoilMoistureDriver,
+}
+
+
+@register_driver(SIMULATED_MODEL)
+def simulated_driver(sensor_type: SensorType, ref: SensorRef) -> SimulatedDriver:
+    return SIMULATED_DRIVERS[sensor_type](sensor_type, ref)
@@ -0,0 +1,21 @@
+from .enums import ReadingStorage
+from .partitioned_repository import PartitionedSensorReadingRepository
+from .repository import SensorReadingRepository
+from .rollup import ReadingRollupRepository
+from .typed_repository import TypedSensorReadingRepository
+from ...config.constants import PARTITIONS_DIR
+from ...db.partitions import PartitionManager
+from ...db.sqlite_db import db
+
+
+def build_reading_repository(storage: ReadingStorage, rollups: bool = False) -> SensorReadingRepository:
+    """
+    Return the SensorReadingRepository implementation for the configured
+    storage mode, maintaining the rollup tables on save when rollups is set.
+    """
+    rollup_repository = ReadingRollupRepository() if rollups else None
+    if storage == ReadingStorage.TYPED:
+        return TypedSensorReadingRepository(rollups=rollup_repository)
+    if storage == ReadingStorage.PARTITIONED:
+        return PartitionedSensorReadingRepository(PartitionManager(db, PARTITIONS_DIR), rollups=rollup_repository)
+    return SensorReadingRepository(rollups=rollup_repository)
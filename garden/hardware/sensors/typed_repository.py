@@ -0,0 +1,197 @@
+from datetime import datetime
+from functools import reduce
+from operator import add
+from typing import Any, Iterable
+from peewee import SQL, SelectBase, Value, chunked
+from .models import TYPED_READING_MODELS, TypedSensorReading
+from .repository import (
+    INSERT_BATCH_SIZE,
+    SENSOR_TYPES,
+    SensorReadingRepository,
+    epoch_micros,
+    parse_created,
+)
+from .block import BLOCK_FIELDS
+from .dto import PAYLOAD_VALUES, ReadingRecord
+from .schemas import PAYLOAD_SCHEMAS, SensorReadingSchema
+from .enums import SensorType
+from ...common.exc import RepositoryError
+from ...db.sqlite_db import db
+
+# Widest payload across sensor types; narrower payloads are padded with NULL
+# so per-type selects can be combined with UNION ALL.
+_MAX_FIELDS = max(len(schema.model_fields) for schema in PAYLOAD_SCHEMAS.values())
+
+
+class TypedSensorReadingRepository(SensorReadingRepository):
+    """
+    SensorReadingRepository backed by per-sensor-type tables (ReadingStorage.TYPED).
+
+    Payload fields live in typed numeric columns instead of a JSON document,
+    so rows are smaller and the fetch path never decodes JSON. Every query
+    returns plain tuples shaped (created, sensor_id, sensor_type, *fields),
+    which _to_schema() turns back into the same SensorReadingSchema the JSON
+    backend produces. Callers cannot tell the two backends apart.
+    """
+
+    def save_reading(self, schema: SensorReadingSchema) -> TypedSensorReading:  # type: ignore[override]
+        try:
+            model = TYPED_READING_MODELS[schema.sensor_type]
+            with db.atomic():
+                reading = model.create(**self._row(schema))
+                self._update_rollups([schema])
+            return reading
+        except Exception as e:
+            msg = f"Failed to create {schema.sensor_type.value} reading record due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def save_readings(self, schemas: Iterable[SensorReadingSchema]) -> int:
+        """
+        Persist many readings in a single transaction.
+
+        Readings are grouped by sensor type and bulk-inserted into the
+        matching table with INSERT_BATCH_SIZE rows per statement.
+        """
+        schemas = list(schemas)
+        rows_by_type: dict[SensorType, list[dict[str, Any]]] = {}
+        count = 0
+        try:
+            for schema in schemas:
+                rows_by_type.setdefault(schema.sensor_type, []).append(self._row(schema))
+                count += 1
+
+            if not count:
+                return 0
+
+            with db.atomic():
+                for sensor_type, rows in rows_by_type.items():
+                    model = TYPED_READING_MODELS[sensor_type]
+                    for batch in chunked(rows, INSERT_BATCH_SIZE):
+                        model.insert_many(batch).execute()
+                self._update_rollups(schemas)
+            return count
+        except Exception as e:
+            msg = f"Failed to bulk create {count} typed reading records due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+    def _row(self, schema: SensorReadingSchema) -> dict[str, Any]:
+        fields = PAYLOAD_SCHEMAS[schema.sensor_type].model_fields
+        return {
+            "created": schema.created,
+            "sensor_id": schema.sensor_id,
+            **{field: schema.payload[field] for field in fields},
+        }
+
+    def _to_schema(self, row: tuple) -> SensorReadingSchema:  # type: ignore[override]
+        created, sensor_id, sensor_type, *values = row
+        sensor_type = SensorType(sensor_type)
+        return SensorReadingSchema(
+            created=created,
+            sensor_type=sensor_type,
+            sensor_id=sensor_id,
+            payload=dict(zip(PAYLOAD_SCHEMAS[sensor_type].model_fields, values)),
+        )
+
+    def _to_record(self, row: tuple) -> ReadingRecord:
+        created, sensor_id, sensor_type, *values = row
+        sensor_type = SENSOR_TYPES[sensor_type]
+        values_type = PAYLOAD_VALUES[sensor_type]
+        return ReadingRecord(
+            created=parse_created(created),
+            sensor_type=sensor_type,
+            sensor_id=sensor_id,
+            payload=values_type._make(values[:len(values_type._fields)]),
+        )
+
+    def _select(  # type: ignore[override]
+            self,
+            sensor_type: SensorType,
+            pad: bool = False,
+            block: bool = False,
+    ) -> SelectBase:
+        model = TYPED_READING_MODELS[sensor_type]
+        names = PAYLOAD_SCHEMAS[sensor_type].model_fields
+        if block:
+            # Shaped like the JSON backend's block rows; epoch is aliased to
+            # "created" so UNION ALL queries can still order by that name.
+            return model.select(
+                Value(sensor_type.value).alias("sensor_type"),
+                model.sensor_id,
+                epoch_micros(model.created).alias("created"),
+                *[getattr(model, name) if name in names else Value(None) for name in BLOCK_FIELDS],
+            )
+
+        fields = [getattr(model, name) for name in names]
+        if pad:
+            fields += [Value(None)] * (_MAX_FIELDS - len(fields))
+        return model.select(
+            model.created,
+            model.sensor_id,
+            Value(sensor_type.value).alias("sensor_type"),
+            *fields,
+        )
+
+    def _window_query(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            window_start: datetime,
+            window_end: datetime,
+            block: bool = False,
+    ) -> SelectBase:
+        model = TYPED_READING_MODELS[sensor_type]
+        return (
+            self._select(sensor_type, block=block)
+            .where(
+                (model.sensor_id == sensor_id) &
+                model.created.between(window_start, window_end)
+            )
+            .order_by(model.created)
+            .tuples()
+        )
+
+    def _multi_window_query(
+            self,
+            keys: list[tuple[SensorType, str]],
+            window_start: datetime,
+            window_end: datetime,
+            block: bool = False,
+    ) -> SelectBase:
+        ids_by_type: dict[SensorType, list[str]] = {}
+        for sensor_type, sensor_id in keys:
+            ids_by_type.setdefault(sensor_type, []).append(sensor_id)
+
+        selects = []
+        for sensor_type, sensor_ids in ids_by_type.items():
+            model = TYPED_READING_MODELS[sensor_type]
+            selects.append(
+                self._select(sensor_type, pad=True, block=block)
+                .where(
+                    model.sensor_id.in_(sensor_ids) &
+                    model.created.between(window_start, window_end)
+                )
+            )
+
+        return reduce(add, selects).order_by(SQL("created")).tuples()
+
+    def _latest_query(
+            self,
+            sensor_type: SensorType,
+            sensor_id: str,
+            as_of: datetime | None = None,
+            not_before: datetime | None = None,
+            block: bool = False,
+    ) -> SelectBase:
+        model = TYPED_READING_MODELS[sensor_type]
+        condition = model.sensor_id == sensor_id
+        if as_of is not None:
+            condition &= model.created <= as_of
+        if not_before is not None:
+            condition &= model.created >= not_before
+
+        return (
+            self._select(sensor_type, block=block)
+            .where(condition)
+            .order_by(model.created.desc())
+            .tuples()
+        )
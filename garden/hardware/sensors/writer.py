@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from .repository import SensorReadingRepository
+from .schemas import SensorReadingSchema
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 500
+DEFAULT_MAX_BATCH_AGE_SECONDS = 5.0
+
+
+@dataclass
+class WriterStats:
+    """Running counters describing how readings have been grouped into commits."""
+    readings_written: int = 0
+    batches_written: int = 0
+    size_flushes: int = 0
+    age_flushes: int = 0
+    manual_flushes: int = 0
+    failed_flushes: int = 0
+    largest_batch: int = 0
+    total_flush_seconds: float = 0.0
+
+    @property
+    def avg_batch_size(self) -> float:
+        if not self.batches_written:
+            return 0.0
+        return self.readings_written / self.batches_written
+
+    @property
+    def avg_flush_seconds(self) -> float:
+        if not self.batches_written:
+            return 0.0
+        return self.total_flush_seconds / self.batches_written
+
+
+class BufferedReadingWriter:
+    """
+    Buffers incoming readings and writes them to the repository in groups.
+
+    A buffered batch is flushed as one transaction when either:
+    - it reaches max_batch_size readings, or
+    - its oldest reading has waited max_batch_age_seconds.
+
+    The age limit is checked on every add() and by flush_if_due(), which
+    callers with an idle loop should invoke periodically so a quiet sensor
+    does not leave readings stranded in memory. close() flushes whatever
+    remains.
+
+    Safe to share between threads. If a flush fails the batch is put back
+    at the front of the buffer and the RepositoryError is re-raised, so
+    readings are not silently dropped.
+    """
+
+    def __init__(
+        self,
+        repository: SensorReadingRepository,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_age_seconds: float = DEFAULT_MAX_BATCH_AGE_SECONDS,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if max_batch_age_seconds <= 0:
+            raise ValueError("max_batch_age_seconds must be > 0")
+
+        self.repository = repository
+        self.max_batch_size = max_batch_size
+        self.max_batch_age_seconds = max_batch_age_seconds
+        self.stats = WriterStats()
+
+        self._buffer: list[SensorReadingSchema] = []
+        self._oldest_at: float | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "BufferedReadingWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def add(self, schema: SensorReadingSchema) -> None:
+        with self._lock:
+            if self._oldest_at is None:
+                self._oldest_at = time.monotonic()
+            self._buffer.append(schema)
+
+            if len(self._buffer) >= self.max_batch_size:
+                self.stats.size_flushes += 1
+                self._flush_locked()
+            elif self._is_due_locked():
+                self.stats.age_flushes += 1
+                self._flush_locked()
+
+    def flush_if_due(self) -> int:
+        """Flush the buffer if its oldest reading has exceeded the age limit."""
+        with self._lock:
+            if not self._is_due_locked():
+                return 0
+            self.stats.age_flushes += 1
+            return self._flush_locked()
+
+    def flush(self) -> int:
+        with self._lock:
+            if not self._buffer:
+                return 0
+            self.stats.manual_flushes += 1
+            return self._flush_locked()
+
+    def close(self) -> None:
+        written = self.flush()
+        logger.info(
+            f"{self.__class__.__name__} closed: flushed {written} pending readings; "
+            f"{self.stats.readings_written} readings in {self.stats.batches_written} batches "
+            f"(avg {self.stats.avg_batch_size:.1f}/batch)"
+        )
+
+    def _is_due_locked(self) -> bool:
+        if self._oldest_at is None:
+            return False
+        return time.monotonic() - self._oldest_at >= self.max_batch_age_seconds
+
+    def _flush_locked(self) -> int:
+        batch = self._buffer
+        self._buffer = []
+        self._oldest_at = None
+
+        started = time.perf_counter()
+        try:
+            written = self.repository.save_readings(batch)
+        except Exception:
+            self.stats.failed_flushes += 1
+            self._buffer = batch + self._buffer
+            self._oldest_at = time.monotonic()
+            logger.error(f"Failed to flush {len(batch)} buffered readings", exc_info=True)
+            raise
+
+        self.stats.total_flush_seconds += time.perf_counter() - started
+        self.stats.readings_written += written
+        self.stats.batches_written += 1
+        self.stats.largest_batch = max(self.stats.largest_batch, written)
+        logger.debug(f"Flushed {written} readings in one transaction")
+        return written
@@ -1,9 +1,18 @@
+from .async_service import AsyncLLMService, HedgePolicy, RetryPolicy
+from .cache import DecisionCache
 from .service import LLMService
 from .schemas import LLMResponse
-from .prompts import PromptBuilder
+from .prompts import PromptBuilder, snapshot_encoding_for
+from .enums import SnapshotEncoding
 
 __all__ = [
+    "AsyncLLMService",
+    "HedgePolicy",
+    "RetryPolicy",
+    "DecisionCache",
     "LLMService",
     "LLMResponse",
     "PromptBuilder",
+    "SnapshotEncoding",
+    "snapshot_encoding_for",
 ]
@@ -0,0 +1,217 @@
+"""
+Async LLM service for the daemon's control loop.
+
+One AsyncAnthropic client, and so one HTTP connection pool, is kept for the
+life of the service, so requests reuse warm TLS connections. Each request
+has an overall deadline. Attempts that fail with a retryable error (a
+connection error, a timeout, 408/409/429 or 5xx) are retried with full
+jitter exponential backoff while the deadline allows. With hedging, an
+attempt still running after a recent latency percentile gets a second,
+identical request; the first to succeed wins and the other is cancelled.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import logging
+import random
+import time
+
+import httpx
+from anthropic import APIConnectionError, APIStatusError, AsyncAnthropic, DefaultAsyncHttpxClient
+
+from .cache import DecisionCache
+from .exc import LLMRequestError
+from .prompts import PromptBuilder
+from .schemas import LLMResponse
+from .service import DEFAULT_MODEL, BaseLLMService
+from ..state.schemas import DerivedStateSnapshot
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+# Connections kept open to the API between control loop cycles.
+MAX_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    deadline_seconds: float = 30.0          # whole request, all attempts and backoff included
+    attempt_timeout_seconds: float = 15.0
+    max_attempts: int = 4
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 8.0
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """Full jitter: uniform in [0, min(max_delay, base * 2**attempt)]."""
+        return rng.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** attempt))
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    percentile: float = 95.0    # hedge attempts slower than this share of recent ones
+    min_samples: int = 20       # no hedging until this many latencies are known
+    window: int = 200           # recent successful call latencies kept
+
+
+@dataclass
+class AsyncLLMStats:
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0         # hedged requests that answered first
+    failures: int = 0
+
+
+class AsyncLLMService(BaseLLMService):
+    """
+    Async counterpart of LLMService with deadlines, retries and hedging.
+
+    Use as an async context manager, or call aclose() on shutdown, to close
+    the connection pool.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = DEFAULT_MODEL,
+        prompt_builder: PromptBuilder | None = None,
+        cache: DecisionCache | None = None,
+        prompt_cache: bool = True,
+        retry: RetryPolicy | None = None,
+        hedge: HedgePolicy | None = None,
+        seed: int | None = None,
+    ):
+        # Set first: _create_client() reads the attempt timeout.
+        self.retry = retry or RetryPolicy()
+        self.hedge = hedge
+        self.stats = AsyncLLMStats()
+        self._latencies: deque[float] = deque(maxlen=hedge.window if hedge else 1)
+        self._rng = random.Random(seed)
+        super().__init__(api_key, model, prompt_builder, cache, prompt_cache)
+
+    def _create_client(self) -> AsyncAnthropic:
+        # Retries and timeouts are handled here, per the policies above.
+        return AsyncAnthropic(
+            api_key=self.api_key,
+            max_retries=0,
+            timeout=self.retry.attempt_timeout_seconds,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncLLMService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+    async def request(self, snapshot: DerivedStateSnapshot, policy_version: str | None = None) -> LLMResponse:
+        """
+        Same contract as LLMService.request(), within retry.deadline_seconds.
+
+        Raises:
+            LLMRequestError: If no attempt succeeded before the deadline or
+                the attempts ran out, or on a non-retryable API error.
+            LLMResponseError: If the response is invalid.
+        """
+        cached = self._cached_response(snapshot, policy_version)
+        if cached is not None:
+            return cached
+
+        self.stats.requests += 1
+        params = self._message_params(snapshot)
+        started = time.perf_counter()
+        deadline = started + self.retry.deadline_seconds
+        attempt = 0
+        while True:
+            timeout = min(deadline - time.perf_counter(), self.retry.attempt_timeout_seconds)
+            try:
+                async with asyncio.timeout(timeout):
+                    response = await self._hedged(params)
+                break
+            except TimeoutError:
+                self.stats.timeouts += 1
+                error: Exception = TimeoutError(f"attempt timed out after {timeout:.1f}s")
+            except Exception as e:
+                error = e
+
+            attempt += 1
+            delay = self.retry.backoff(attempt, self._rng)
+            out_of_time = time.perf_counter() + delay >= deadline
+            if not self._retryable(error) or attempt >= self.retry.max_attempts or out_of_time:
+                self.stats.failures += 1
+                msg = f"Claude API request failed after {attempt} attempts: {error}"
+                logger.error(msg)
+                raise LLMRequestError(msg) from error
+
+            self.stats.retries += 1
+            logger.warning(f"Claude API attempt {attempt} failed ({error}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        result = self._parse_response(response)
+        self._cache_response(snapshot, policy_version, result, time.perf_counter() - started)
+        return result
+
+    async def _hedged(self, params: dict):
+        """
+        One attempt: a single call, plus a hedged second call if the first
+        is slower than the hedge percentile. Raises the last error if both
+        calls fail.
+        """
+        first = asyncio.create_task(self._call(params))
+        pending = {first}
+        try:
+            hedge_after = self._hedge_after()
+            if hedge_after is not None:
+                done, _ = await asyncio.wait({first}, timeout=hedge_after)
+                if not done:
+                    self.stats.hedges += 1
+                    logger.debug(f"Hedging request still running after {hedge_after:.2f}s")
+                    pending.add(asyncio.create_task(self._call(params)))
+
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error  # type: ignore[misc]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, params: dict):
+        self.stats.attempts += 1
+        started = time.perf_counter()
+        response = await self.client.messages.create(**params)
+        self._latencies.append(time.perf_counter() - started)
+        return response
+
+    def _hedge_after(self) -> float | None:
+        if self.hedge is None or len(self._latencies) < self.hedge.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge.percentile / 100))]
+
+    def _retryable(self, error: Exception) -> bool:
+        if isinstance(error, (TimeoutError, APIConnectionError)):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+        return False
@@ -0,0 +1,204 @@
+"""
+Durable cache of LLM decisions keyed by the discretized state.
+
+The LLM is asked to act on levels and trends, not on raw readings, so two
+snapshots with the same discrete content get the same decision. That
+content (the state signature) is:
+
+- temperature and humidity levels and trends,
+- soil moisture level and trend,
+- whether the light is on,
+- the confidence bucket: the weakest domain's confidence (as in
+  DecisionService) in steps of bucket_width.
+
+Entries are keyed by the signature, policy version and model, stored in
+SQLite so they survive restarts, expire ttl_seconds after the API call
+that produced them, and are evicted least recently used first beyond
+max_entries.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import math
+
+from peewee import fn
+from .models import LLMDecisionCacheEntry
+from .schemas import LLMResponse
+from ..common.exc import RepositoryError
+from ..common.serialization import dumps
+from ..state.schemas import DerivedStateSnapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 6 * 3600
+DEFAULT_MAX_ENTRIES = 1_000
+CONFIDENCE_BUCKET_WIDTH = 0.1
+
+
+def state_signature(snapshot: DerivedStateSnapshot, bucket_width: float = CONFIDENCE_BUCKET_WIDTH) -> str:
+    """The snapshot's discrete content as canonical JSON."""
+    climate, soil_moisture, light = snapshot.climate, snapshot.soil_moisture, snapshot.light
+    confidences = [state.confidence for state in (climate, soil_moisture, light) if state is not None]
+    signature = {
+        "climate": {
+            "temperature_level": climate.temperature_level.value,
+            "temperature_trend": climate.temperature_trend.value,
+            "humidity_level": climate.humidity_level.value,
+            "humidity_trend": climate.humidity_trend.value,
+        } if climate else None,
+        "soil_moisture": {
+            "level": soil_moisture.level.value,
+            "trend": soil_moisture.trend.value,
+        } if soil_moisture else None,
+        "light": {"is_light_on": light.is_light_on} if light else None,
+        # Rounded first so e.g. 0.3 / 0.1 lands in bucket 3, not 2.
+        "confidence_bucket": math.floor(round(min(confidences) / bucket_width, 9)) if confidences else None,
+    }
+    return dumps(signature, sort_keys=True)
+
+
+@dataclass
+class DecisionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0            # misses on an entry past its TTL
+    evicted: int = 0            # entries removed to stay within max_entries
+    seconds_saved: float = 0.0  # API latency of the calls hits replaced
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(frozen=True)
+class DecisionCacheSummary:
+    """Totals over every stored entry, including hits from earlier runs."""
+    entries: int
+    hits: int
+    seconds_saved: float
+
+
+class DecisionCache:
+
+    def __init__(
+        self,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        bucket_width: float = CONFIDENCE_BUCKET_WIDTH,
+    ):
+        if ttl_seconds < 1:
+            raise ValueError("ttl_seconds must be >= 1")
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if not 0 < bucket_width <= 1:
+            raise ValueError("bucket_width must be in (0, 1]")
+
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.bucket_width = bucket_width
+        self.stats = DecisionCacheStats()
+
+    def key(self, snapshot: DerivedStateSnapshot, policy_version: str, model: str) -> tuple[str, str]:
+        """The cache key for a snapshot, and its state signature."""
+        signature = state_signature(snapshot, self.bucket_width)
+        key = hashlib.sha256("\n".join((signature, policy_version, model)).encode()).hexdigest()
+        return key, signature
+
+    def get(
+        self,
+        snapshot: DerivedStateSnapshot,
+        policy_version: str,
+        model: str,
+        now: datetime | None = None,
+    ) -> LLMResponse | None:
+        """The cached decision for the snapshot's signature, or None on a miss."""
+        now = now or datetime.now(timezone.utc)
+        key, _ = self.key(snapshot, policy_version, model)
+        entry = LLMDecisionCacheEntry
+        try:
+            row = (
+                entry.select(entry.response, entry.latency_seconds, (entry.created >= now - self.ttl).alias("fresh"))
+                .where(entry.key == key)
+                .dicts()
+                .first()
+            )
+            if row is not None and row["fresh"]:
+                entry.update(hits=entry.hits + 1, last_used=now).where(entry.key == key).execute()
+            elif row is not None:
+                entry.delete().where(entry.key == key).execute()
+        except Exception as e:
+            msg = f"Failed to read LLM decision cache due to the following error: {e}"
+            logger.error(msg, exc_info=True)
+            raise RepositoryError(msg) from e
+
+        if row is None or not row["fresh"]:
+            self.stats.misses += 1
+            self.stats.expired += row is not None
+            return None
+
+        self.stats.hits += 1
+        self.stats.seconds_saved += row["latency_seconds"]
+        response = row["response"]
+        return LLMResponse.model_validate({
+            **response,
+            "raw_response": {**response["raw_response"], "cached": True},
+            "usage": None,
+            "created": now,
+        })
+
+    def put(
+        self,
+        snapshot: DerivedStateSnapshot,
+        policy_version: str,
+        model: str,
+        response: LLMResponse,
+        latency_seconds: float,
+        now: datetime | None = None,
+    ) -> None:
+        """Store a fresh decision, then drop expired and least recently used entries."""
+        now = now or datetime.now(timezone.utc)
+        key, signature = self.key(snapshot, policy_version, model)
+        entry = LLMDecisionCacheEntry
+        try:
+            entry.replace(
+                key=key,
+                signature=signature,
+                policy_version=policy_version,
+                model=model,
+                response=response.model_dump(mode="json"),
+                latency_seconds=latency_seconds,
+                hits=0,
+                created=now,
+                last_used=now,
+            ).execute()
+            entry.delete().where(entry.created < now - self.ttl).execute()
+            keep = entry.select(entry.key).order_by(entry.last_used.desc()).limit(self.max_entries)
+            self.stats.evicted += entry.delete().where(entry.key.not_in(keep)).execute()
+        except Exception as e:
+            msg = f"Failed to write LLM decision cache due to the following error: {e}"
+            logger.error(msg, exc_info=True)
+            raise RepositoryError(msg) from e
+
+    def summary(self) -> DecisionCacheSummary:
+        entry = LLMDecisionCacheEntry
+        try:
+            entries, hits, seconds_saved = entry.select(
+                fn.COUNT(entry.key),
+                fn.COALESCE(fn.SUM(entry.hits), 0),
+                fn.COALESCE(fn.SUM(entry.hits * entry.latency_seconds), 0.0),
+            ).tuples().get()
+        except Exception as e:
+            msg = f"Failed to summarize LLM decision cache due to the following error: {e}"
+            raise RepositoryError(msg) from e
+        return DecisionCacheSummary(entries=entries, hits=hits, seconds_saved=seconds_saved)
+
+    def clear(self) -> int:
+        """Remove every entry. Returns how many were removed."""
+        try:
+            return LLMDecisionCacheEntry.delete().execute()
+        except Exception as e:
+            msg = f"Failed to clear LLM decision cache due to the following error: {e}"
+            raise RepositoryError(msg) from e
@@ -0,0 +1,6 @@
+from ..common import GardenEnum
+
+
+class SnapshotEncoding(GardenEnum):
+    VERBOSE = "verbose"     # labelled multi-line text
+    COMPACT = "compact"     # dense key=value lines, defaults omitted
@@ -0,0 +1,29 @@
+from peewee import (
+    DateTimeField,
+    FloatField,
+    IntegerField,
+    TextField,
+)
+from ..db.base import BaseDBModel
+from ..db.fields import OrjsonField
+
+
+class LLMDecisionCacheEntry(BaseDBModel):
+    """
+    A cached LLM decision for one state signature, policy version and model.
+
+    key is the SHA-256 of the three; they are also stored for inspection.
+    latency_seconds is how long the original API call took, so every hit
+    can be credited with the time it saved.
+    """
+    key = TextField(primary_key=True)
+    signature = TextField()
+    policy_version = TextField()
+    model = TextField()
+    response = OrjsonField()
+    latency_seconds = FloatField()
+    hits = IntegerField(default=0)
+    last_used = DateTimeField(index=True)
+
+    class Meta: # type: ignore[misc]
+        table_name = "llm_decision_cache"
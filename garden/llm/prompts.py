@@ -2,12 +2,25 @@
 Prompt building for the LLM service.
 
 Loads system prompt from YAML and formats state snapshots into user messages.
+
+Snapshots are encoded in one of two forms (SnapshotEncoding):
+
+- verbose: a labelled multi-line block, one value per line
+- compact: one key=value line per domain with short level and trend names,
+  rounded numbers, and the defaults (level ok, trend stable, confidence
+  1.0) left out; the system prompt explains the omissions
+
+The encoding is chosen per model (MODEL_SNAPSHOT_ENCODINGS), by model name
+prefix. Compact messages take about half the input tokens of verbose ones
+(see benchmarks.prompt_tokens).
 """
 
+from datetime import timezone
 import logging
 from pathlib import Path
 import yaml
 
+from .enums import SnapshotEncoding
 from .exc import PromptBuildError
 from ..state.schemas import DerivedStateSnapshot
 
@@ -16,12 +29,55 @@ logger = logging.getLogger(__name__)
 # Default path to system prompt
 DEFAULT_SYSTEM_PROMPT_PATH = Path(__file__).parent.parent.parent / "prompts" / "system.yaml"
 
+DEFAULT_SNAPSHOT_ENCODING = SnapshotEncoding.VERBOSE
+
+# Snapshot encoding per model name prefix; the longest matching prefix wins.
+MODEL_SNAPSHOT_ENCODINGS = {
+    "claude-sonnet-4": SnapshotEncoding.COMPACT,
+    "claude-opus-4": SnapshotEncoding.COMPACT,
+}
+
+# Compact names for the out-of-range levels and for trends; ok and stable are omitted.
+COMPACT_LEVELS = {
+    "too_cold": "cold",
+    "too_hot": "hot",
+    "too_dry": "dry",
+    "too_humid": "humid",
+    "dry": "dry",
+    "wet": "wet",
+}
+COMPACT_TRENDS = {
+    "heating": "up",
+    "humidifying": "up",
+    "wetting": "up",
+    "cooling": "down",
+    "drying": "down",
+}
+
+COMPACT_LEGEND = (
+    "Snapshots are compact: one line per domain. Levels ok, trends stable and a "
+    "confidence (conf) of 1.0 are left out; up and down are rising and falling trends."
+)
+
+
+def snapshot_encoding_for(model: str) -> SnapshotEncoding:
+    """The snapshot encoding for a model, from MODEL_SNAPSHOT_ENCODINGS."""
+    prefixes = [prefix for prefix in MODEL_SNAPSHOT_ENCODINGS if model.startswith(prefix)]
+    if not prefixes:
+        return DEFAULT_SNAPSHOT_ENCODING
+    return MODEL_SNAPSHOT_ENCODINGS[max(prefixes, key=len)]
+
 
 class PromptBuilder:
     """Builds messages for Claude from state snapshots."""
 
-    def __init__(self, system_prompt_path: Path | None = None):
+    def __init__(
+        self,
+        system_prompt_path: Path | None = None,
+        encoding: SnapshotEncoding = DEFAULT_SNAPSHOT_ENCODING,
+    ):
         self.system_prompt_path = system_prompt_path or DEFAULT_SYSTEM_PROMPT_PATH
+        self.encoding = encoding
         self._system_prompt: str | None = None
 
     @property
@@ -46,6 +102,8 @@ class PromptBuilder:
                     parts.append(f"- {constraint}")
             if "context" in data:
                 parts.append(f"\n{data['context'].strip()}")
+            if self.encoding == SnapshotEncoding.COMPACT:
+                parts.append(f"\n{COMPACT_LEGEND}")
 
             return "\n".join(parts)
         except Exception as e:
@@ -54,7 +112,13 @@ class PromptBuilder:
             raise PromptBuildError(msg) from e
 
     def build_user_message(self, snapshot: DerivedStateSnapshot) -> str:
-        """Format the state snapshot as a user message for Claude."""
+        """Format the state snapshot as a user message for Claude, in the builder's encoding."""
+        if self.encoding == SnapshotEncoding.COMPACT:
+            return self.build_compact_message(snapshot)
+        return self.build_verbose_message(snapshot)
+
+    def build_verbose_message(self, snapshot: DerivedStateSnapshot) -> str:
+        """The snapshot as a labelled multi-line block."""
         lines = [
             f"Current time: {snapshot.created.isoformat()}",
             "",
@@ -113,3 +177,42 @@ class PromptBuilder:
         ])
 
         return "\n".join(lines)
+
+    def build_compact_message(self, snapshot: DerivedStateSnapshot) -> str:
+        """The snapshot as one key=value line per domain, defaults omitted."""
+        created = snapshot.created.astimezone(timezone.utc) if snapshot.created.tzinfo else snapshot.created
+        lines = [f"time={created:%Y-%m-%dT%H:%MZ}"]
+
+        if snapshot.climate:
+            c = snapshot.climate
+            temperature = _compact_state(f"temp={c.temperature_c:.1f}C", c.temperature_level.value, c.temperature_trend.value)
+            humidity = _compact_state(f"rh={c.humidity_rh:.1f}%", c.humidity_level.value, c.humidity_trend.value)
+            lines.append(_compact_line("climate", [temperature, humidity], c.confidence))
+        else:
+            lines.append("climate: none")
+
+        if snapshot.soil_moisture:
+            s = snapshot.soil_moisture
+            moisture = _compact_state(f"moisture={s.avg_moisture:.2f}", s.level.value, s.trend.value)
+            lines.append(_compact_line("soil", [moisture], s.confidence))
+        else:
+            lines.append("soil: none")
+
+        if snapshot.light:
+            lt = snapshot.light
+            state = f"{'on' if lt.is_light_on else 'off'} intensity={lt.intensity:.2f}"
+            lines.append(_compact_line("light", [state], lt.confidence))
+        else:
+            lines.append("light: none")
+
+        lines.append("Decide the action; no_action if acceptable.")
+        return "\n".join(lines)
+
+
+def _compact_state(value: str, level: str, trend: str) -> str:
+    return " ".join(part for part in (value, COMPACT_LEVELS.get(level), COMPACT_TRENDS.get(trend)) if part)
+
+
+def _compact_line(domain: str, states: list[str], confidence: float) -> str:
+    line = f"{domain}: {', '.join(states)}"
+    return line if round(confidence, 1) >= 1.0 else f"{line}, conf={confidence:.1f}"
@@ -3,10 +3,20 @@ from pydantic import BaseModel, Field
 from ..action.enums import ActionType
 
 
+class LLMUsage(BaseModel):
+    """Token usage of one API call. Cached prefix tokens are not in input_tokens."""
+
+    input_tokens: int
+    output_tokens: int
+    cache_creation_input_tokens: int = 0    # prompt prefix written to the cache
+    cache_read_input_tokens: int = 0        # prompt prefix read from the cache
+
+
 class LLMResponse(BaseModel):
     """Response from the LLM service."""
 
     action: ActionType
     raw_response: dict = Field(default_factory=dict)
     model: str
+    usage: LLMUsage | None = None   # None when served from the decision cache
     created: datetime = Field(default_factory=lambda: datetime.now(UTC))
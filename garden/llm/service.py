@@ -5,35 +5,36 @@ Calls Claude API with the current state and available tools.
 Returns a structured response indicating which action to take.
 """
 
+from abc import ABC, abstractmethod
 import logging
 import os
+import time
+from typing import Any
 
 from anthropic import Anthropic
 
+from .cache import DecisionCache
 from .exc import LLMRequestError, LLMResponseError
-from .prompts import PromptBuilder
-from .schemas import LLMResponse
+from .prompts import PromptBuilder, snapshot_encoding_for
+from .schemas import LLMResponse, LLMUsage
 from .tools import TOOLS, TOOL_TO_ACTION
 from ..action.enums import ActionType
+from ..common.exc import RepositoryError
 from ..state.schemas import DerivedStateSnapshot
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_MODEL = "claude-sonnet-4-20250514"
 
+# Marks the end of a prompt prefix the API may cache. The prefix runs
+# tools, then system, in that order.
+CACHE_CONTROL = {"type": "ephemeral"}
 
-class LLMService:
-    """
-    Calls Claude to decide what action to take given a state snapshot.
-
-    Responsibilities:
-    - Build prompt from state
-    - Call Claude API with tools
-    - Parse response into LLMResponse
 
-    Does NOT:
-    - Execute actions
-    - Persist anything
+class BaseLLMService(ABC):
+    """
+    Prompt building, response parsing and decision caching shared by the
+    sync and async services; subclasses own the API client and the call.
     """
 
     def __init__(
@@ -41,52 +42,99 @@ class LLMService:
         api_key: str | None = None,
         model: str = DEFAULT_MODEL,
         prompt_builder: PromptBuilder | None = None,
+        cache: DecisionCache | None = None,
+        prompt_cache: bool = True,
     ):
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise LLMRequestError("ANTHROPIC_API_KEY not set")
 
         self.model = model
-        self.client = Anthropic(api_key=self.api_key)
-        self.prompt_builder = prompt_builder or PromptBuilder()
-
-    def request(self, snapshot: DerivedStateSnapshot) -> LLMResponse:
-        """
-        Send the state snapshot to Claude and get an action decision.
-
-        Args:
-            snapshot: The current derived state.
+        # The snapshot encoding follows the model unless a builder is given.
+        self.prompt_builder = prompt_builder or PromptBuilder(encoding=snapshot_encoding_for(model))
+        self.cache = cache
+        self.prompt_cache = prompt_cache
+        self.client = self._create_client()
+
+    @abstractmethod
+    def _create_client(self) -> Any:
+        ...
+
+    def _cached_response(self, snapshot: DerivedStateSnapshot, policy_version: str | None) -> LLMResponse | None:
+        if self.cache is None or policy_version is None:
+            return None
+        try:
+            cached = self.cache.get(snapshot, policy_version, self.model)
+        except RepositoryError:
+            return None
+        if cached is not None:
+            stats = self.cache.stats
+            logger.info(
+                f"Decision cache hit: {cached.action.value} "
+                f"(hit rate {stats.hit_rate:.0%}, {stats.seconds_saved:.1f}s saved)"
+            )
+        return cached
 
-        Returns:
-            LLMResponse with the action to take.
+    def _cache_response(
+        self,
+        snapshot: DerivedStateSnapshot,
+        policy_version: str | None,
+        response: LLMResponse,
+        latency_seconds: float,
+    ) -> None:
+        if self.cache is None or policy_version is None:
+            return
+        try:
+            self.cache.put(snapshot, policy_version, self.model, response, latency_seconds)
+        except RepositoryError:
+            pass
 
-        Raises:
-            LLMRequestError: If the API call fails.
-            LLMResponseError: If the response is invalid.
-        """
-        system_prompt = self.prompt_builder.system_prompt
+    def _message_params(self, snapshot: DerivedStateSnapshot) -> dict:
+        tools, system = self._prompt_prefix()
         user_message = self.prompt_builder.build_user_message(snapshot)
 
         logger.debug(f"Sending request to {self.model}")
         logger.debug(f"User message:\n{user_message}")
 
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=256,
-                system=system_prompt,
-                tools=TOOLS,
-                tool_choice={"type": "any"},
-                messages=[
-                    {"role": "user", "content": user_message}
-                ],
-            )
-        except Exception as e:
-            msg = f"Claude API request failed: {e}"
-            logger.error(msg, exc_info=True)
-            raise LLMRequestError(msg) from e
-
-        return self._parse_response(response)
+        return {
+            "model": self.model,
+            "max_tokens": 256,
+            "system": system,
+            "tools": tools,
+            "tool_choice": {"type": "any"},
+            "messages": [
+                {"role": "user", "content": user_message}
+            ],
+        }
+
+    def _prompt_prefix(self) -> tuple[list[dict], str | list[dict]]:
+        """
+        The tools and system prompt, identical on every call. With
+        prompt_cache, cache breakpoints after the last tool and after the
+        system prompt let the API reuse the processed prefix for its cache
+        lifetime, and bill it as cheaper cache reads. Prefixes below the
+        model's minimum cacheable length are processed as usual.
+        """
+        system_prompt = self.prompt_builder.system_prompt
+        if not self.prompt_cache:
+            return TOOLS, system_prompt
+
+        tools = [*TOOLS[:-1], {**TOOLS[-1], "cache_control": CACHE_CONTROL}]
+        system = [{"type": "text", "text": system_prompt, "cache_control": CACHE_CONTROL}]
+        return tools, system
+
+    def _parse_usage(self, response) -> LLMUsage:
+        usage = LLMUsage(
+            input_tokens=response.usage.input_tokens,
+            output_tokens=response.usage.output_tokens,
+            cache_creation_input_tokens=response.usage.cache_creation_input_tokens or 0,
+            cache_read_input_tokens=response.usage.cache_read_input_tokens or 0,
+        )
+        logger.info(
+            f"Tokens: {usage.input_tokens} input, {usage.cache_read_input_tokens} cache read, "
+            f"{usage.cache_creation_input_tokens} cache write, {usage.output_tokens} output"
+        )
+        return usage
 
     def _parse_response(self, response) -> LLMResponse:
         """Extract the tool call from Claude's response."""
@@ -121,4 +169,62 @@ class LLMService:
                 "stop_reason": response.stop_reason,
             },
             model=response.model,
+            usage=self._parse_usage(response),
         )
+
+
+class LLMService(BaseLLMService):
+    """
+    Calls Claude to decide what action to take given a state snapshot.
+
+    Responsibilities:
+    - Build prompt from state
+    - Call Claude API with tools
+    - Mark the static tools and system prompt as a cacheable prompt prefix
+    - Parse response into LLMResponse
+    - Reuse cached decisions for unchanged discrete state (with a DecisionCache)
+
+    Does NOT:
+    - Execute actions
+    - Persist decisions
+    """
+
+    def _create_client(self) -> Anthropic:
+        return Anthropic(api_key=self.api_key)
+
+    def request(self, snapshot: DerivedStateSnapshot, policy_version: str | None = None) -> LLMResponse:
+        """
+        Send the state snapshot to Claude and get an action decision.
+
+        With a cache and a policy_version, a decision cached for the same
+        state signature, policy version and model is returned instead of
+        calling the API, and fresh decisions are cached. Cache failures are
+        logged and fall back to the API.
+
+        Args:
+            snapshot: The current derived state.
+            policy_version: The policy version the decision is taken under.
+
+        Returns:
+            LLMResponse with the action to take.
+
+        Raises:
+            LLMRequestError: If the API call fails.
+            LLMResponseError: If the response is invalid.
+        """
+        cached = self._cached_response(snapshot, policy_version)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            response = self.client.messages.create(**self._message_params(snapshot))
+        except Exception as e:
+            msg = f"Claude API request failed: {e}"
+            logger.error(msg, exc_info=True)
+            raise LLMRequestError(msg) from e
+        latency = time.perf_counter() - started
+
+        result = self._parse_response(response)
+        self._cache_response(snapshot, policy_version, result, latency)
+        return result
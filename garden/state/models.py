@@ -5,7 +5,7 @@ from peewee import (
     BooleanField,
     FloatField,
 )
-from ..db.base import StateModel
+from ..db.base import BaseDBModel, StateModel
 
 
 class LightState(StateModel):
@@ -18,6 +18,10 @@ class LightState(StateModel):
 
     class Meta: # type: ignore[misc]
         table_name = "light_state"
+        indexes = (
+            # Latest state per sensor (warm restart).
+            (("sensor_id", "created"), False),
+        )
 
 
 class ClimateState(StateModel):
@@ -38,6 +42,10 @@ class ClimateState(StateModel):
 
     class Meta: # type: ignore[misc]
         table_name = "climate_state"
+        indexes = (
+            # Latest state per sensor (warm restart).
+            (("sensor_id", "created"), False),
+        )
 
 
 class SoilMoistureState(StateModel):
@@ -49,4 +57,27 @@ class SoilMoistureState(StateModel):
     state_started_at = DateTimeField(index=True)
 
     class Meta: # type: ignore[misc]
-        table_name = "soil_moisture_state"
\ No newline at end of file
+        table_name = "soil_moisture_state"
+        indexes = (
+            # Latest state per sensor (warm restart).
+            (("sensor_id", "created"), False),
+        )
+
+
+class StateSnapshot(BaseDBModel):
+    """
+    A DerivedStateSnapshot's content, stored once per distinct content.
+
+    content is the snapshot's canonical JSON without its timestamps (see
+    garden.state.snapshots); hash is its SHA-256. Rows referencing a
+    snapshot keep their own snapshot and window times. created is when the
+    content was first stored.
+    """
+    hash = TextField(primary_key=True)
+    content = TextField()
+
+    class Meta: # type: ignore[misc]
+        table_name = "state_snapshot"
+
+
+STATE_MODELS = (ClimateState, LightState, SoilMoistureState)
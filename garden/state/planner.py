@@ -0,0 +1,196 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import Iterable
+
+from ..config.sensors import SensorsConfig, EvidenceConfig
+from ..hardware.sensors.enums import SensorType, ReadingDecode
+from ..hardware.sensors.repository import DecodedReading, SensorReadingRepository
+from ..hardware.sensors.block import ReadingBlock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DomainFetch:
+    """
+    The readings a single domain needs from one sensor.
+
+    Time-based evidence sets window_start; sample-based evidence sets
+    sample_limit instead and takes the newest readings up to window_end,
+    none older than not_before.
+    """
+    sensor_type: SensorType
+    sensor_id: str
+    window_end: datetime
+    window_start: datetime | None = None
+    sample_limit: int | None = None
+    not_before: datetime | None = None
+
+    def describe(self) -> str:
+        if self.sample_limit is not None:
+            return f"last {self.sample_limit} samples in [{self.not_before}, {self.window_end}]"
+        return f"window [{self.window_start}, {self.window_end}]"
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """
+    Combined fetch for several domains.
+
+    Time-windowed domains are read with one query over the union of their
+    windows, and each domain's readings are sliced back out of the shared
+    result. Sample-counted domains are read with a bounded newest-N query.
+    """
+    as_of: datetime
+    domains: dict[SensorType, DomainFetch]
+
+    @property
+    def windowed(self) -> list[DomainFetch]:
+        return [fetch for fetch in self.domains.values() if fetch.window_start is not None]
+
+    @property
+    def sampled(self) -> list[DomainFetch]:
+        return [fetch for fetch in self.domains.values() if fetch.sample_limit is not None]
+
+    @property
+    def window_start(self) -> datetime:
+        return min(fetch.window_start for fetch in self.windowed if fetch.window_start is not None)
+
+    @property
+    def sensors(self) -> list[tuple[SensorType, str]]:
+        return list(dict.fromkeys(
+            (fetch.sensor_type, fetch.sensor_id) for fetch in self.windowed
+        ))
+
+
+class SnapshotFetchPlanner:
+    """
+    Plans and executes the reading fetches behind a state snapshot.
+
+    Instead of one repository round trip per domain, the planner computes
+    the union of the domains' evidence windows, fetches every needed
+    (sensor_type, sensor_id) pair in a single ordered scan, and slices the
+    rows per domain in memory.
+
+    Domains with sample-based evidence (lookback_samples) are not part of
+    the union: they are served by a LIMIT N query on the newest readings,
+    so their cost stays constant however fast the sensor is sampled.
+    Readings older than the evidence's max_age_seconds are left out, so a
+    sensor that stops reporting stops producing state.
+    """
+
+    def __init__(self, sensors_config: SensorsConfig):
+        self.sensors = sensors_config
+
+    def plan(
+        self,
+        as_of: datetime,
+        domains: Iterable[SensorType] | None = None,
+    ) -> FetchPlan:
+        """Build a fetch plan for the given domains (all domains by default)."""
+        fetches = {}
+        for sensor_type in (domains or SensorType):
+            cfg = getattr(self.sensors, sensor_type.value)
+            # For now: use first sensor. Future: aggregate multiple sensors.
+            sensor = cfg.sensors[0]
+            window_start = self.window_start(as_of, cfg.evidence)
+            sampled = window_start is None
+            fetches[sensor_type] = DomainFetch(
+                sensor_type=sensor_type,
+                sensor_id=sensor.id,
+                window_end=as_of,
+                window_start=window_start,
+                sample_limit=cfg.evidence.lookback_samples if sampled else None,
+                not_before=as_of - timedelta(seconds=cfg.evidence.max_age_seconds) if sampled else None,
+            )
+        return FetchPlan(as_of=as_of, domains=fetches)
+
+    def execute(
+        self,
+        plan: FetchPlan,
+        repository: SensorReadingRepository,
+        decode: ReadingDecode = ReadingDecode.STRICT,
+    ) -> dict[SensorType, list[DecodedReading]]:
+        """Run the plan's queries and return each domain's readings."""
+        readings: dict[SensorType, list[DecodedReading]] = {}
+
+        windowed = plan.windowed
+        if windowed:
+            grouped = repository.fetch_readings_multi(
+                sensors=plan.sensors,
+                window_start=plan.window_start,
+                window_end=plan.as_of,
+                decode=decode,
+            )
+            logger.debug(
+                f"Fetched {sum(len(rows) for rows in grouped.values())} readings for "
+                f"{len(windowed)} domains in one query"
+            )
+
+            # Rows are ordered by created, so each domain's window is a suffix.
+            for fetch in windowed:
+                rows = grouped[(fetch.sensor_type, fetch.sensor_id)]
+                readings[fetch.sensor_type] = self._slice(rows, fetch.window_start)  # type: ignore[arg-type]
+
+        for fetch in plan.sampled:
+            readings[fetch.sensor_type] = repository.fetch_latest_readings(
+                sensor_type=fetch.sensor_type,
+                sensor_id=fetch.sensor_id,
+                limit=fetch.sample_limit,  # type: ignore[arg-type]
+                as_of=fetch.window_end,
+                not_before=fetch.not_before,
+                decode=decode,
+            )
+
+        return readings
+
+    def execute_blocks(
+        self,
+        plan: FetchPlan,
+        repository: SensorReadingRepository,
+    ) -> dict[SensorType, ReadingBlock]:
+        """Columnar counterpart to execute(): one ReadingBlock per domain."""
+        blocks: dict[SensorType, ReadingBlock] = {}
+
+        windowed = plan.windowed
+        if windowed:
+            grouped = repository.fetch_blocks_multi(
+                sensors=plan.sensors,
+                window_start=plan.window_start,
+                window_end=plan.as_of,
+            )
+            for fetch in windowed:
+                block = grouped[(fetch.sensor_type, fetch.sensor_id)]
+                blocks[fetch.sensor_type] = block.since(fetch.window_start)  # type: ignore[arg-type]
+
+        for fetch in plan.sampled:
+            blocks[fetch.sensor_type] = repository.fetch_latest_block(
+                sensor_type=fetch.sensor_type,
+                sensor_id=fetch.sensor_id,
+                limit=fetch.sample_limit,  # type: ignore[arg-type]
+                as_of=fetch.window_end,
+                not_before=fetch.not_before,
+            )
+
+        return blocks
+
+    def window_start(self, as_of: datetime, evidence: EvidenceConfig) -> datetime | None:
+        """
+        Calculate window start based on evidence config.
+
+        For time-based lookback, subtracts the configured seconds.
+        Sample-based lookback has no time window and returns None.
+        """
+        if evidence.lookback_seconds is not None:
+            return as_of - timedelta(seconds=evidence.lookback_seconds)
+        return None
+
+    def _slice(
+        self,
+        rows: list[DecodedReading],
+        window_start: datetime,
+    ) -> list[DecodedReading]:
+        start = bisect_left(rows, window_start, key=lambda r: r.created)
+        return rows[start:]
@@ -0,0 +1,224 @@
+from datetime import datetime
+import logging
+from typing import Any, Iterable
+from peewee import chunked
+from .enums import (
+    HumidityLevel,
+    HumidityTrend,
+    SoilMoistureLevel,
+    SoilMoistureTrend,
+    TemperatureLevel,
+    TemperatureTrend,
+)
+from .models import ClimateState, LightState, SoilMoistureState
+from .schemas import (
+    ClimateStateSchema,
+    DerivedStateSnapshot,
+    LightStateSchema,
+    SoilMoistureStateSchema,
+)
+from .services.state import DomainState, PreviousStates
+from ..common.exc import RepositoryError
+from ..config.sensors import SensorsConfig
+from ..db.base import StateModel
+from ..db.sqlite_db import db
+from ..hardware.sensors.enums import SensorType
+
+logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 100
+
+STATE_TABLES: dict[SensorType, type[StateModel]] = {
+    SensorType.CLIMATE: ClimateState,
+    SensorType.LIGHT: LightState,
+    SensorType.SOIL_MOISTURE: SoilMoistureState,
+}
+
+
+class StateRepository:
+    """
+    Persists derived domain states and loads the latest ones back.
+
+    Each snapshot's domain states are stored against the domain's
+    configured sensor (the one the planner derives from), with created set
+    to the snapshot time. Many snapshots are written with one multi-row
+    INSERT per table and batch, in a single transaction.
+
+    LightState rows round-trip exactly, so previous_states() restores light
+    hysteresis after a restart from one indexed (sensor_id, created) lookup.
+    Climate and soil moisture schemas have no state_started_at; it is
+    stored as the time their level(s) last changed, carried forward from
+    the latest stored row.
+    """
+
+    def __init__(self, sensors_config: SensorsConfig):
+        self.sensor_ids = {
+            sensor_type: getattr(sensors_config, sensor_type.value).sensors[0].id
+            for sensor_type in SensorType
+        }
+        # Latest stored row per domain, to carry state_started_at forward.
+        self._latest: dict[SensorType, dict[str, Any] | None] = {}
+
+    def save_snapshot(self, snapshot: DerivedStateSnapshot) -> int:
+        return self.save_snapshots([snapshot])
+
+    def save_snapshots(self, snapshots: Iterable[DerivedStateSnapshot]) -> int:
+        """
+        Persist the domain states of many snapshots in time order, in a
+        single transaction. Domains that are None are skipped. Returns the
+        number of rows written.
+        """
+        snapshots = list(snapshots)
+        try:
+            latest = {sensor_type: self._latest_row(sensor_type) for sensor_type in SensorType}
+            rows: dict[SensorType, list[dict[str, Any]]] = {sensor_type: [] for sensor_type in SensorType}
+            for snapshot in snapshots:
+                for sensor_type in SensorType:
+                    state = getattr(snapshot, sensor_type.value)
+                    if state is None:
+                        continue
+                    row = self._to_row(sensor_type, state, snapshot.created, latest[sensor_type])
+                    rows[sensor_type].append(row)
+                    latest[sensor_type] = row
+
+            with db.atomic():
+                for sensor_type, table_rows in rows.items():
+                    for batch in chunked(table_rows, INSERT_BATCH_SIZE):
+                        STATE_TABLES[sensor_type].insert_many(batch).execute()
+        except Exception as e:
+            msg = f"Failed to save {len(snapshots)} derived state snapshots due to the following error: {e}"
+            logger.error(msg, exc_info=True)
+            raise RepositoryError(msg) from e
+
+        self._latest.update(latest)
+        return sum(len(table_rows) for table_rows in rows.values())
+
+    def fetch_latest_state(self, sensor_type: SensorType) -> DomainState | None:
+        """The newest stored state of a domain's configured sensor, or None."""
+        try:
+            row = self._latest_row(sensor_type)
+        except Exception as e:
+            msg = f"Failed to fetch latest {sensor_type.value} state due to the following error: {e}"
+            raise RepositoryError(msg) from e
+        return self._to_schema(sensor_type, row) if row is not None else None
+
+    def fetch_latest_snapshot(self) -> DerivedStateSnapshot | None:
+        """The newest stored state of every domain, or None if nothing is stored."""
+        try:
+            rows = {sensor_type: self._latest_row(sensor_type) for sensor_type in SensorType}
+        except Exception as e:
+            msg = f"Failed to fetch latest state snapshot due to the following error: {e}"
+            raise RepositoryError(msg) from e
+
+        created = [datetime.fromisoformat(str(row["created"])) for row in rows.values() if row is not None]
+        if not created:
+            return None
+        states = {
+            sensor_type: self._to_schema(sensor_type, row) if row is not None else None
+            for sensor_type, row in rows.items()
+        }
+        return DerivedStateSnapshot(
+            created=max(created),
+            climate=states[SensorType.CLIMATE],  # type: ignore[arg-type]
+            soil_moisture=states[SensorType.SOIL_MOISTURE],  # type: ignore[arg-type]
+            light=states[SensorType.LIGHT],  # type: ignore[arg-type]
+        )
+
+    def previous_states(self) -> PreviousStates:
+        """PreviousStates for the next derivation, from the latest stored light state."""
+        light = self.fetch_latest_state(SensorType.LIGHT)
+        if light is not None:
+            logger.info(f"Restored light state from {light.window_end} (on={light.is_light_on})")  # type: ignore[union-attr]
+        return PreviousStates(light=light)  # type: ignore[arg-type]
+
+    def _latest_row(self, sensor_type: SensorType) -> dict[str, Any] | None:
+        if sensor_type not in self._latest:
+            model = STATE_TABLES[sensor_type]
+            self._latest[sensor_type] = (
+                model.select()
+                .where(model.sensor_id == self.sensor_ids[sensor_type])
+                .order_by(model.created.desc(), model.id.desc())
+                .limit(1)
+                .dicts()
+                .first()
+            )
+        return self._latest[sensor_type]
+
+    def _to_row(
+        self,
+        sensor_type: SensorType,
+        state: DomainState,
+        created: datetime,
+        previous: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        row = {
+            "created": created,
+            "sensor_id": self.sensor_ids[sensor_type],
+            "window_start": state.window_start,
+            "window_end": state.window_end,
+            "sample_count": state.sample_count,
+            "confidence": state.confidence,
+        }
+
+        if isinstance(state, LightStateSchema):
+            row.update(
+                is_light_on=state.is_light_on,
+                intensity=state.intensity,
+                state_started_at=state.state_started_at,
+            )
+            return row
+
+        if isinstance(state, ClimateStateSchema):
+            row.update(
+                temperature_c=state.temperature_c,
+                humidity_rh=state.humidity_rh,
+                vpd_kpa=state.vpd_kpa,
+                temperature_level=state.temperature_level.value,
+                temperature_trend=state.temperature_trend.value,
+                humidity_level=state.humidity_level.value,
+                humidity_trend=state.humidity_trend.value,
+            )
+            levels = ("temperature_level", "humidity_level")
+        else:
+            row.update(
+                avg_moisture=state.avg_moisture,  # type: ignore[union-attr]
+                level=state.level.value,  # type: ignore[union-attr]
+                trend=state.trend.value,  # type: ignore[union-attr]
+            )
+            levels = ("level",)
+
+        unchanged = previous is not None and all(previous[field] == row[field] for field in levels)
+        row["state_started_at"] = previous["state_started_at"] if unchanged else state.window_end  # type: ignore[index]
+        return row
+
+    def _to_schema(self, sensor_type: SensorType, row: dict[str, Any]) -> DomainState:
+        window = {
+            "window_start": row["window_start"],
+            "window_end": row["window_end"],
+            "sample_count": row["sample_count"],
+            "confidence": row["confidence"],
+        }
+        if sensor_type == SensorType.LIGHT:
+            return LightStateSchema(
+                intensity=row["intensity"],
+                is_light_on=row["is_light_on"],
+                state_started_at=row["state_started_at"],
+                **window,
+            )
+        if sensor_type == SensorType.CLIMATE:
+            return ClimateStateSchema(
+                temperature_c=row["temperature_c"],
+                humidity_rh=row["humidity_rh"],
+                vpd_kpa=row["vpd_kpa"],
+                temperature_level=TemperatureLevel(row["temperature_level"]),
+                temperature_trend=TemperatureTrend(row["temperature_trend"]),
+                humidity_level=HumidityLevel(row["humidity_level"]),
+                humidity_trend=HumidityTrend(row["humidity_trend"]),
+                **window,
+            )
+        return SoilMoistureStateSchema(
+            avg_moisture=row["avg_moisture"],
+            level=SoilMoistureLevel(row["level"]),
+            trend=SoilMoistureTrend(row["trend"]),
+            **window,
+        )
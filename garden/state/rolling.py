@@ -0,0 +1,178 @@
+"""
+Rolling evidence windows for incremental state derivation.
+
+A RollingWindow is a bounded ring buffer of (created, value) samples for one
+sensor, covering either the last lookback_seconds or the last
+lookback_samples readings no older than max_age_seconds (mirroring
+EvidenceConfig). Adding a reading and
+evicting expired ones are O(1) amortized, and each subclass keeps the
+running aggregates its domain needs so a state can be derived without
+rescanning the window.
+"""
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Generic, TypeVar
+
+from .dto import EvidenceWindow
+
+V = TypeVar("V")
+
+
+class RollingWindow(Generic[V]):
+    """
+    Ring buffer of time-ordered samples with count, first and last in window.
+
+    Samples created before as_of - lookback are evicted by advance(), and
+    the buffer never holds more than `capacity` samples. Time-based windows
+    set lookback to their lookback_seconds; sample-based windows set
+    capacity to lookback_samples and lookback to max_age_seconds, so a
+    sensor that stops reporting empties its window. Without a lookback,
+    samples only leave when newer ones push them out.
+    """
+
+    def __init__(self, capacity: int, lookback_seconds: int | None = None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.lookback = timedelta(seconds=lookback_seconds) if lookback_seconds is not None else None
+        self._samples: deque[tuple[datetime, V]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @property
+    def first_created(self) -> datetime:
+        return self._samples[0][0]
+
+    @property
+    def last_created(self) -> datetime:
+        return self._samples[-1][0]
+
+    @property
+    def latest(self) -> V:
+        return self._samples[-1][1]
+
+    def add(self, created: datetime, value: V) -> bool:
+        """
+        Append a sample. Returns False (and keeps the window unchanged) if
+        the sample is older than the newest one already held.
+        """
+        if self._samples and created < self._samples[-1][0]:
+            return False
+        if len(self._samples) == self.capacity:
+            self._evict_oldest()
+        self._samples.append((created, value))
+        self._on_add(value)
+        return True
+
+    def advance(self, as_of: datetime) -> int:
+        """Evict samples that fell out of the lookback window; returns how many."""
+        if self.lookback is None:
+            return 0
+        cutoff = as_of - self.lookback
+        evicted = 0
+        while self._samples and self._samples[0][0] < cutoff:
+            self._evict_oldest()
+            evicted += 1
+        return evicted
+
+    def from_end(self, n: int) -> V | None:
+        """The value n samples from the end (1 = latest), or None if fewer are held."""
+        if len(self._samples) < n:
+            return None
+        return self._samples[-n][1]
+
+    def clear(self) -> None:
+        while self._samples:
+            self._evict_oldest()
+
+    def evidence_window(self) -> EvidenceWindow:
+        return EvidenceWindow(
+            window_start=self.first_created,
+            window_end=self.last_created,
+            sample_count=len(self._samples),
+        )
+
+    def _evict_oldest(self) -> None:
+        _, value = self._samples.popleft()
+        self._on_remove(value)
+
+    def _on_add(self, value: V) -> None:
+        pass
+
+    def _on_remove(self, value: V) -> None:
+        pass
+
+
+class ClimateWindow(RollingWindow[tuple[float, float]]):
+    """(temp, humidity) samples; trends only need the latest and N-th from end."""
+
+    def delta(self, field: int, n: int) -> float | None:
+        """Change in field (0 = temp, 1 = humidity) across the last n samples."""
+        start = self.from_end(n)
+        if start is None:
+            return None
+        return self.latest[field] - start[field]
+
+
+class AdcSumWindow(RollingWindow[int]):
+    """
+    Raw ADC samples clamped to [low, high] with an exact running sum.
+
+    Clamping the raw value is equivalent to clipping its normalized value
+    to [0, 1], and integer sums do not drift as samples are evicted.
+    """
+
+    def __init__(self, capacity: int, low: int, high: int, lookback_seconds: int | None = None):
+        super().__init__(capacity=capacity, lookback_seconds=lookback_seconds)
+        self.low = low
+        self.high = high
+        self.total = 0
+
+    def clamp(self, raw_adc: int) -> int:
+        return min(max(raw_adc, self.low), self.high)
+
+    def add(self, created: datetime, value: int) -> bool:
+        return super().add(created, self.clamp(value))
+
+    def _on_add(self, value: int) -> None:
+        self.total += value
+
+    def _on_remove(self, value: int) -> None:
+        self.total -= value
+
+
+class ThresholdRunWindow(RollingWindow[float]):
+    """
+    Normalized samples with the length of the trailing runs at/above
+    high_threshold and at/below low_threshold, for on/off hysteresis.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        high_threshold: float,
+        low_threshold: float,
+        lookback_seconds: int | None = None,
+    ):
+        super().__init__(capacity=capacity, lookback_seconds=lookback_seconds)
+        self.high_threshold = high_threshold
+        self.low_threshold = low_threshold
+        self.high_run = 0
+        self.low_run = 0
+
+    def thresholds(self, n: int) -> tuple[bool, bool] | None:
+        """Whether the last n samples were all high / all low; None if fewer than n."""
+        if len(self) < n:
+            return None
+        return self.high_run >= n, self.low_run >= n
+
+    def _on_add(self, value: float) -> None:
+        self.high_run = self.high_run + 1 if value >= self.high_threshold else 0
+        self.low_run = self.low_run + 1 if value <= self.low_threshold else 0
+
+    def _on_remove(self, value: float) -> None:
+        # Runs count trailing samples, so they can never exceed what is held.
+        self.high_run = min(self.high_run, len(self))
+        self.low_run = min(self.low_run, len(self))
@@ -2,6 +2,10 @@ from .state import StateService, PreviousStates
 from .climate import ClimateStateService
 from .soil_moisture import SoilMoistureStateService
 from .light import LightStateService
+from .incremental import IncrementalStateEngine
+from .evaluation import EvaluationScheduler
+from .replay import StateReplayEngine
+from .cache import SnapshotCache
 
 __all__ = [
     "StateService",
@@ -9,4 +13,8 @@ __all__ = [
     "ClimateStateService",
     "SoilMoistureStateService",
     "LightStateService",
+    "IncrementalStateEngine",
+    "EvaluationScheduler",
+    "StateReplayEngine",
+    "SnapshotCache",
 ]
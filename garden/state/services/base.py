@@ -6,6 +6,7 @@ from ...config.policies import PoliciesConfig
 from ...hardware.sensors.schemas import SensorPayload
 from ...hardware.sensors.schemas import SensorReadingSchema
 from ...hardware.sensors.dto import ParsedSensorReading
+from ...hardware.sensors.block import ReadingBlock
 from ..dto import EvidenceWindow
 from ..exc import StateServiceException
 
@@ -39,6 +40,13 @@ class BaseStateService(ABC):
             sample_count=len(sensor_readings),
         )
 
+    def block_evidence_window(self, block: ReadingBlock) -> EvidenceWindow:
+        return EvidenceWindow(
+            window_start=block.first_created,
+            window_end=block.last_created,
+            sample_count=len(block),
+        )
+
     def parse_sensor_readings(
             self,
             sensor_readings: list[SensorReadingSchema],
@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import logging
+
+from ..schemas import DerivedStateSnapshot
+from .state import PreviousStates, StateService
+from ...hardware.sensors.dto import LatestReadingId
+from ...hardware.sensors.enums import SensorType
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long one derived snapshot is reused, even if nothing
+# changes and no evidence window expires.
+DEFAULT_BUCKET_SECONDS = 3600
+
+
+@dataclass
+class SnapshotCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Why misses happened (first calls and a changed previous count in neither).
+    changed: int = 0    # a sensor has a new newest reading
+    expired: int = 0    # a reading left an evidence window, or the bucket ended
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    as_of: datetime
+    bucket: int
+    latest: dict[tuple[SensorType, str], LatestReadingId | None]
+    previous: PreviousStates
+    snapshot: DerivedStateSnapshot
+    expires_at: datetime | None
+
+
+class SnapshotCache:
+    """
+    Memoizes StateService.derive_snapshot() while no reading changes.
+
+    Before deriving, the newest reading (id, created) of every configured
+    sensor is read with one indexed query. The last snapshot is reused,
+    with created set to the new as_of, when:
+
+    - every sensor's newest reading is unchanged,
+    - as_of is in the same bucket (bucket_seconds) and not earlier than the
+      cached as_of,
+    - previous is the same, and
+    - no reading has left an evidence window yet. The entry expires once
+      as_of passes the oldest windowed reading's created plus its lookback
+      (max_age_seconds for sample-count windows, which otherwise only
+      change with new readings).
+
+    Under these rules a hit is exactly what derive_snapshot() would return.
+    A snapshot is only cached when no sensor has readings newer than its
+    as_of, because later calls could otherwise see them without any id
+    changing. Readings inserted with a created older than their sensor's
+    newest reading (e.g. a backfill) are not detected; call invalidate().
+    """
+
+    def __init__(self, state_service: StateService, bucket_seconds: int = DEFAULT_BUCKET_SECONDS):
+        if bucket_seconds < 1:
+            raise ValueError("bucket_seconds must be >= 1")
+        self.state_service = state_service
+        self.bucket_seconds = bucket_seconds
+        self.stats = SnapshotCacheStats()
+        self._entry: _CacheEntry | None = None
+
+    @property
+    def expires_at(self) -> datetime | None:
+        """When the cached snapshot's evidence windows start to change, if one is cached."""
+        return self._entry.expires_at if self._entry else None
+
+    def derive_snapshot(
+        self,
+        as_of: datetime | None = None,
+        previous: PreviousStates | None = None,
+    ) -> DerivedStateSnapshot:
+        """Same contract as StateService.derive_snapshot()."""
+        now = as_of or datetime.now(timezone.utc)
+        previous = previous or PreviousStates()
+
+        plan = self.state_service.planner.plan(now)
+        sensors = [(fetch.sensor_type, fetch.sensor_id) for fetch in plan.domains.values()]
+        not_before = {
+            (fetch.sensor_type, fetch.sensor_id): fetch.not_before
+            for fetch in plan.sampled if fetch.not_before is not None
+        }
+        latest = self.state_service.repository.fetch_latest_ids(sensors, not_before)
+        bucket = int(now.timestamp() // self.bucket_seconds)
+
+        entry = self._entry
+        if entry is not None:
+            if entry.latest != latest:
+                self.stats.changed += 1
+            elif (
+                entry.bucket != bucket
+                or now < entry.as_of
+                or (entry.expires_at is not None and now > entry.expires_at)
+            ):
+                self.stats.expired += 1
+            elif entry.previous == previous:
+                self.stats.hits += 1
+                return entry.snapshot.model_copy(update={"created": now})
+
+        self.stats.misses += 1
+        snapshot = self.state_service.derive_snapshot(now, previous)
+
+        if all(reading is None or reading.created <= now for reading in latest.values()):
+            self._entry = _CacheEntry(
+                as_of=now,
+                bucket=bucket,
+                latest=latest,
+                previous=previous,
+                snapshot=snapshot,
+                expires_at=self._expires_at(snapshot),
+            )
+        else:
+            self._entry = None
+        return snapshot
+
+    def invalidate(self) -> None:
+        self._entry = None
+
+    def _expires_at(self, snapshot: DerivedStateSnapshot) -> datetime | None:
+        """
+        The last as_of at which every window still holds the same readings:
+        a window holds readings created at or after as_of - lookback (or
+        as_of - max_age for sample-count windows), so its oldest reading
+        drops out after that.
+        """
+        expiries = []
+        for sensor_type in SensorType:
+            state = getattr(snapshot, sensor_type.value)
+            evidence = getattr(self.state_service.sensors, sensor_type.value).evidence
+            lookback = evidence.lookback_seconds if evidence.lookback_seconds is not None else evidence.max_age_seconds
+            if state is not None:
+                expiries.append(state.window_start + timedelta(seconds=lookback))
+        return min(expiries) if expiries else None
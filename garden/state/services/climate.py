@@ -8,7 +8,10 @@ from ..enums import (
     HumidityLevel,
     HumidityTrend,
 )
+from ..vectorized import tail_delta
 from ...hardware.sensors.dto import ClimateReading
+from ..rolling import ClimateWindow
+from ...hardware.sensors.block import ReadingBlock
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +55,71 @@ class ClimateStateService(BaseStateService):
             **window,
         )
 
+    def derive_state_block(self, block: ReadingBlock) -> ClimateStateSchema:
+        """Columnar counterpart to derive_state(); same result for the same readings."""
+        if not len(block):
+            msg = f"{self.__class__.__name__} received 0 sensor readings"
+            logger.error(msg)
+            raise StateServiceException(msg)
+
+        window = self.block_evidence_window(block)
+
+        confidence = self.confidence_score(
+            window=window,
+            min_samples=self.policies.climate.interpretation.temperature.hysteresis.min_samples,
+        )
+
+        temps = block["temp"]
+        humidities = block["humidity"]
+        latest_temp = float(temps[-1])
+        latest_humidity = float(humidities[-1])
+
+        temperature_n = self.policies.climate.interpretation.temperature.hysteresis.min_samples
+        humidity_n = self.policies.climate.interpretation.humidity.hysteresis.min_samples
+
+        return ClimateStateSchema(
+            temperature_c=latest_temp,
+            humidity_rh=latest_humidity,
+            vpd_kpa=None,
+            temperature_level=self._temperature_level(latest_temp),
+            temperature_trend=self._classify_temperature_delta(tail_delta(temps, temperature_n)),
+            humidity_level=self._humidity_level(latest_humidity),
+            humidity_trend=self._classify_humidity_delta(tail_delta(humidities, humidity_n)),
+            confidence=confidence,
+            **window,
+        )
+
+    def derive_state_rolling(self, window: ClimateWindow) -> ClimateStateSchema:
+        """Incremental counterpart to derive_state(); same result for the same readings."""
+        if not len(window):
+            msg = f"{self.__class__.__name__} received 0 sensor readings"
+            logger.error(msg)
+            raise StateServiceException(msg)
+
+        evidence = window.evidence_window()
+
+        confidence = self.confidence_score(
+            window=evidence,
+            min_samples=self.policies.climate.interpretation.temperature.hysteresis.min_samples,
+        )
+
+        latest_temp, latest_humidity = window.latest
+
+        temperature_n = self.policies.climate.interpretation.temperature.hysteresis.min_samples
+        humidity_n = self.policies.climate.interpretation.humidity.hysteresis.min_samples
+
+        return ClimateStateSchema(
+            temperature_c=latest_temp,
+            humidity_rh=latest_humidity,
+            vpd_kpa=None,
+            temperature_level=self._temperature_level(latest_temp),
+            temperature_trend=self._classify_temperature_delta(window.delta(0, temperature_n)),
+            humidity_level=self._humidity_level(latest_humidity),
+            humidity_trend=self._classify_humidity_delta(window.delta(1, humidity_n)),
+            confidence=confidence,
+            **evidence,
+        )
+
     def _temperature_level(self, value_c: float) -> TemperatureLevel:
         cfg = self.policies.climate.interpretation.temperature.acceptable
         if value_c < cfg.min_c:
@@ -77,7 +145,12 @@ class ClimateStateService(BaseStateService):
             return TemperatureTrend.STABLE
 
         values = [r.payload.temp for r in sensor_readings[-N:]]
-        delta = values[-1] - values[0]
+        return self._classify_temperature_delta(values[-1] - values[0])
+
+    def _classify_temperature_delta(self, delta: float | None) -> TemperatureTrend:
+        if delta is None:
+            return TemperatureTrend.STABLE
+
         min_delta = self.policies.climate.interpretation.trends.min_delta.temperature_c
 
         if delta >= min_delta:
@@ -95,7 +168,12 @@ class ClimateStateService(BaseStateService):
             return HumidityTrend.STABLE
 
         values = [r.payload.humidity for r in sensor_readings[-N:]]
-        delta = values[-1] - values[0]
+        return self._classify_humidity_delta(values[-1] - values[0])
+
+    def _classify_humidity_delta(self, delta: float | None) -> HumidityTrend:
+        if delta is None:
+            return HumidityTrend.STABLE
+
         min_delta = self.policies.climate.interpretation.trends.min_delta.humidity_percent
 
         if delta >= min_delta:
@@ -0,0 +1,201 @@
+from datetime import datetime, timezone
+import logging
+from typing import Iterable
+
+from ..rolling import AdcSumWindow, ClimateWindow, RollingWindow, ThresholdRunWindow
+from ..schemas import DerivedStateSnapshot
+from ..planner import SnapshotFetchPlanner
+from .climate import ClimateStateService
+from .light import LightStateService
+from .soil_moisture import SoilMoistureStateService
+from .state import PreviousStates
+from ...config.sensors import SensorsConfig
+from ...config.policies import PoliciesConfig
+from ...hardware.sensors.dto import PAYLOAD_VALUES, ReadingRecord
+from ...hardware.sensors.enums import SensorType, ReadingDecode
+from ...hardware.sensors.repository import DecodedReading, SensorReadingRepository
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on samples held for a time-based window. It only matters for
+# sensors sampled faster than capacity / lookback_seconds.
+DEFAULT_WINDOW_CAPACITY = 100_000
+
+
+class IncrementalStateEngine:
+    """
+    In-memory counterpart to StateService that updates per reading.
+
+    Each domain's configured sensor gets a RollingWindow sized to its
+    evidence config, with the running aggregates that domain needs (exact
+    ADC sum for soil moisture, trailing threshold runs for light). add()
+    costs O(1) and derive_snapshot() costs O(1) plus the evictions since the
+    previous call, instead of re-reading the whole evidence window.
+
+    Snapshots match StateService.derive_snapshot() for the same readings,
+    except avg_moisture, which may differ in the last bit (see
+    SoilMoistureStateService.derive_state_rolling).
+
+    Readings must arrive in time order per sensor and derive_snapshot()
+    must not be asked for a time earlier than readings already added;
+    out-of-order readings are dropped. Call seed() on cold start.
+    """
+
+    def __init__(
+        self,
+        sensors_config: SensorsConfig,
+        policies_config: PoliciesConfig,
+        capacity: int = DEFAULT_WINDOW_CAPACITY,
+    ):
+        self.sensors = sensors_config
+        self.policies = policies_config
+        self.planner = SnapshotFetchPlanner(sensors_config)
+
+        self._climate = ClimateStateService(policies_config)
+        self._soil_moisture = SoilMoistureStateService(policies_config)
+        self._light = LightStateService(policies_config)
+
+        self._sensor_ids: dict[SensorType, str] = {}
+        self._windows: dict[SensorType, RollingWindow] = {}
+        for sensor_type in SensorType:
+            cfg = getattr(sensors_config, sensor_type.value)
+            # Same sensor the planner picks for StateService.
+            self._sensor_ids[sensor_type] = cfg.sensors[0].id
+            lookback_seconds = cfg.evidence.lookback_seconds
+            if lookback_seconds is None:
+                # Sample-based: drop readings past the max age, as the planner does.
+                lookback_seconds = cfg.evidence.max_age_seconds
+            self._windows[sensor_type] = self._build_window(
+                sensor_type,
+                capacity=cfg.evidence.lookback_samples or capacity,
+                lookback_seconds=lookback_seconds,
+            )
+
+    def seed(
+        self,
+        repository: SensorReadingRepository,
+        as_of: datetime | None = None,
+    ) -> int:
+        """
+        Replace the windows' contents with each domain's evidence window as
+        of the given time (default now), read in a single planned fetch.
+        Returns the number of readings loaded.
+        """
+        now = as_of or datetime.now(timezone.utc)
+        plan = self.planner.plan(now)
+        readings = self.planner.execute(plan, repository, decode=ReadingDecode.FAST)
+
+        for window in self._windows.values():
+            window.clear()
+
+        count = self.add_many(r for rows in readings.values() for r in rows)
+        logger.info(f"Seeded incremental state engine with {count} readings as of {now}")
+        return count
+
+    def add(self, reading: DecodedReading) -> bool:
+        """
+        Add one reading. Returns False if it is not from a tracked sensor or
+        is older than the newest reading already held for that sensor.
+        """
+        sensor_type = reading.sensor_type
+        if self._sensor_ids.get(sensor_type) != reading.sensor_id:
+            return False
+
+        if not isinstance(reading, ReadingRecord):
+            values_type = PAYLOAD_VALUES[sensor_type]
+            payload = values_type(*(reading.payload[field] for field in values_type._fields))
+            reading = ReadingRecord(
+                created=reading.created,
+                sensor_type=sensor_type,
+                sensor_id=reading.sensor_id,
+                payload=payload,
+            )
+
+        window = self._windows[sensor_type]
+        if sensor_type == SensorType.CLIMATE:
+            added = window.add(reading.created, (reading.payload.temp, reading.payload.humidity))
+        elif sensor_type == SensorType.LIGHT:
+            added = window.add(reading.created, self._light._intensity(reading))  # type: ignore[arg-type]
+        else:
+            added = window.add(reading.created, reading.payload.raw_adc)
+
+        if not added:
+            logger.warning(
+                f"Dropped out-of-order {sensor_type.value} reading from {reading.sensor_id} "
+                f"at {reading.created} (newest held: {window.last_created})"
+            )
+        return added
+
+    def add_many(self, readings: Iterable[DecodedReading]) -> int:
+        """Add readings in order; returns how many were accepted."""
+        return sum(self.add(reading) for reading in readings)
+
+    def derive_snapshot(
+        self,
+        as_of: datetime | None = None,
+        previous: PreviousStates | None = None,
+    ) -> DerivedStateSnapshot:
+        """
+        Derive a complete state snapshot as of a given time from the held
+        windows, evicting readings that fell out of the lookback first.
+
+        Args:
+            as_of: The reference time for the snapshot. Defaults to now (UTC).
+            previous: Previous states needed for hysteresis (e.g., light on/off).
+        """
+        now = as_of or datetime.now(timezone.utc)
+        previous = previous or PreviousStates()
+
+        for window in self._windows.values():
+            window.advance(now)
+
+        climate = None
+        if self._has_readings(SensorType.CLIMATE):
+            climate = self._climate.derive_state_rolling(self._windows[SensorType.CLIMATE])  # type: ignore[arg-type]
+
+        soil_moisture = None
+        if self._has_readings(SensorType.SOIL_MOISTURE):
+            soil_moisture = self._soil_moisture.derive_state_rolling(
+                self._windows[SensorType.SOIL_MOISTURE],  # type: ignore[arg-type]
+            )
+
+        light = None
+        if self._has_readings(SensorType.LIGHT):
+            light = self._light.derive_state_rolling(
+                self._windows[SensorType.LIGHT],  # type: ignore[arg-type]
+                previous.light,
+            )
+
+        return DerivedStateSnapshot(
+            created=now,
+            climate=climate,
+            soil_moisture=soil_moisture,
+            light=light,
+        )
+
+    def _has_readings(self, sensor_type: SensorType) -> bool:
+        if len(self._windows[sensor_type]):
+            return True
+        logger.warning(f"No {sensor_type.value} readings held for {self._sensor_ids[sensor_type]}")
+        return False
+
+    def _build_window(
+        self,
+        sensor_type: SensorType,
+        capacity: int,
+        lookback_seconds: int | None,
+    ) -> RollingWindow:
+        if sensor_type == SensorType.CLIMATE:
+            return ClimateWindow(capacity=capacity, lookback_seconds=lookback_seconds)
+
+        if sensor_type == SensorType.SOIL_MOISTURE:
+            adc = self.policies.soil_moisture.calibration.adc
+            return AdcSumWindow(capacity=capacity, low=adc.wet, high=adc.dry, lookback_seconds=lookback_seconds)
+
+        on_off = self.policies.light.interpretation.on_off
+        return ThresholdRunWindow(
+            capacity=capacity,
+            high_threshold=on_off.on_threshold,
+            low_threshold=on_off.off_threshold,
+            lookback_seconds=lookback_seconds,
+        )
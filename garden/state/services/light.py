@@ -3,7 +3,10 @@ import logging
 from .base import BaseStateService
 from ..exc import StateServiceException
 from ..schemas import LightStateSchema
+from ..vectorized import normalize_rising, tail_thresholds
 from ...hardware.sensors.dto import LightReading
+from ..rolling import ThresholdRunWindow
+from ...hardware.sensors.block import ReadingBlock
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +44,78 @@ class LightStateService(BaseStateService):
             **window,
         )
 
+    def derive_state_block(
+            self,
+            block: ReadingBlock,
+            previous_state: LightStateSchema | None,
+    ) -> LightStateSchema:
+        """Columnar counterpart to derive_state(); same result for the same readings."""
+        if not len(block):
+            msg = f"{self.__class__.__name__} received 0 sensor readings"
+            logger.error(msg)
+            raise StateServiceException(msg)
+
+        window = self.block_evidence_window(block)
+        confidence = self.confidence_score(
+            window=window,
+            min_samples=self.policies.light.interpretation.on_off.min_samples,
+        )
+
+        cfg = self.policies.light.interpretation.on_off
+        adc = self.policies.light.calibration.adc
+        intensities = normalize_rising(block["raw_adc"], low=adc.dark, high=adc.bright)
+
+        is_light_on = self._resolve_light_on(
+            tail_thresholds(intensities, cfg.min_samples, cfg.on_threshold, cfg.off_threshold),
+            previous_state=previous_state,
+        )
+        state_started_at = self._state_started_at(
+            is_light_on=is_light_on,
+            previous_state=previous_state,
+            window_end=window["window_end"]
+        )
+        return LightStateSchema(
+            intensity=float(intensities[-1]),
+            is_light_on=is_light_on,
+            state_started_at=state_started_at,
+            confidence=confidence,
+            **window,
+        )
+
+    def derive_state_rolling(
+            self,
+            window: ThresholdRunWindow,
+            previous_state: LightStateSchema | None,
+    ) -> LightStateSchema:
+        """Incremental counterpart to derive_state(); same result for the same readings."""
+        if not len(window):
+            msg = f"{self.__class__.__name__} received 0 sensor readings"
+            logger.error(msg)
+            raise StateServiceException(msg)
+
+        evidence = window.evidence_window()
+        confidence = self.confidence_score(
+            window=evidence,
+            min_samples=self.policies.light.interpretation.on_off.min_samples,
+        )
+
+        is_light_on = self._resolve_light_on(
+            window.thresholds(self.policies.light.interpretation.on_off.min_samples),
+            previous_state=previous_state,
+        )
+        state_started_at = self._state_started_at(
+            is_light_on=is_light_on,
+            previous_state=previous_state,
+            window_end=evidence["window_end"]
+        )
+        return LightStateSchema(
+            intensity=window.latest,
+            is_light_on=is_light_on,
+            state_started_at=state_started_at,
+            confidence=confidence,
+            **evidence,
+        )
+
     def _intensity(self, latest: LightReading) -> float:
         raw_adc = latest.payload.raw_adc
         bright = self.policies.light.calibration.adc.bright
@@ -58,7 +133,7 @@ class LightStateService(BaseStateService):
         N = cfg.min_samples
 
         if len(sensor_readings) < N:
-            return previous_state.is_light_on if previous_state else False
+            return self._resolve_light_on(None, previous_state)
 
         values = [
             self._intensity(obs)
@@ -68,6 +143,22 @@ class LightStateService(BaseStateService):
         all_high = all(v >= cfg.on_threshold for v in values)
         all_low  = all(v <= cfg.off_threshold for v in values)
 
+        return self._resolve_light_on((all_high, all_low), previous_state)
+
+    def _resolve_light_on(
+        self,
+        thresholds: tuple[bool, bool] | None,
+        previous_state: LightStateSchema | None,
+    ) -> bool:
+        """
+        Apply on/off hysteresis given whether the last N intensities were all
+        high and all low (None when there were fewer than N readings).
+        """
+        if thresholds is None:
+            return previous_state.is_light_on if previous_state else False
+
+        all_high, all_low = thresholds
+
         if previous_state is None:
             # bootstrap conservatively
             return all_high
@@ -0,0 +1,257 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import gzip
+from itertools import repeat
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from ..schemas import DerivedStateSnapshot
+from ..planner import DomainFetch, SnapshotFetchPlanner
+from .climate import ClimateStateService
+from .light import LightStateService
+from .soil_moisture import SoilMoistureStateService
+from .state import DomainState, PreviousStates
+from ...common.serialization import dump_model
+from ...config.sensors import SensorsConfig
+from ...config.policies import PoliciesConfig
+from ...db.sqlite_db import db
+from ...hardware.sensors.block import ReadingBlock, to_epoch_micros
+from ...hardware.sensors.enums import SensorType
+from ...hardware.sensors.repository import SensorReadingRepository
+from ...hardware.sensors.storage import build_reading_repository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_TICKS = 2_000
+
+# Domains whose state depends on the previous tick's (light hysteresis).
+# They are replayed in order in the calling process; the rest are
+# independent per tick and are split across the worker pool.
+CHAINED_DOMAINS = (SensorType.LIGHT,)
+
+
+class StateReplayEngine:
+    """
+    Recomputes the DerivedStateSnapshot at every tick of a past time range.
+
+    Calling StateService.derive_snapshot() once per tick re-queries and
+    re-parses each overlapping evidence window. The replay engine splits the
+    ticks into chunks and, per chunk and domain, fetches one ReadingBlock
+    covering every tick's window. All window boundaries are then located in
+    one vectorized searchsorted over the block, and each tick is derived
+    with derive_state_block() on a zero-copy view.
+
+    Snapshots equal derive_snapshot(as_of=tick, previous=...) for every
+    tick, with each tick's previous light state being the one replayed for
+    the tick before (see replay()).
+
+    With workers > 1, chunks of the independent domains are derived in a
+    process pool; each worker opens its own connection to the same database
+    file. Light, whose hysteresis chains every tick to the previous one, is
+    replayed in this process while the workers run; its evidence is a few
+    samples per tick.
+    """
+
+    def __init__(
+        self,
+        sensors_config: SensorsConfig,
+        policies_config: PoliciesConfig,
+        workers: int = 1,
+        chunk_ticks: int = DEFAULT_CHUNK_TICKS,
+        repository: SensorReadingRepository | None = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if chunk_ticks < 1:
+            raise ValueError("chunk_ticks must be >= 1")
+
+        self.sensors = sensors_config
+        self.policies = policies_config
+        self.workers = workers
+        self.chunk_ticks = chunk_ticks
+        self.repository = repository or build_reading_repository(sensors_config.storage)
+        self.planner = SnapshotFetchPlanner(sensors_config)
+
+        self._climate = ClimateStateService(policies_config)
+        self._soil_moisture = SoilMoistureStateService(policies_config)
+        self._light = LightStateService(policies_config)
+
+    def ticks(self, start: datetime, end: datetime, interval_seconds: int) -> list[datetime]:
+        """Every tick from start to end inclusive, interval_seconds apart."""
+        step = timedelta(seconds=interval_seconds)
+        count = int((end - start) // step) + 1 if end >= start else 0
+        return [start + i * step for i in range(count)]
+
+    def replay(
+        self,
+        ticks: list[datetime],
+        previous: PreviousStates | None = None,
+    ) -> Iterator[DerivedStateSnapshot]:
+        """
+        Yield the snapshot at each tick, in order.
+
+        previous is used for the first tick; every later tick gets the
+        light state replayed for the tick before it, as a caller looping
+        over derive_snapshot() would pass.
+        """
+        previous = previous or PreviousStates()
+        chunks = [ticks[i:i + self.chunk_ticks] for i in range(0, len(ticks), self.chunk_ticks)]
+        independent = [sensor_type for sensor_type in SensorType if sensor_type not in CHAINED_DOMAINS]
+
+        if self.workers == 1 or len(chunks) == 1:
+            parts: Iterable[list[dict[SensorType, DomainState | None]]] = (
+                self.replay_domains(chunk, independent) for chunk in chunks
+            )
+            yield from self._assemble(chunks, parts, previous)
+            return
+
+        if db.database == ":memory:":
+            raise ValueError("Replay workers need a database file; use workers=1 for in-memory databases")
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(db.database, db._pragmas, self.sensors, self.policies),
+        ) as pool:
+            # map() submits every chunk up front; chained domains are
+            # replayed here while the workers run.
+            parts = pool.map(_replay_chunk, chunks, repeat(independent))
+            yield from self._assemble(chunks, parts, previous)
+
+    def replay_domains(
+        self,
+        ticks: list[datetime],
+        domains: Iterable[SensorType],
+        previous: PreviousStates | None = None,
+    ) -> list[dict[SensorType, DomainState | None]]:
+        """
+        The given domains' states at each tick, from one block fetch per
+        domain. Chained domains get each tick's state as the next tick's
+        previous state, starting from previous.
+        """
+        if not ticks:
+            return []
+
+        tick_micros = np.fromiter((to_epoch_micros(tick) for tick in ticks), dtype=np.int64, count=len(ticks))
+        plan = self.planner.plan(ticks[0], domains)
+        states: list[dict[SensorType, DomainState | None]] = [{} for _ in ticks]
+
+        for sensor_type, fetch in plan.domains.items():
+            block, bounds = self._windows(fetch, ticks, tick_micros)
+            light = previous.light if previous else None
+            for i, (lo, hi) in enumerate(bounds):
+                state: DomainState | None = None
+                if hi > lo:
+                    window = block.slice(lo, hi)
+                    if sensor_type == SensorType.CLIMATE:
+                        state = self._climate.derive_state_block(window)
+                    elif sensor_type == SensorType.SOIL_MOISTURE:
+                        state = self._soil_moisture.derive_state_block(window)
+                    else:
+                        state = self._light.derive_state_block(window, previous_state=light)
+                if sensor_type == SensorType.LIGHT:
+                    light = state  # type: ignore[assignment]
+                states[i][sensor_type] = state
+
+        return states
+
+    def write(self, snapshots: Iterable[DerivedStateSnapshot], path: Path, batch_size: int = 1_000) -> int:
+        """Write snapshots as gzip JSON Lines, batch_size lines per write. Returns the count."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        batch: list[bytes] = []
+        with gzip.open(path, "wb") as f:
+            for snapshot in snapshots:
+                batch.append(dump_model(snapshot) + b"\n")
+                if len(batch) >= batch_size:
+                    f.writelines(batch)
+                    count += len(batch)
+                    batch = []
+            f.writelines(batch)
+            count += len(batch)
+        logger.info(f"Wrote {count} replayed snapshots to {path}")
+        return count
+
+    def _assemble(
+        self,
+        chunks: list[list[datetime]],
+        parts: Iterable[list[dict[SensorType, DomainState | None]]],
+        previous: PreviousStates,
+    ) -> Iterator[DerivedStateSnapshot]:
+        for chunk, independent in zip(chunks, parts):
+            chained = self.replay_domains(chunk, CHAINED_DOMAINS, previous)
+            for tick, states, chained_states in zip(chunk, independent, chained):
+                states.update(chained_states)
+                yield DerivedStateSnapshot(
+                    created=tick,
+                    climate=states[SensorType.CLIMATE],  # type: ignore[arg-type]
+                    soil_moisture=states[SensorType.SOIL_MOISTURE],  # type: ignore[arg-type]
+                    light=states[SensorType.LIGHT],  # type: ignore[arg-type]
+                )
+            last = chained[-1].get(SensorType.LIGHT)
+            previous = PreviousStates(light=last)  # type: ignore[arg-type]
+            logger.debug(f"Replayed {len(chunk)} ticks up to {chunk[-1]}")
+
+    def _windows(
+        self,
+        fetch: DomainFetch,
+        ticks: list[datetime],
+        tick_micros: np.ndarray,
+    ) -> tuple[ReadingBlock, Any]:
+        """
+        One block holding every tick's evidence window, and each tick's
+        [lo, hi) rows in it. Windows match the repository's queries:
+        window_start <= created <= as_of, or the newest sample_limit
+        readings in [as_of - max_age, as_of].
+        """
+        first, last = ticks[0], ticks[-1]
+        if fetch.sample_limit is not None:
+            max_age = first - fetch.not_before  # type: ignore[operator]
+            head = self.repository.fetch_latest_block(
+                fetch.sensor_type, fetch.sensor_id, limit=fetch.sample_limit, as_of=first, not_before=fetch.not_before,
+            )
+            rest = self.repository.fetch_block(fetch.sensor_type, fetch.sensor_id, first, last)
+            # Both include readings created exactly at the first tick.
+            rest = rest.slice(int(np.searchsorted(rest.timestamps, tick_micros[0], side="right")))
+            block = ReadingBlock.concat(head, rest)
+            hi = np.searchsorted(block.timestamps, tick_micros, side="right")
+            oldest = np.fromiter(
+                (to_epoch_micros(tick - max_age) for tick in ticks), dtype=np.int64, count=len(ticks),
+            )
+            lo = np.maximum(hi - fetch.sample_limit, np.searchsorted(block.timestamps, oldest, side="left"))
+        else:
+            lookback = first - fetch.window_start  # type: ignore[operator]
+            block = self.repository.fetch_block(fetch.sensor_type, fetch.sensor_id, first - lookback, last)
+            starts = np.fromiter(
+                (to_epoch_micros(tick - lookback) for tick in ticks), dtype=np.int64, count=len(ticks),
+            )
+            lo = np.searchsorted(block.timestamps, starts, side="left")
+            hi = np.searchsorted(block.timestamps, tick_micros, side="right")
+        return block, zip(lo.tolist(), hi.tolist())
+
+
+_worker_engine: StateReplayEngine | None = None
+
+
+def _init_worker(
+    database: str,
+    pragmas: Any,
+    sensors_config: SensorsConfig,
+    policies_config: PoliciesConfig,
+) -> None:
+    global _worker_engine
+    db.init(database, pragmas=pragmas)
+    _worker_engine = StateReplayEngine(sensors_config, policies_config)
+
+
+def _replay_chunk(
+    ticks: list[datetime],
+    domains: list[SensorType],
+) -> list[dict[SensorType, DomainState | None]]:
+    return _worker_engine.replay_domains(ticks, domains)  # type: ignore[union-attr]
@@ -3,7 +3,10 @@ from .base import BaseStateService
 from ..schemas import SoilMoistureStateSchema
 from ..exc import StateServiceException
 from ..enums import SoilMoistureLevel, SoilMoistureTrend
+from ..vectorized import normalize_falling, sequential_mean, tail_delta
 from ...hardware.sensors.dto import SoilMoistureReading
+from ..rolling import AdcSumWindow
+from ...hardware.sensors.block import ReadingBlock
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +42,70 @@ class SoilMoistureStateService(BaseStateService):
             **window,
         )
 
+    def derive_state_block(self, block: ReadingBlock) -> SoilMoistureStateSchema:
+        """Columnar counterpart to derive_state(); same result for the same readings."""
+        if not len(block):
+            msg = f"{self.__class__.__name__} received 0 sensor readings"
+            logger.error(msg)
+            raise StateServiceException(msg)
+
+        window = self.block_evidence_window(block)
+
+        confidence = self.confidence_score(
+            window=window,
+            min_samples=self.policies.soil_moisture.interpretation.level.min_samples,
+        )
+
+        adc = self.policies.soil_moisture.calibration.adc
+        moisture = normalize_falling(block["raw_adc"], high=adc.dry, low=adc.wet)
+        avg_moisture = sequential_mean(moisture)
+        N = self.policies.soil_moisture.interpretation.trend.lookback_samples
+
+        return SoilMoistureStateSchema(
+            avg_moisture=avg_moisture,
+            level=self._level(avg_moisture),
+            trend=self._classify_delta(tail_delta(moisture, N)),
+            confidence=confidence,
+            **window,
+        )
+
+    def derive_state_rolling(self, window: AdcSumWindow) -> SoilMoistureStateSchema:
+        """
+        Incremental counterpart to derive_state().
+
+        The average comes from the window's exact ADC sum, so it may differ
+        from derive_state() in the last bit (which sums rounded floats).
+        """
+        if not len(window):
+            msg = f"{self.__class__.__name__} received 0 sensor readings"
+            logger.error(msg)
+            raise StateServiceException(msg)
+
+        evidence = window.evidence_window()
+
+        confidence = self.confidence_score(
+            window=evidence,
+            min_samples=self.policies.soil_moisture.interpretation.level.min_samples,
+        )
+
+        adc = self.policies.soil_moisture.calibration.adc
+        count = len(window)
+        avg_moisture = (adc.dry * count - window.total) / ((adc.dry - adc.wet) * count)
+
+        N = self.policies.soil_moisture.interpretation.trend.lookback_samples
+        start = window.from_end(N)
+        delta = None
+        if start is not None:
+            delta = self._normalize(window.latest) - self._normalize(start)
+
+        return SoilMoistureStateSchema(
+            avg_moisture=avg_moisture,
+            level=self._level(avg_moisture),
+            trend=self._classify_delta(delta),
+            confidence=confidence,
+            **evidence,
+        )
+
     def _normalize(self, raw_adc: int) -> float:
         """
         Normalize raw ADC reading to 0–1 moisture scale.
@@ -88,7 +155,13 @@ class SoilMoistureStateService(BaseStateService):
             for r in sensor_readings[-N:]
         ]
 
-        delta = values[-1] - values[0]
+        return self._classify_delta(values[-1] - values[0])
+
+    def _classify_delta(self, delta: float | None) -> SoilMoistureTrend:
+        cfg = self.policies.soil_moisture.interpretation.trend
+
+        if delta is None:
+            return SoilMoistureTrend.STABLE
 
         if delta >= cfg.min_delta:
             return SoilMoistureTrend.WETTING
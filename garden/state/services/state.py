@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 import logging
+from typing import Iterable, Mapping, cast
 
 from ..exc import StateServiceException
 from ..schemas import (
@@ -13,15 +14,24 @@ from .climate import ClimateStateService
 from .light import LightStateService
 from .soil_moisture import SoilMoistureStateService
 
-from ...config.sensors import SensorsConfig, EvidenceConfig
+from ..planner import DomainFetch, SnapshotFetchPlanner
+from ...config.sensors import SensorsConfig
 from ...config.policies import PoliciesConfig
-from ...hardware.sensors.repository import SensorReadingRepository
-from ...hardware.sensors.enums import SensorType
+from ...hardware.sensors.repository import DecodedReading, SensorReadingRepository
+from ...hardware.sensors.enums import SensorType, ReadingDecode
+from ...hardware.sensors.block import ReadingBlock
 from ...hardware.sensors.dto import ClimateReading, LightReading, SoilMoistureReading
-from ...hardware.sensors.schemas import ClimatePayload, LightPayload, SoilMoisturePayload
+from ...hardware.sensors.schemas import (
+    ClimatePayload,
+    LightPayload,
+    SoilMoisturePayload,
+    SensorReadingSchema,
+)
 
 logger = logging.getLogger(__name__)
 
+DomainState = ClimateStateSchema | SoilMoistureStateSchema | LightStateSchema
+
 
 @dataclass(frozen=True)
 class PreviousStates:
@@ -34,7 +44,7 @@ class StateService:
     Orchestrates state derivation across all sensor domains.
 
     Responsible for:
-    - Fetching readings within configured evidence windows
+    - Fetching readings within configured evidence windows (one query per snapshot)
     - Delegating to domain-specific services
     - Bundling results into a unified snapshot
 
@@ -46,6 +56,13 @@ class StateService:
     is to describe reality as best as possible given incomplete and noisy data,
     providing a stable and explainable input for downstream rules and agent
     reasoning.
+
+    With decode=ReadingDecode.FAST, rows are read as unvalidated
+    ReadingRecords and handed to the domain services as-is, skipping the
+    per-row SensorReadingSchema, payload model and reading dataclass.
+    With decode=ReadingDecode.BLOCK, each domain is read as a columnar
+    ReadingBlock and derived with the vectorized derive_state_block().
+    STRICT (the default) validates every row.
     """
 
     def __init__(
@@ -53,10 +70,13 @@ class StateService:
         repository: SensorReadingRepository,
         sensors_config: SensorsConfig,
         policies_config: PoliciesConfig,
+        decode: ReadingDecode = ReadingDecode.STRICT,
     ):
         self.repository = repository
         self.sensors = sensors_config
         self.policies = policies_config
+        self.decode = decode
+        self.planner = SnapshotFetchPlanner(sensors_config)
 
         self._climate = ClimateStateService(policies_config)
         self._soil_moisture = SoilMoistureStateService(policies_config)
@@ -70,6 +90,10 @@ class StateService:
         """
         Derive a complete state snapshot as of a given time.
 
+        All domains are read with a single repository query (see
+        SnapshotFetchPlanner) and then derived independently. To derive
+        only some domains, use derive_domains().
+
         Args:
             as_of: The reference time for the snapshot. Defaults to now (UTC).
             previous: Previous states needed for hysteresis (e.g., light on/off).
@@ -79,124 +103,134 @@ class StateService:
             with insufficient data).
         """
         now = as_of or datetime.now(timezone.utc)
-        previous = previous or PreviousStates()
-
-        climate = self._derive_climate(now)
-        soil_moisture = self._derive_soil_moisture(now)
-        light = self._derive_light(now, previous.light)
+        states = self.derive_domains(now, SensorType, previous)
 
         return DerivedStateSnapshot(
             created=now,
-            climate=climate,
-            soil_moisture=soil_moisture,
-            light=light,
+            climate=states[SensorType.CLIMATE],
+            soil_moisture=states[SensorType.SOIL_MOISTURE],
+            light=states[SensorType.LIGHT],
         )
 
-    def _derive_climate(self, as_of: datetime) -> ClimateStateSchema | None:
-        """Derive climate state from configured climate sensors."""
-        cfg = self.sensors.climate
-        window_start = self._window_start(as_of, cfg.evidence)
-
-        # For now: use first sensor. Future: aggregate multiple sensors.
-        sensor = cfg.sensors[0]
-
-        readings = self.repository.fetch_readings(
-            sensor_type=SensorType.CLIMATE,
-            sensor_id=sensor.id,
-            window_start=window_start,
-            window_end=as_of,
-        )
+    def derive_domains(
+        self,
+        as_of: datetime,
+        domains: Iterable[SensorType],
+        previous: PreviousStates | None = None,
+    ) -> dict[SensorType, DomainState | None]:
+        """
+        Derive the states of only the given domains as of a given time.
 
-        if not readings:
-            logger.warning(f"No climate readings in window [{window_start}, {as_of}]")
+        The domains' readings are fetched with a single planned query, as in
+        derive_snapshot(); other domains are neither read nor derived.
+        """
+        previous = previous or PreviousStates()
+        domains = list(domains)
+        if not domains:
+            return {}
+
+        plan = self.planner.plan(as_of, domains)
+        readings: Mapping[SensorType, list[DecodedReading] | ReadingBlock]
+        if self.decode == ReadingDecode.BLOCK:
+            readings = self.planner.execute_blocks(plan, self.repository)
+        else:
+            readings = self.planner.execute(plan, self.repository, decode=self.decode)
+
+        states: dict[SensorType, DomainState | None] = {}
+        for sensor_type in domains:
+            fetch = plan.domains[sensor_type]
+            if sensor_type == SensorType.CLIMATE:
+                states[sensor_type] = self._derive_climate(fetch, readings[sensor_type])
+            elif sensor_type == SensorType.SOIL_MOISTURE:
+                states[sensor_type] = self._derive_soil_moisture(fetch, readings[sensor_type])
+            else:
+                states[sensor_type] = self._derive_light(fetch, readings[sensor_type], previous.light)
+        return states
+
+    def _derive_climate(
+        self,
+        fetch: DomainFetch,
+        readings: list[DecodedReading] | ReadingBlock,
+    ) -> ClimateStateSchema | None:
+        """Derive climate state from configured climate sensors."""
+        if not len(readings):
+            logger.warning(f"No climate readings in {fetch.describe()}")
             return None
 
-        parsed = [
-            ClimateReading(
-                created=r.created,
-                sensor_type=SensorType.CLIMATE,
-                sensor_id=r.sensor_id,
-                payload=ClimatePayload(**r.payload),
-            )
-            for r in readings
-        ]
+        if isinstance(readings, ReadingBlock):
+            return self._climate.derive_state_block(readings)
+
+        if self.decode == ReadingDecode.FAST:
+            # ReadingRecords expose the same attributes as ClimateReading
+            parsed = cast(list[ClimateReading], readings)
+        else:
+            parsed = [
+                ClimateReading(
+                    created=r.created,
+                    sensor_type=SensorType.CLIMATE,
+                    sensor_id=r.sensor_id,
+                    payload=ClimatePayload(**r.payload),
+                )
+                for r in cast(list[SensorReadingSchema], readings)
+            ]
 
         return self._climate.derive_state(parsed)
 
-    def _derive_soil_moisture(self, as_of: datetime) -> SoilMoistureStateSchema | None:
+    def _derive_soil_moisture(
+        self,
+        fetch: DomainFetch,
+        readings: list[DecodedReading] | ReadingBlock,
+    ) -> SoilMoistureStateSchema | None:
         """Derive soil moisture state from configured sensors."""
-        cfg = self.sensors.soil_moisture
-        window_start = self._window_start(as_of, cfg.evidence)
-
-        sensor = cfg.sensors[0]
-
-        readings = self.repository.fetch_readings(
-            sensor_type=SensorType.SOIL_MOISTURE,
-            sensor_id=sensor.id,
-            window_start=window_start,
-            window_end=as_of,
-        )
-
-        if not readings:
-            logger.warning(f"No soil moisture readings in window [{window_start}, {as_of}]")
+        if not len(readings):
+            logger.warning(f"No soil moisture readings in {fetch.describe()}")
             return None
 
-        parsed = [
-            SoilMoistureReading(
-                created=r.created,
-                sensor_type=SensorType.SOIL_MOISTURE,
-                sensor_id=r.sensor_id,
-                payload=SoilMoisturePayload(**r.payload),
-            )
-            for r in readings
-        ]
+        if isinstance(readings, ReadingBlock):
+            return self._soil_moisture.derive_state_block(readings)
+
+        if self.decode == ReadingDecode.FAST:
+            # ReadingRecords expose the same attributes as SoilMoistureReading
+            parsed = cast(list[SoilMoistureReading], readings)
+        else:
+            parsed = [
+                SoilMoistureReading(
+                    created=r.created,
+                    sensor_type=SensorType.SOIL_MOISTURE,
+                    sensor_id=r.sensor_id,
+                    payload=SoilMoisturePayload(**r.payload),
+                )
+                for r in cast(list[SensorReadingSchema], readings)
+            ]
 
         return self._soil_moisture.derive_state(parsed)
 
     def _derive_light(
         self,
-        as_of: datetime,
+        fetch: DomainFetch,
+        readings: list[DecodedReading] | ReadingBlock,
         previous: LightStateSchema | None,
     ) -> LightStateSchema | None:
         """Derive light state, using previous state for hysteresis."""
-        cfg = self.sensors.light
-        window_start = self._window_start(as_of, cfg.evidence)
-
-        sensor = cfg.sensors[0]
-
-        readings = self.repository.fetch_readings(
-            sensor_type=SensorType.LIGHT,
-            sensor_id=sensor.id,
-            window_start=window_start,
-            window_end=as_of,
-        )
-
-        if not readings:
-            logger.warning(f"No light readings in window [{window_start}, {as_of}]")
+        if not len(readings):
+            logger.warning(f"No light readings in {fetch.describe()}")
             return None
 
-        parsed = [
-            LightReading(
-                created=r.created,
-                sensor_type=SensorType.LIGHT,
-                sensor_id=r.sensor_id,
-                payload=LightPayload(**r.payload),
-            )
-            for r in readings
-        ]
+        if isinstance(readings, ReadingBlock):
+            return self._light.derive_state_block(readings, previous_state=previous)
+
+        if self.decode == ReadingDecode.FAST:
+            # ReadingRecords expose the same attributes as LightReading
+            parsed = cast(list[LightReading], readings)
+        else:
+            parsed = [
+                LightReading(
+                    created=r.created,
+                    sensor_type=SensorType.LIGHT,
+                    sensor_id=r.sensor_id,
+                    payload=LightPayload(**r.payload),
+                )
+                for r in cast(list[SensorReadingSchema], readings)
+            ]
 
         return self._light.derive_state(parsed, previous_state=previous)
-
-    def _window_start(self, as_of: datetime, evidence: EvidenceConfig) -> datetime:
-        """
-        Calculate window start based on evidence config.
-
-        For time-based lookback, subtracts the configured seconds.
-        For sample-based lookback, uses a generous 1-hour window and relies
-        on domain services to limit samples as needed.
-        """
-        if evidence.lookback_seconds is not None:
-            return as_of - timedelta(seconds=evidence.lookback_seconds)
-
-        # Sample-based: use generous window, let domain service handle limiting
-        return as_of - timedelta(hours=1)
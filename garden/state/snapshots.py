@@ -0,0 +1,63 @@
+"""
+Canonical, content-addressed form of DerivedStateSnapshot.
+
+A snapshot's content is its derived state without any timestamps: the
+top-level created time and each domain's window_start, window_end and
+state_started_at move on every derivation even when nothing else does.
+The content is serialized as JSON with sorted keys and no whitespace, so
+equal content always produces the same bytes and the same SHA-256 hash,
+and snapshots that only differ in their times share one StateSnapshot
+row. The times are kept per decision instead (see split_snapshot and
+rebuild_snapshot).
+
+The content is encoded with the stdlib json module, not orjson: stored
+rows are keyed by the hash of these exact bytes, and orjson writes some
+floats and non-ASCII text differently.
+"""
+
+from datetime import datetime
+import hashlib
+import json
+from typing import Any
+from .schemas import DerivedStateSnapshot
+from ..common.serialization import loads
+
+# Per-domain fields left out of the content.
+SNAPSHOT_TIME_FIELDS = ("window_start", "window_end", "state_started_at")
+
+# Domain -> its time fields, as JSON values.
+SnapshotTimes = dict[str, dict[str, Any]]
+
+
+def split_snapshot(snapshot: DerivedStateSnapshot) -> tuple[str, SnapshotTimes]:
+    """The snapshot's canonical content, and the domain times left out of it."""
+    content = snapshot.model_dump(mode="json", exclude={"created"})
+    times: SnapshotTimes = {}
+    for domain, state in content.items():
+        if state is not None:
+            times[domain] = {field: state.pop(field) for field in SNAPSHOT_TIME_FIELDS if field in state}
+    return json.dumps(content, sort_keys=True, separators=(",", ":")), times
+
+
+def snapshot_content(snapshot: DerivedStateSnapshot) -> str:
+    return split_snapshot(snapshot)[0]
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def rebuild_snapshot(
+    content: str,
+    created: datetime,
+    times: SnapshotTimes | None = None,
+) -> DerivedStateSnapshot:
+    """
+    The snapshot from its content, created time and domain times. Content
+    stored before the times were split out still carries them, and is
+    rebuilt from the content alone (times is None).
+    """
+    state = loads(content)
+    for domain, domain_times in (times or {}).items():
+        state[domain].update(domain_times)
+    return DerivedStateSnapshot.model_validate({**state, "created": created})
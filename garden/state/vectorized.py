@@ -0,0 +1,53 @@
+"""
+Vectorized state primitives over ReadingBlock columns.
+
+Each function mirrors a list-based computation in the domain services and
+returns the same value for the same readings. Sums are sequential
+(np.cumsum) rather than pairwise (np.sum), the order Python's sum() adds
+floats in, so averages match the services' bit for bit on Python 3.11.
+From 3.12 sum() compensates for rounding error and the two can differ in
+the last bits.
+"""
+
+import numpy as np
+
+
+def clip_unit(values: np.ndarray) -> np.ndarray:
+    return np.minimum(np.maximum(values, 0.0), 1.0)
+
+
+def normalize_rising(raw: np.ndarray, low: int, high: int) -> np.ndarray:
+    """Normalize a sensor where a higher ADC value means more (e.g. light)."""
+    return clip_unit((raw - low) / (high - low))
+
+
+def normalize_falling(raw: np.ndarray, high: int, low: int) -> np.ndarray:
+    """Normalize an inverted sensor where a higher ADC value means less (e.g. soil moisture)."""
+    return clip_unit((high - raw) / (high - low))
+
+
+def sequential_mean(values: np.ndarray) -> float:
+    return float(np.cumsum(values)[-1] / len(values))
+
+
+def tail_delta(values: np.ndarray, n: int) -> float | None:
+    """Change across the last n values, or None when fewer than n are available."""
+    if len(values) < n:
+        return None
+    return float(values[-1] - values[-n])
+
+
+def tail_thresholds(
+    values: np.ndarray,
+    n: int,
+    high_threshold: float,
+    low_threshold: float,
+) -> tuple[bool, bool] | None:
+    """
+    Whether the last n values are all at/above high_threshold and all
+    at/below low_threshold. None when fewer than n values are available.
+    """
+    if len(values) < n:
+        return None
+    tail = values[-n:]
+    return bool(np.all(tail >= high_threshold)), bool(np.all(tail <= low_threshold))